@@ -0,0 +1,15 @@
+"""
+Benchmarks de la Biblioteca y el Inventario.
+
+- generar_catalogo: llena una base SQLite con libros sintéticos (10k, 100k, 1M).
+- bench_rutas: mide cada ruta de la app web con el cliente de pruebas de Flask.
+- bench_micro: mide las funciones de biblioteca.py e inventario_PyStore.py
+  (incluye el arranque desde la foto binaria de foto_binaria.py).
+- bench_memoria: mide la RAM de Libro y Producto con y sin __slots__ (1M por defecto).
+- bench_arranque: mide el arranque de la app (python -X importtime) y verifica un presupuesto.
+- comparar: compara dos archivos de resultados para detectar regresiones.
+
+Se ejecutan desde la raíz del repositorio, por ejemplo:
+    python -m benchmarks.generar_catalogo --filas 100000
+    python -m benchmarks.bench_rutas --filas 100000
+"""
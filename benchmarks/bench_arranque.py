@@ -0,0 +1,137 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.utilidades import (CARPETA_APP, guardar_resultados, imprimir_tabla, resumen,
+                                   ruta_catalogo)
+from benchmarks.generar_catalogo import TAMANOS, generar_catalogo
+
+# ==============================
+# BENCHMARK DE ARRANQUE (python -X importtime)
+# ==============================
+# Cada worker de gunicorn que nace (o renace tras max_requests) y cada programa
+# de consola paga el import de la app. Se mide siempre en un proceso NUEVO:
+#   - import_app: solo "import app" (no debe tocar la base ni cargar librerías pesadas)
+#   - create_app: preparar_base() + índices en memoria (depende del tamaño del catálogo)
+#   - proceso_completo: desde lanzar el intérprete hasta tener la app lista
+# Además, con -X importtime se listan los módulos que más tardan en importarse.
+#
+# Presupuesto: si la mediana de import_app supera --presupuesto-ms, o si se
+# importó alguno de los módulos prohibidos (pandas, numpy, openpyxl: solo
+# los necesitan las exportaciones), el programa termina con código 1 (sirve en CI).
+#
+# Uso: python -m benchmarks.bench_arranque --filas 10k --presupuesto-ms 750
+
+PROHIBIDOS = ("pandas", "numpy", "openpyxl")
+
+# Se ejecuta en el proceso hijo: cronometra cada fase y las imprime como JSON
+_PROGRAMA = """
+import json, time
+inicio = time.perf_counter()
+import app
+importado = time.perf_counter()
+app.create_app()
+listo = time.perf_counter()
+print(json.dumps({"import_app": importado - inicio, "create_app": listo - importado}))
+"""
+
+
+def _entorno(ruta_db: str) -> dict:
+    entorno = dict(os.environ, BIBLIOTECA_DB=ruta_db)
+    entorno.pop("PYTHONPROFILEIMPORTTIME", None)
+    return entorno
+
+
+def medir_fases(ruta_db: str, repeticiones: int) -> dict:
+    """Tiempos (en segundos) de cada fase del arranque, una corrida por proceso nuevo."""
+    tiempos = {"import_app": [], "create_app": [], "proceso_completo": []}
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        salida = subprocess.run([sys.executable, "-c", _PROGRAMA], cwd=CARPETA_APP, env=_entorno(ruta_db),
+                                capture_output=True, text=True, check=True).stdout
+        tiempos["proceso_completo"].append(time.perf_counter() - inicio)
+        fases = json.loads(salida.strip().splitlines()[-1])
+        for nombre, segundos in fases.items():
+            tiempos[nombre].append(segundos)
+    return tiempos
+
+
+def perfil_imports(ruta_db: str) -> list[tuple[str, int, int]]:
+    """
+    [(módulo, propio_us, acumulado_us)] de "import app" según -X importtime.
+    Solo los módulos que 'app' arrastró (no los del arranque del intérprete).
+    """
+    salida = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"], cwd=CARPETA_APP,
+                            env=_entorno(ruta_db), capture_output=True, text=True, check=True).stderr
+    modulos = []
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        modulos.append((nombre[1:].rstrip(), int(propio), int(acumulado))) # Sin el espacio tras el "|"
+    # -X importtime imprime cada módulo DESPUÉS de sus dependencias (más sangría = más profundo):
+    # el bloque de "app" termina en su propia línea (sin sangría) y empieza tras la línea sin sangría anterior
+    fin = next(i for i, (nombre, _, _) in enumerate(modulos) if nombre == "app")
+    inicio = fin
+    while inicio > 0 and modulos[inicio - 1][0].startswith(" "):
+        inicio -= 1
+    return [(nombre.strip(), propio, acumulado) for nombre, propio, acumulado in modulos[inicio:fin + 1]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el arranque de la app web y verifica un presupuesto.")
+    parser.add_argument("--filas", default="10k", help="Tamaño del catálogo: 10k, 100k, 1m o un número")
+    parser.add_argument("--db", default=None, help="Base SQLite a usar (se genera si no existe)")
+    parser.add_argument("--repeticiones", type=int, default=10)
+    parser.add_argument("--presupuesto-ms", type=float, default=750.0,
+                        help="Máximo para la mediana de 'import app' en milisegundos")
+    parser.add_argument("--top", type=int, default=15, help="Módulos más lentos a mostrar")
+    parser.add_argument("--salida", default=None, help="Archivo JSON de resultados")
+    args = parser.parse_args()
+
+    filas = TAMANOS.get(args.filas.lower()) or int(args.filas)
+    ruta_db = os.path.abspath(args.db or ruta_catalogo(filas))
+    if not os.path.exists(ruta_db):
+        print(f"Generando catálogo de {filas} libros en {ruta_db}...")
+        os.makedirs(os.path.dirname(ruta_db), exist_ok=True)
+        generar_catalogo(ruta_db, filas) # Las mediciones corren en procesos nuevos: no importa cargar la app aquí
+
+    # 1. Fases del arranque
+    resultados = {nombre: resumen(t) for nombre, t in medir_fases(ruta_db, args.repeticiones).items()}
+    imprimir_tabla(resultados)
+
+    # 2. Qué módulos pesan más
+    modulos = perfil_imports(ruta_db)
+    print(f"\n{'MÓDULO (import app)':<48} | {'PROPIO ms':>10} | {'ACUMULADO ms':>12}")
+    print("-" * 76)
+    for nombre, propio, acumulado in sorted(modulos, key=lambda m: -m[1])[:args.top]:
+        print(f"{nombre:<48} | {propio / 1000:>10.2f} | {acumulado / 1000:>12.2f}")
+
+    # 3. Presupuesto
+    importados = {nombre.split(".")[0] for nombre, _, _ in modulos}
+    prohibidos = sorted(importados.intersection(PROHIBIDOS))
+    mediana = resultados["import_app"]["p50_ms"]
+    problemas = []
+    if mediana > args.presupuesto_ms:
+        problemas.append(f"'import app' tarda {mediana:.0f} ms (presupuesto: {args.presupuesto_ms:.0f} ms)")
+    if prohibidos:
+        problemas.append(f"'import app' carga {', '.join(prohibidos)} (solo deben cargarse al exportar)")
+
+    destino = guardar_resultados("arranque", {"filas": filas, "db": ruta_db, "repeticiones": args.repeticiones,
+                                              "presupuesto_ms": args.presupuesto_ms, "prohibidos": prohibidos},
+                                 resultados, args.salida)
+    print(f"\nResultados guardados en {destino}")
+
+    if problemas:
+        for problema in problemas:
+            print(f"PRESUPUESTO EXCEDIDO: {problema}")
+        sys.exit(1)
+    print(f"Presupuesto cumplido: 'import app' en {mediana:.0f} ms (máximo {args.presupuesto_ms:.0f} ms), "
+          f"sin {', '.join(PROHIBIDOS)}.")
+
+
+if __name__ == "__main__":
+    main()
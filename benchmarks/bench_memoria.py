@@ -0,0 +1,115 @@
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+import uuid
+
+from benchmarks.utilidades import agregar_app_al_path, guardar_resultados
+from benchmarks.generar_catalogo import generar_filas, TAMANOS
+
+# ==============================
+# BENCHMARK DE MEMORIA
+# ==============================
+# ¿Cuánta RAM ocupan N libros / productos cargados desde JSON?
+# Compara las clases actuales (__slots__ + textos internados) con una copia
+# de las clases anteriores (un __dict__ por objeto, un texto por campo).
+# Los datos pasan por json.dumps/json.loads igual que en cargar_biblioteca,
+# para que cada texto sea un objeto distinto como al leer el archivo real.
+#
+# Uso: python -m benchmarks.bench_memoria --filas 1m
+# Para comparar corridas: python -m benchmarks.comparar antes.json despues.json --metrica mib
+
+
+class LibroConDict:
+    """Réplica del Libro original: atributos normales y sin internar."""
+
+    def __init__(self, nombre, categoria, autor, editorial, paginas, cantidad, id=None):
+        self.id = id if id else str(uuid.uuid4())
+        self.nombre = nombre
+        self.categoria = categoria
+        self.autor = autor
+        self.editorial = editorial
+        self.paginas = paginas
+        self.cantidad = cantidad
+
+
+class ProductoConDict:
+    """Réplica del Producto original."""
+
+    def __init__(self, nombre, precio, cantidad):
+        self.nombre = nombre
+        self.precio = precio
+        self.cantidad = cantidad
+
+
+def memoria_de_objetos(texto_json: str, construir) -> int:
+    """
+    Bytes que siguen vivos después de convertir el JSON en objetos con 'construir'.
+    Los diccionarios intermedios se liberan antes de medir: solo cuentan los objetos.
+    """
+    gc.collect()
+    tracemalloc.start()
+    datos = json.loads(texto_json)
+    objetos = [construir(d) for d in datos]
+    del datos
+    gc.collect()
+    ocupado = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objetos
+    return ocupado
+
+
+def _fila(registros: int, ocupado: int) -> dict:
+    return {"registros": registros, "mib": ocupado / 2**20, "bytes_por_registro": ocupado / registros}
+
+
+def bench_libros(filas: int) -> dict:
+    agregar_app_al_path()
+    import biblioteca
+
+    campos = ("id", "nombre", "categoria", "autor", "editorial", "paginas", "cantidad")
+    texto = json.dumps([{k: f[k] for k in campos} for f in generar_filas(filas)], ensure_ascii=False)
+    return {
+        "libro_con_dict": _fila(filas, memoria_de_objetos(texto, lambda d: LibroConDict(**d))),
+        "libro_slots": _fila(filas, memoria_de_objetos(texto, lambda d: biblioteca.Libro(**d))),
+    }
+
+
+def bench_productos(filas: int) -> dict:
+    from inventario_PyStore import Producto
+
+    azar = random.Random(11)
+    texto = json.dumps([{"nombre": f"Producto {i}", "precio": round(azar.uniform(500, 500000), 2),
+                         "cantidad": azar.randint(0, 500)} for i in range(filas)])
+    construir = lambda clase: (lambda d: clase(d["nombre"], d["precio"], d["cantidad"]))
+    return {
+        "producto_con_dict": _fila(filas, memoria_de_objetos(texto, construir(ProductoConDict))),
+        "producto_slots": _fila(filas, memoria_de_objetos(texto, construir(Producto))),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide la memoria de Libro y Producto con y sin __slots__.")
+    parser.add_argument("--filas", default="1m", help="Registros: 10k, 100k, 1m o un número (por defecto 1m)")
+    parser.add_argument("--salida", default=None, help="Archivo JSON de resultados")
+    args = parser.parse_args()
+    filas = TAMANOS.get(args.filas.lower()) or int(args.filas)
+
+    resultados = {}
+    resultados.update(bench_libros(filas))
+    resultados.update(bench_productos(filas))
+
+    print(f"\n{'ESCENARIO':<20} | {'MiB':>9} | {'BYTES/REG':>10} | {'REDUCCIÓN':>9}")
+    print("-" * 58)
+    for nombre, r in resultados.items():
+        base = resultados.get(nombre.replace("_slots", "_con_dict"))
+        reduccion = f"{(1 - r['mib'] / base['mib']) * 100:.1f}%" if nombre.endswith("_slots") else "-"
+        print(f"{nombre:<20} | {r['mib']:>9.1f} | {r['bytes_por_registro']:>10.1f} | {reduccion:>9}")
+
+    destino = guardar_resultados("memoria", {"filas": filas}, resultados, args.salida)
+    print(f"\nResultados guardados en {destino}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+
+from benchmarks.utilidades import guardar_resultados, imprimir_tabla, medir, resumen
+from benchmarks.generar_catalogo import generar_filas, TAMANOS
+
+# ==============================
+# MICRO-BENCHMARKS (Herramientas de consola con JSON)
+# ==============================
+# Mide las funciones de búsqueda, limpieza y persistencia de biblioteca.py
+# y de inventario_PyStore.py con listas sintéticas en memoria.
+# Los archivos JSON se escriben en una carpeta temporal, nunca en los del proyecto.
+
+
+def _silencio():
+    """Las funciones del menú imprimen mensajes; aquí no nos interesan."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+# ==============================
+# biblioteca.py
+# ==============================
+def bench_biblioteca(filas: int, repeticiones: int) -> dict:
+    import biblioteca
+    import foto_binaria
+
+    datos = [{k: f[k] for k in ("id", "nombre", "categoria", "autor", "editorial", "paginas", "cantidad")}
+             for f in generar_filas(filas)]
+    biblioteca.biblioteca = biblioteca.BibliotecaStore([biblioteca.Libro(**d) for d in datos])
+    azar = random.Random(7)
+    muestra = [azar.choice(datos) for _ in range(repeticiones)]
+    terminos = iter([azar.choice(["sol", "memoria", "el", "vol. 3", "laberinto"]) for _ in range(repeticiones)])
+    nombres = iter([d["nombre"] for d in muestra])
+    pares = iter([(d["nombre"], d["editorial"]) for d in muestra])
+    pares_binaria = [(d["nombre"], d["editorial"]) for d in muestra]
+
+    tiempos = {}
+    tiempos["filtrar_libros_nombre"] = medir(lambda: biblioteca.filtrar_libros("1", next(terminos)), repeticiones)
+    tiempos["filtrar_libros_categoria"] = medir(lambda: biblioteca.filtrar_libros("2", "novela"), repeticiones)
+    tiempos["filtrar_libros_editorial"] = medir(lambda: biblioteca.filtrar_libros("3", "planeta"), repeticiones)
+    tiempos["buscar_libro_exacto"] = medir(lambda: biblioteca.buscar_libro_exacto(next(nombres)), repeticiones)
+    tiempos["buscar_libro_unico"] = medir(lambda: biblioteca.buscar_libro_unico(*next(pares)), repeticiones)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        biblioteca.ARCHIVO_DB = os.path.join(carpeta, "biblioteca.json")
+        biblioteca.ARCHIVO_BINARIO = os.path.join(carpeta, "biblioteca.bin") # Aún no existe: se usa el JSON
+
+        # 10% de duplicados para que sanitizar tenga trabajo (y guarde)
+        def lista_con_duplicados():
+            libros = [biblioteca.Libro(**d) for d in datos]
+            libros += [biblioteca.Libro(**{**d, "id": None}) for d in datos[: max(1, filas // 10)]]
+            return biblioteca.BibliotecaStore(libros)
+
+        def sanitizar(libros):
+            biblioteca.biblioteca = libros
+            with _silencio():
+                biblioteca.sanitizar_biblioteca()
+
+        repeticiones_io = max(1, repeticiones // 10)
+        tiempos["sanitizar_biblioteca"] = medir(sanitizar, repeticiones_io, preparar=lista_con_duplicados)
+
+        biblioteca.biblioteca = biblioteca.BibliotecaStore([biblioteca.Libro(**d) for d in datos])
+        tiempos["guardar_biblioteca"] = medir(biblioteca.guardar_biblioteca, repeticiones_io)
+        tiempos["cargar_biblioteca"] = medir(biblioteca.cargar_biblioteca, repeticiones_io)
+
+        # Con el diario conectado, cada cambio de stock agrega UNA línea al archivo
+        biblioteca.biblioteca = biblioteca.cargar_biblioteca()
+        libros_diario = iter([biblioteca.buscar_libro_unico(n, e) for n, e in
+                              [(d["nombre"], d["editorial"]) for d in muestra]])
+        tiempos["cambio_stock_con_diario"] = medir(lambda: biblioteca.actualizar_stock(next(libros_diario), 1),
+                                                   repeticiones)
+
+        # Foto binaria: abrirla no depende del tamaño; los libros se crean en la primera búsqueda
+        biblioteca.guardar_biblioteca()
+        foto_binaria.json_a_binario(biblioteca.ARCHIVO_DB, biblioteca.ARCHIVO_BINARIO, "libro")
+        tiempos["cargar_biblioteca_binaria"] = medir(lambda: len(biblioteca.cargar_biblioteca()), repeticiones_io)
+        tiempos["binaria_primera_busqueda"] = medir(lambda store: store.buscar_por_clave(*pares_binaria[0]),
+                                                    repeticiones_io, preparar=biblioteca.cargar_biblioteca)
+    return tiempos
+
+
+# ==============================
+# inventario_PyStore.py
+# ==============================
+def bench_inventario(filas: int, repeticiones: int) -> dict:
+    import inventario_PyStore as inv
+
+    azar = random.Random(11)
+    datos = [(f"Producto {i}", round(azar.uniform(500, 500000), 2), azar.randint(0, 500)) for i in range(filas)]
+    inv.inventario = inv.InventarioStore([inv.Producto(*d) for d in datos])
+    nombres = iter([azar.choice(datos)[0] for _ in range(repeticiones * 4)])
+    nuevos = iter(range(10**9))
+
+    tiempos = {}
+    tiempos["buscar_producto"] = medir(lambda: inv.inventario.buscar(next(nombres)), repeticiones)
+    tiempos["cambiar_stock"] = medir(lambda: inv.inventario.cambiar_stock(next(nombres), -1), repeticiones)
+    tiempos["registrar_nuevo"] = medir(lambda: inv.inventario.registrar(f"Nuevo {next(nuevos)}", 1000.0, 5),
+                                       repeticiones)
+    tiempos["eliminar_producto"] = medir(lambda: inv.inventario.eliminar(next(nombres)), repeticiones)
+    lote = [(azar.choice(datos)[0], azar.randint(-3, 3)) for _ in range(1000)]
+    tiempos["cambiar_stock_lote_1000"] = medir(lambda: inv.inventario.cambiar_stock_lote(lote), repeticiones)
+    tiempos["formato_pesos_colombianos"] = medir(
+        lambda: [inv.formato_pesos_colombianos(p.precio) for p in inv.inventario], max(1, repeticiones // 10))
+
+    # Reportes con NumPy: armar los arreglos una vez y calcular sobre ellos
+    from reportes_inventario import ReporteInventario, formatear_pesos_lote
+    tiempos["reporte_armar_arreglos"] = medir(lambda: ReporteInventario.desde_inventario(inv.inventario),
+                                              max(1, repeticiones // 10))
+    reporte = ReporteInventario.desde_inventario(inv.inventario)
+    tiempos["reporte_valor_total"] = medir(lambda: (setattr(reporte, "_valores", None), reporte.valor_total()),
+                                           repeticiones)
+    tiempos["reporte_top_10"] = medir(lambda: reporte.top_por_valor(10), repeticiones)
+    tiempos["reporte_stock_bajo"] = medir(lambda: reporte.stock_bajo(5, limite=10), repeticiones)
+    tiempos["reporte_histograma"] = medir(reporte.histograma_precios, repeticiones)
+    tiempos["formatear_pesos_lote"] = medir(lambda: formatear_pesos_lote(reporte.precios), max(1, repeticiones // 10))
+
+    carpeta_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as carpeta:
+        os.chdir(carpeta) # guardar_datos/cargar_datos usan "inventario.json" relativo
+        try:
+            def con_duplicados():
+                productos = [inv.Producto(*d) for d in datos] + [inv.Producto(*d) for d in datos[: max(1, filas // 10)]]
+                return inv.InventarioStore(productos)
+
+            def sanitizar(store):
+                inv.inventario = store
+                with _silencio():
+                    inv.sanitizar_inventario()
+
+            repeticiones_io = max(1, repeticiones // 10)
+            tiempos["sanitizar_inventario"] = medir(sanitizar, repeticiones_io, preparar=con_duplicados)
+
+            inv.inventario = inv.InventarioStore([inv.Producto(*d) for d in datos])
+            with _silencio():
+                tiempos["guardar_datos"] = medir(inv.guardar_datos, repeticiones_io)
+                tiempos["cargar_datos"] = medir(inv.cargar_datos, repeticiones_io)
+        finally:
+            os.chdir(carpeta_original)
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks de biblioteca.py e inventario_PyStore.py.")
+    parser.add_argument("--filas", default="10k", help="Registros en memoria: 10k, 100k, 1m o un número")
+    parser.add_argument("--repeticiones", type=int, default=50)
+    parser.add_argument("--salida", default=None, help="Archivo JSON de resultados")
+    args = parser.parse_args()
+    filas = TAMANOS.get(args.filas.lower()) or int(args.filas)
+
+    tiempos = {}
+    tiempos.update({f"biblioteca.{k}": v for k, v in bench_biblioteca(filas, args.repeticiones).items()})
+    tiempos.update({f"inventario.{k}": v for k, v in bench_inventario(filas, args.repeticiones).items()})
+    resultados = {nombre: resumen(t) for nombre, t in tiempos.items()}
+
+    imprimir_tabla(resultados)
+    destino = guardar_resultados("micro", {"filas": filas, "repeticiones": args.repeticiones},
+                                 resultados, args.salida)
+    print(f"\nResultados guardados en {destino}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import argparse
+import os
+
+from benchmarks.utilidades import (guardar_resultados, imprimir_tabla, medir, preparar_app,
+                                   resumen, ruta_catalogo)
+from benchmarks.generar_catalogo import TAMANOS, generar_catalogo
+
+# ==============================
+# BENCHMARK DE LAS RUTAS WEB
+# ==============================
+# Recorre cada ruta con el cliente de pruebas de Flask (sin red ni servidor),
+# así medimos solo el costo de nuestra app: SQL + Python + plantillas.
+# Las rutas que escriben (registrar, stock, eliminar) modifican la base de
+# benchmark, nunca la de producción.
+#
+# Cada lectura del catálogo se mide dos veces:
+#   - <escenario>: en frío, vaciando la caché de páginas y la de búsquedas antes
+#     de cada repetición (fuera del cronómetro). Es el costo real de SQL +
+#     plantilla: aquí se nota si una consulta deja de usar su índice.
+#   - <escenario>_cache: la misma URL repetida, servida desde las cachés.
+
+
+def _verificar(respuesta, esperado=(200,)):
+    respuesta.get_data() # Consumir todo el cuerpo: en las respuestas en streaming ahí está el trabajo
+    if respuesta.status_code not in esperado:
+        raise RuntimeError(f"Respuesta inesperada {respuesta.status_code}: {respuesta.request.path}")
+    return respuesta
+
+
+def vaciar_caches(*_):
+    """Deja la app como recién arrancada: sin páginas dibujadas ni búsquedas guardadas."""
+    from rutas import paginas_catalogo
+    from biblioteca_sql import busquedas
+    paginas_catalogo.vaciar()
+    busquedas.backend.subir_generacion()
+
+
+def escenarios(cliente, session, Libro, repeticiones: int, repeticiones_export: int) -> dict:
+    """Devuelve {nombre_escenario: [tiempos]} para cada ruta de la app."""
+    from paginacion import codificar_cursor
+
+    # Cursor que apunta al 90% del catálogo: simula una página "profunda"
+    total = session.query(Libro).count()
+    profundo = (session.query(Libro.nombre, Libro.id).order_by(Libro.nombre, Libro.id)
+                .offset(int(total * 0.9)).limit(1).first())
+    cursor_profundo = codificar_cursor(profundo.nombre, profundo.id) if profundo else ""
+    pagina_profunda = max(1, int(total * 0.9) // 20)
+    ids = [i for (i,) in session.query(Libro.id).limit(repeticiones)]
+    session.close()
+
+    tiempos = {}
+    get = lambda url: (lambda: _verificar(cliente.get(url)))
+
+    lecturas = {
+        "catalogo_primera_pagina": "/catalogo",
+        "catalogo_pagina_profunda": f"/catalogo?despues={cursor_profundo}",
+        "catalogo_offset_profundo": f"/catalogo?page={pagina_profunda}",
+        "catalogo_total_exacto": "/catalogo?total=1",
+        "busqueda_termino_comun": "/catalogo?q=soledad",
+        "busqueda_termino_raro": "/catalogo?q=laberinto%20dorado",
+        "busqueda_prefijo": "/catalogo?q=mem",
+    }
+    for nombre, url in lecturas.items():
+        # En frío: vaciar_caches corre antes de cada repetición y no se cronometra
+        tiempos[nombre] = medir(lambda _, url=url: _verificar(cliente.get(url)), repeticiones,
+                                preparar=vaciar_caches)
+        tiempos[f"{nombre}_cache"] = medir(get(url), repeticiones)
+
+    # Escrituras: cada repetición usa datos distintos
+    contador = iter(range(10**9))
+    tiempos["registrar"] = medir(lambda: _verificar(cliente.post("/registrar", data={
+        "nombre": f"Libro de Benchmark {next(contador)}", "categoria": "Benchmark", "autor": "Bench",
+        "editorial": "Bench Ediciones", "paginas": "100", "cantidad": "10",
+    }), (200, 302)), repeticiones)
+
+    ids_stock = iter(ids * 2)
+    tiempos["actualizar_stock"] = medir(lambda: _verificar(cliente.post("/actualizar_stock", data={
+        "id_libro": next(ids_stock), "nuevo_stock": "7",
+    }), (200, 302)), repeticiones)
+
+    ids_borrar = iter([i for (i,) in session.query(Libro.id).filter(Libro.categoria == "Benchmark")])
+    session.close()
+    tiempos["eliminar_libro"] = medir(lambda: _verificar(cliente.get(f"/eliminar/{next(ids_borrar)}"), (200, 302)),
+                                      repeticiones)
+
+    tiempos["descargar_csv"] = medir(get("/descargar_csv"), repeticiones_export)
+    tiempos["descargar_excel"] = medir(get("/descargar_excel"), repeticiones_export)
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide latencia y rendimiento de las rutas web.")
+    parser.add_argument("--filas", default="10k", help="Tamaño del catálogo: 10k, 100k, 1m o un número")
+    parser.add_argument("--db", default=None, help="Base SQLite a usar (se genera si no existe)")
+    parser.add_argument("--repeticiones", type=int, default=50)
+    parser.add_argument("--repeticiones-export", type=int, default=3)
+    parser.add_argument("--salida", default=None, help="Archivo JSON de resultados")
+    args = parser.parse_args()
+
+    filas = TAMANOS.get(args.filas.lower()) or int(args.filas)
+    ruta_db = args.db or ruta_catalogo(filas)
+    if not os.path.exists(ruta_db):
+        print(f"Generando catálogo de {filas} libros en {ruta_db}...")
+        os.makedirs(os.path.dirname(os.path.abspath(ruta_db)), exist_ok=True)
+        generar_catalogo(ruta_db, filas)
+
+    preparar_app(ruta_db)
+    from app import create_app
+    from biblioteca_sql import session, Libro
+
+    cliente = create_app().test_client()
+    cliente.get("/catalogo") # Calentamiento: conexiones del pool y caché de plantillas
+    tiempos = escenarios(cliente, session, Libro, args.repeticiones, args.repeticiones_export)
+    resultados = {nombre: resumen(t) for nombre, t in tiempos.items()}
+
+    imprimir_tabla(resultados)
+    destino = guardar_resultados("rutas", {"filas": filas, "db": ruta_db,
+                                           "repeticiones": args.repeticiones}, resultados, args.salida)
+    print(f"\nResultados guardados en {destino}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import json
+import sys
+
+# ==============================
+# COMPARADOR DE RESULTADOS
+# ==============================
+# Uso: python -m benchmarks.comparar antes.json despues.json --umbral 10
+# Marca como REGRESIÓN todo escenario cuyo p50 empeoró más del umbral (%).
+# Sale con código 1 si hubo regresiones (útil en integración continua).
+
+
+def cargar(ruta: str) -> dict:
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def comparar(antes: dict, despues: dict, umbral: float, metrica: str = "p50_ms") -> list[str]:
+    """Imprime la tabla de cambios y devuelve los escenarios que empeoraron."""
+    regresiones = []
+    print(f"{antes['commit']} -> {despues['commit']} ({metrica}, umbral {umbral:.0f}%)")
+    print(f"\n{'ESCENARIO':<40} | {'ANTES':>10} | {'DESPUÉS':>10} | {'CAMBIO':>8}")
+    print("-" * 80)
+    for nombre, nuevo in despues["resultados"].items():
+        viejo = antes["resultados"].get(nombre)
+        if viejo is None or not viejo[metrica]:
+            print(f"{nombre:<40} | {'-':>10} | {nuevo[metrica]:>10.3f} | {'nuevo':>8}")
+            continue
+        cambio = (nuevo[metrica] - viejo[metrica]) / viejo[metrica] * 100
+        marca = ""
+        if cambio > umbral:
+            marca = "  <-- REGRESIÓN"
+            regresiones.append(nombre)
+        print(f"{nombre:<40} | {viejo[metrica]:>10.3f} | {nuevo[metrica]:>10.3f} | {cambio:>+7.1f}%{marca}")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara dos archivos de resultados de benchmark.")
+    parser.add_argument("antes")
+    parser.add_argument("despues")
+    parser.add_argument("--umbral", type=float, default=10.0, help="Porcentaje de empeoramiento tolerado")
+    parser.add_argument("--metrica", default="p50_ms", help="p50_ms, p95_ms, p99_ms o media_ms")
+    args = parser.parse_args()
+
+    regresiones = comparar(cargar(args.antes), cargar(args.despues), args.umbral, args.metrica)
+    sys.exit(1 if regresiones else 0)
+
+
+if __name__ == "__main__":
+    main()
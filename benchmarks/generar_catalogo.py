@@ -0,0 +1,119 @@
+import argparse
+import os
+import random
+import time
+import uuid
+
+from benchmarks.utilidades import CARPETA_DATOS, agregar_app_al_path, preparar_app, ruta_catalogo
+
+# ==============================
+# GENERADOR DE CATÁLOGO SINTÉTICO
+# ==============================
+# Crea libros "realistas" (títulos, autores y editoriales combinados de listas)
+# para medir cómo escalan las rutas con 10k, 100k o 1M filas.
+# Por defecto escribe en benchmarks/datos/ para NO tocar la base de producción;
+# use --db biblioteca_libros/biblioteca_produccion.sqlite --reemplazar si de verdad quiere llenarla.
+
+TAMANOS = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+TAMANO_LOTE = 10_000
+
+SUSTANTIVOS = ["Soledad", "Amor", "Guerra", "Paz", "Sombra", "Viento", "Río", "Ciudad", "Noche", "Mar",
+               "Memoria", "Jardín", "Laberinto", "Casa", "Espejo", "Isla", "Tiempo", "Silencio", "Fuego", "Camino",
+               "Reino", "Montaña", "Libro", "Sueño", "Destino", "Invierno", "Verano", "Bosque", "Puerta", "Estrella"]
+ADJETIVOS = ["Perdido", "Eterno", "Oscuro", "Secreto", "Último", "Infinito", "Rojo", "Dormido", "Salvaje",
+             "Olvidado", "Dorado", "Roto", "Antiguo", "Invisible", "Lejano", "Profundo", "Callado", "Nuevo"]
+PLANTILLAS = ["El {s} {a}", "La {s} del {s2}", "Cien Años de {s}", "{s} y {s2}", "Crónica de un {s} {a}",
+              "Los Hijos del {s}", "Historia del {s} {a}", "Memorias de la {s}", "El {s} en Tiempos del {s2}"]
+NOMBRES = ["Gabriel", "Isabel", "Jorge", "Julio", "Laura", "Mario", "Octavio", "Rosa", "Carlos", "Elena",
+           "Pablo", "Juana", "Miguel", "Sofía", "Alejandro", "Clara", "Rómulo", "Teresa", "Andrés", "Lucía"]
+APELLIDOS = ["García", "Allende", "Borges", "Cortázar", "Esquivel", "Vargas", "Paz", "Montero", "Fuentes",
+             "Poniatowska", "Neruda", "Mistral", "Cervantes", "Rulfo", "Sábato", "Mutis", "Restrepo", "Bolaño"]
+CATEGORIAS = ["Novela", "Cuento", "Poesía", "Ensayo", "Historia", "Ciencia", "Fantasía", "Infantil",
+              "Biografía", "Realismo mágico / Novela", "Terror", "Ciencia ficción", "Autoayuda", "Filosofía"]
+EDITORIALES = ["Sudamericana", "Debolsillo", "Alfaguara", "Planeta", "Anagrama", "Santillana", "Salamandra",
+               "Norma", "Tusquets", "Seix Barral", "Penguin", "Cátedra", "Siruela", "Akal", "Panamericana"]
+
+
+def generar_filas(cantidad: int, semilla: int = 42):
+    """
+    Generador de diccionarios listos para insertar (incluye las columnas de clave).
+    El par (título, editorial) nunca se repite: si choca, se agrega "Vol. N".
+    """
+    agregar_app_al_path()
+    from migraciones import normalizar_clave # La misma clave que usa la app
+
+    azar = random.Random(semilla)
+    usados = set()
+    for _ in range(cantidad):
+        titulo = azar.choice(PLANTILLAS).format(
+            s=azar.choice(SUSTANTIVOS), s2=azar.choice(SUSTANTIVOS), a=azar.choice(ADJETIVOS)
+        )
+        editorial = azar.choice(EDITORIALES)
+        base, volumen = titulo, 1
+        while (normalizar_clave(titulo), editorial) in usados:
+            volumen += 1
+            titulo = f"{base} Vol. {volumen}"
+        usados.add((normalizar_clave(titulo), editorial))
+        yield {
+            "id": str(uuid.UUID(int=azar.getrandbits(128), version=4)),
+            "nombre": titulo,
+            "categoria": azar.choice(CATEGORIAS),
+            "autor": f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)}",
+            "editorial": editorial,
+            "paginas": azar.randint(40, 1200),
+            "cantidad": azar.choice([0, 1, 2, 3, 4] + list(range(5, 60))),
+            "nombre_clave": normalizar_clave(titulo),
+            "editorial_clave": normalizar_clave(editorial),
+        }
+
+
+def generar_catalogo(ruta_db: str, filas: int, semilla: int = 42) -> float:
+    """
+    Crea (o reemplaza) la base 'ruta_db' con 'filas' libros.
+    Inserta con executemany por lotes dentro de una sola transacción.
+    Retorna los segundos que tomó.
+    """
+    if os.path.exists(ruta_db):
+        os.remove(ruta_db)
+    for sufijo in ("-wal", "-shm"):
+        if os.path.exists(ruta_db + sufijo):
+            os.remove(ruta_db + sufijo)
+
+    preparar_app(ruta_db)
+    from biblioteca_sql import motor, Libro, preparar_base
+    preparar_base() # Crea el esquema, índices y FTS en la base nueva
+
+    inicio = time.perf_counter()
+    lote = []
+    with motor.begin() as conexion:
+        for fila in generar_filas(filas, semilla):
+            lote.append(fila)
+            if len(lote) == TAMANO_LOTE:
+                conexion.execute(Libro.__table__.insert(), lote)
+                lote = []
+        if lote:
+            conexion.execute(Libro.__table__.insert(), lote)
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un catálogo sintético de libros en SQLite.")
+    parser.add_argument("--filas", default="10k",
+                        help="Cantidad de libros: 10k, 100k, 1m o un número (por defecto 10k)")
+    parser.add_argument("--db", default=None, help="Archivo SQLite de destino (por defecto benchmarks/datos/)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--reemplazar", action="store_true", help="Borrar la base de destino si ya existe")
+    args = parser.parse_args()
+
+    filas = TAMANOS.get(args.filas.lower()) or int(args.filas)
+    ruta_db = args.db or ruta_catalogo(filas)
+    if os.path.exists(ruta_db) and not args.reemplazar:
+        parser.error(f"{ruta_db} ya existe; use --reemplazar para borrarla y generarla de nuevo")
+    os.makedirs(os.path.dirname(os.path.abspath(ruta_db)) or CARPETA_DATOS, exist_ok=True)
+
+    segundos = generar_catalogo(ruta_db, filas, args.semilla)
+    print(f"{filas} libros generados en {segundos:.1f} s ({filas / segundos:,.0f} filas/s) -> {ruta_db}")
+
+
+if __name__ == "__main__":
+    main()
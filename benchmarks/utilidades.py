@@ -0,0 +1,122 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+# ==============================
+# RUTAS DEL PROYECTO
+# ==============================
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CARPETA_APP = os.path.join(RAIZ, "biblioteca_libros")
+CARPETA_DATOS = os.path.join(RAIZ, "benchmarks", "datos")
+CARPETA_RESULTADOS = os.path.join(RAIZ, "benchmarks", "resultados")
+
+
+def ruta_catalogo(filas: int) -> str:
+    """Archivo SQLite de benchmark para un tamaño dado (no toca la base de producción)."""
+    return os.path.join(CARPETA_DATOS, f"biblioteca_bench_{filas}.sqlite")
+
+
+def agregar_app_al_path():
+    """Los módulos de la app se importan entre sí sin paquete (from rutas import ...)."""
+    if CARPETA_APP not in sys.path:
+        sys.path.insert(0, CARPETA_APP)
+
+
+def preparar_app(ruta_db: str):
+    """
+    Apunta la app web a 'ruta_db' para poder importarla.
+    BIBLIOTECA_DB debe fijarse ANTES de importar biblioteca_sql, que crea el motor al cargarse
+    (las tablas e índices los crea después preparar_base()).
+    """
+    os.environ["BIBLIOTECA_DB"] = ruta_db
+    agregar_app_al_path()
+
+
+# ==============================
+# MEDICIÓN
+# ==============================
+def medir(funcion, repeticiones: int, preparar=None) -> list[float]:
+    """
+    Ejecuta 'funcion' varias veces y devuelve la duración de cada una en segundos.
+    'preparar' (opcional) se llama antes de cada repetición y su tiempo NO se cuenta;
+    su resultado se pasa como argumento a 'funcion'.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        argumento = preparar() if preparar else None
+        inicio = time.perf_counter()
+        funcion(argumento) if preparar else funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def percentil(valores_ordenados: list[float], p: float) -> float:
+    """Percentil por el método del rango más cercano (sobre una lista ya ordenada)."""
+    if not valores_ordenados:
+        return 0.0
+    indice = max(0, min(len(valores_ordenados) - 1, round(p / 100 * len(valores_ordenados)) - 1))
+    return valores_ordenados[indice]
+
+
+def resumen(tiempos: list[float]) -> dict:
+    """Estadísticas de latencia en milisegundos y rendimiento en operaciones por segundo."""
+    ordenados = sorted(tiempos)
+    total = sum(ordenados)
+    return {
+        "n": len(ordenados),
+        "media_ms": statistics.fmean(ordenados) * 1000 if ordenados else 0.0,
+        "p50_ms": percentil(ordenados, 50) * 1000,
+        "p95_ms": percentil(ordenados, 95) * 1000,
+        "p99_ms": percentil(ordenados, 99) * 1000,
+        "min_ms": ordenados[0] * 1000 if ordenados else 0.0,
+        "max_ms": ordenados[-1] * 1000 if ordenados else 0.0,
+        "ops_por_segundo": len(ordenados) / total if total else 0.0,
+    }
+
+
+def imprimir_tabla(resultados: dict):
+    print(f"\n{'ESCENARIO':<32} | {'N':>5} | {'P50 ms':>9} | {'P95 ms':>9} | {'P99 ms':>9} | {'OPS/S':>10}")
+    print("-" * 90)
+    for nombre, r in resultados.items():
+        print(f"{nombre:<32} | {r['n']:>5} | {r['p50_ms']:>9.3f} | {r['p95_ms']:>9.3f} | {r['p99_ms']:>9.3f} | {r['ops_por_segundo']:>10.1f}")
+
+
+# ==============================
+# RESULTADOS EN JSON
+# ==============================
+def _commit_actual() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+
+def guardar_resultados(suite: str, parametros: dict, resultados: dict, destino: str = None) -> str:
+    """
+    Guarda los resultados con el commit, la versión de Python y la máquina,
+    para poder comparar corridas entre commits con benchmarks.comparar.
+    Retorna la ruta del archivo escrito.
+    """
+    commit = _commit_actual()
+    if destino is None:
+        os.makedirs(CARPETA_RESULTADOS, exist_ok=True)
+        marca = datetime.now().strftime("%Y%m%d-%H%M%S")
+        destino = os.path.join(CARPETA_RESULTADOS, f"{suite}-{marca}-{commit}.json")
+    documento = {
+        "suite": suite,
+        "commit": commit,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "parametros": parametros,
+        "resultados": resultados,
+    }
+    with open(destino, "w", encoding="utf-8") as archivo:
+        json.dump(documento, archivo, indent=2, ensure_ascii=False)
+    return destino
@@ -1,5 +1,8 @@
 import json
+import os
+import sys
 import uuid
+import foto_binaria
 
 # ==============================
 # CONFIGURACIÓN Y CONSTANTES
@@ -9,53 +12,393 @@ GREEN = "\033[92m"
 BLUE = "\033[94m"
 RESET = "\033[0m"
 ARCHIVO_DB = "biblioteca.json"
+ARCHIVO_BINARIO = "biblioteca.bin" # Si existe, se usa en lugar del JSON (ver foto_binaria.py)
+COMPACTAR_CADA = 1000 # Registros en el diario antes de reescribir la foto completa
+UMBRAL_DIFUSO = float(os.environ.get("BIBLIOTECA_UMBRAL_DIFUSO", "0.3")) # Similitud mínima en la búsqueda difusa
 
 # ==============================
 # CLASE LIBRO
 # ==============================
 class Libro:
+    # __slots__: sin __dict__ por objeto. Con un millón de libros en RAM,
+    # el diccionario de cada objeto era la mayor parte de la memoria.
+    __slots__ = ("id", "nombre", "categoria", "autor", "editorial", "paginas", "cantidad")
+
     def __init__(self, nombre: str, categoria: str, autor: str, editorial: str, paginas: int, cantidad: int, id: str = None):
         
         #Si me pasan un id, lo uso; si no, genero uno nuevo
         self.id = id if id else str(uuid.uuid4())
 
         self.nombre = nombre
-        self.categoria = categoria
-        self.autor = autor
-        self.editorial = editorial
+        # Categorías, autores y editoriales se repiten muchísimo: sys.intern hace
+        # que todos los libros compartan UNA sola copia de cada texto
+        self.categoria = sys.intern(categoria)
+        self.autor = sys.intern(autor)
+        self.editorial = sys.intern(editorial)
         self.paginas = paginas
-        self.id = id if id is not None else str(uuid.uuid4())
         self.cantidad = cantidad
 
     def mostrar_info(self):
         return (self.nombre, self.autor, self.editorial, self.categoria, self.paginas, self.cantidad, self.id)
 
+    def a_dict(self) -> dict:
+        """Los datos del libro tal como se guardan en el JSON."""
+        return {"id": self.id, "nombre": self.nombre, "categoria": self.categoria, "autor": self.autor,
+                "editorial": self.editorial, "paginas": self.paginas, "cantidad": self.cantidad}
+
+# ==============================
+# CLASE BIBLIOTECA (Almacén indexado)
+# ==============================
+def normalizar(texto: str) -> str:
+    """Clave de comparación: minúsculas y sin espacios a los lados."""
+    return texto.lower().strip()
+
+def trigramas(palabra: str) -> set:
+    """Pedazos de 3 letras, con dos espacios al inicio y uno al final: 'sol' -> '  s', ' so', 'sol', 'ol '."""
+    relleno = f"  {palabra} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+class BibliotecaStore:
+    """
+    Reemplaza la lista global de libros. Además de guardar los libros en orden
+    de llegada, mantiene índices que se actualizan en cada alta, baja o cambio:
+      - por (nombre, editorial) normalizados -> búsqueda exacta O(1)
+      - por nombre normalizado              -> búsqueda exacta O(1)
+      - índice invertido de palabras de nombre, categoría y editorial
+        -> los filtros revisan el vocabulario (miles de palabras) y no cada libro.
+      - índice de trigramas de ese vocabulario -> búsqueda tolerante a errores
+        de tipeo ("Soledda" encuentra "soledad") sin comparar contra cada libro.
+
+    Si se crea desde una foto binaria, los libros y los índices NO se construyen
+    al arrancar: se construyen la primera vez que algo los necesita.
+    """
+    CAMPOS_INDEXADOS = ("nombre", "categoria", "editorial")
+
+    def __init__(self, libros: list[Libro] = None, foto: foto_binaria.FotoBinaria = None):
+        self.diario = None       # Diario de cambios (se conecta después de cargar)
+        self._orden = {}         # Libro -> número de llegada (y orden de iteración)
+        self._por_id = {}        # id -> Libro
+        self._secuencia = 0
+        self._por_clave = {}     # (nombre, editorial) -> [Libro, ...]
+        self._por_nombre = {}    # nombre -> [Libro, ...]
+        self._duplicadas = set() # Claves con más de un libro (las que sanitizar debe fusionar)
+        self._palabras = {campo: {} for campo in self.CAMPOS_INDEXADOS} # campo -> palabra -> {Libro}
+        self._trigramas = {campo: {} for campo in self.CAMPOS_INDEXADOS} # campo -> trigrama -> {palabra}
+        self._foto = None
+        for libro in libros or []:
+            self.agregar(libro)
+        self._foto = foto        # Foto binaria aún sin convertir en libros
+
+    def _cargar_foto(self):
+        """Crea los libros de la foto binaria la primera vez que se necesitan."""
+        if self._foto is None:
+            return
+        foto, self._foto = self._foto, None
+        diario, self.diario = self.diario, None # Cargar no es un cambio: no se anota en el diario
+        try:
+            for registro in foto:
+                self.agregar(Libro(**registro))
+        finally:
+            self.diario = diario
+            foto.cerrar()
+
+    # --- Lista de libros ---
+    def __iter__(self):
+        self._cargar_foto()
+        return iter(list(self._orden))
+
+    def __len__(self):
+        return len(self._foto) if self._foto is not None else len(self._orden)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def tiene_duplicados(self) -> bool:
+        if self._foto is not None:
+            # La foto dice si al escribirla ya estaba limpia: no hace falta cargarla para saberlo
+            if self._foto.banderas & foto_binaria.SIN_DUPLICADOS:
+                return False
+            self._cargar_foto()
+        return bool(self._duplicadas)
+
+    @staticmethod
+    def _clave(libro: Libro) -> tuple:
+        return (normalizar(libro.nombre), normalizar(libro.editorial))
+
+    # --- Altas, bajas y cambios ---
+    def _registrar(self, registro: dict):
+        """Anota el cambio en el diario (si hay uno) y compacta cuando crece demasiado."""
+        if self.diario is None:
+            return
+        self.diario.registrar(registro)
+        if self.diario.pendientes >= COMPACTAR_CADA:
+            self.diario.compactar(self)
+
+    def agregar(self, libro: Libro):
+        self._cargar_foto()
+        self._orden[libro] = self._secuencia
+        self._secuencia += 1
+        self._por_id[libro.id] = libro
+
+        clave = self._clave(libro)
+        grupo = self._por_clave.setdefault(clave, [])
+        grupo.append(libro)
+        if len(grupo) > 1:
+            self._duplicadas.add(clave)
+        self._por_nombre.setdefault(clave[0], []).append(libro)
+
+        for campo in self.CAMPOS_INDEXADOS:
+            indice = self._palabras[campo]
+            for palabra in set(getattr(libro, campo).lower().split()):
+                if palabra not in indice:
+                    # Palabra nueva en el vocabulario: también entra al índice de trigramas
+                    for trigrama in trigramas(palabra):
+                        self._trigramas[campo].setdefault(trigrama, set()).add(palabra)
+                indice.setdefault(palabra, set()).add(libro)
+
+        # Al diario al final, con todos los índices ya al día: si esto dispara
+        # una compactación, la foto ve el cambio completo
+        self._registrar({"op": "agregar", "libro": libro.a_dict()})
+
+    def eliminar(self, libro: Libro):
+        self._cargar_foto()
+        del self._orden[libro]
+        if self._por_id.get(libro.id) is libro:
+            del self._por_id[libro.id]
+
+        clave = self._clave(libro)
+        grupo = self._por_clave[clave]
+        grupo.remove(libro)
+        if not grupo:
+            del self._por_clave[clave]
+        if len(grupo) <= 1:
+            self._duplicadas.discard(clave)
+        mismos_nombre = self._por_nombre[clave[0]]
+        mismos_nombre.remove(libro)
+        if not mismos_nombre:
+            del self._por_nombre[clave[0]]
+
+        for campo in self.CAMPOS_INDEXADOS:
+            indice = self._palabras[campo]
+            for palabra in set(getattr(libro, campo).lower().split()):
+                libros = indice[palabra]
+                libros.discard(libro)
+                if not libros:
+                    del indice[palabra]
+                    for trigrama in trigramas(palabra):
+                        palabras = self._trigramas[campo][trigrama]
+                        palabras.discard(palabra)
+                        if not palabras:
+                            del self._trigramas[campo][trigrama]
+
+        self._registrar({"op": "eliminar", "id": libro.id}) # Último paso, como en agregar
+
+    def ajustar_stock(self, libro: Libro, cambio: int) -> bool:
+        """Suma o resta stock sin dejarlo negativo (el stock no forma parte de ningún índice)."""
+        if libro.cantidad + cambio < 0:
+            return False
+        libro.cantidad += cambio
+        self._registrar({"op": "stock", "id": libro.id, "cantidad": libro.cantidad})
+        return True
+
+    def fijar_stock(self, libro: Libro, nuevo_stock: int) -> bool:
+        """Establece el stock a una cantidad exacta (no negativa)."""
+        if nuevo_stock < 0:
+            return False
+        libro.cantidad = nuevo_stock
+        self._registrar({"op": "stock", "id": libro.id, "cantidad": libro.cantidad})
+        return True
+
+    # --- Búsquedas ---
+    def buscar_por_id(self, id_libro: str) -> Libro | None:
+        self._cargar_foto()
+        return self._por_id.get(id_libro)
+
+    def buscar_por_clave(self, nombre: str, editorial: str) -> Libro | None:
+        self._cargar_foto()
+        grupo = self._por_clave.get((normalizar(nombre), normalizar(editorial)))
+        return grupo[0] if grupo else None
+
+    def buscar_por_nombre(self, nombre: str) -> Libro | None:
+        self._cargar_foto()
+        grupo = self._por_nombre.get(normalizar(nombre))
+        return grupo[0] if grupo else None
+
+    def filtrar(self, campo: str, valor_busqueda: str) -> list[Libro]:
+        """
+        Libros cuyo 'campo' contiene el texto buscado (mismo resultado que recorrer la lista).
+        Cada pedazo sin espacios del texto tiene que estar DENTRO de una palabra del campo,
+        así que primero buscamos en el vocabulario y solo verificamos esos candidatos.
+        """
+        valor_busqueda = normalizar(valor_busqueda)
+        if not valor_busqueda:
+            return list(self)
+        self._cargar_foto()
+
+        indice = self._palabras[campo]
+        candidatos = None
+        for pedazo in valor_busqueda.split():
+            coincidentes = set()
+            for palabra, libros in indice.items():
+                if pedazo in palabra:
+                    coincidentes |= libros
+            candidatos = coincidentes if candidatos is None else candidatos & coincidentes
+            if not candidatos:
+                return []
+
+        resultados = [l for l in candidatos if valor_busqueda in getattr(l, campo).lower()]
+        return sorted(resultados, key=self._orden.__getitem__)
+
+    def filtrar_difuso(self, campo: str, valor_busqueda: str, umbral: float = UMBRAL_DIFUSO) -> list[Libro]:
+        """
+        Como filtrar(), pero tolerando errores de tipeo: cada pedazo del texto se
+        compara contra el vocabulario del campo con similitud de trigramas
+        (en común / en total). Los libros salen del más parecido al menos parecido.
+        """
+        self._cargar_foto()
+        indice = self._palabras[campo]
+        puntajes = None # Libro -> suma de la mejor similitud de cada pedazo
+        for pedazo in normalizar(valor_busqueda).split():
+            propios = trigramas(pedazo)
+            # 1. Palabras que comparten algún trigrama con el pedazo (las demás valen 0)
+            comunes = {}
+            for trigrama in propios:
+                for palabra in self._trigramas[campo].get(trigrama, ()):
+                    comunes[palabra] = comunes.get(palabra, 0) + 1
+            # 2. Mejor similitud de cada libro para este pedazo
+            mejores = {}
+            for palabra, c in comunes.items():
+                similitud = c / (len(propios) + len(trigramas(palabra)) - c)
+                if similitud < umbral:
+                    continue
+                for libro in indice[palabra]:
+                    if similitud > mejores.get(libro, 0):
+                        mejores[libro] = similitud
+            # 3. El libro tiene que parecerse en TODOS los pedazos
+            if puntajes is None:
+                puntajes = mejores
+            else:
+                puntajes = {l: p + mejores[l] for l, p in puntajes.items() if l in mejores}
+            if not puntajes:
+                return []
+
+        return sorted(puntajes or {}, key=lambda l: (-puntajes[l], self._orden[l]))
+
+    # --- Limpieza ---
+    def fusionar_duplicados(self) -> int:
+        """
+        Fusiona libros con el mismo nombre + editorial: el primero se queda con
+        la suma del stock. Solo revisa las claves repetidas, no toda la biblioteca.
+        """
+        if not self.tiene_duplicados():
+            return 0
+        fusionados = 0
+        for clave in list(self._duplicadas):
+            principal, *repetidos = self._por_clave[clave]
+            for libro in repetidos:
+                self.ajustar_stock(principal, libro.cantidad)
+                self.eliminar(libro)
+                fusionados += 1
+        return fusionados
+
+# ==============================
+# DIARIO DE CAMBIOS (Write-ahead journal)
+# ==============================
+class Diario:
+    """
+    Cada alta, baja o cambio de stock se AGREGA como una línea JSON al final
+    de '<ARCHIVO_DB>.diario' en lugar de reescribir toda la biblioteca.
+    Guardar cuesta lo que mide el cambio, no lo que mide la biblioteca.
+
+    Cada cierto tiempo se "compacta": se escribe la foto completa en un archivo
+    temporal, se renombra encima de la anterior (operación atómica: nunca queda
+    un JSON a medio escribir) y se vacía el diario.
+
+    Los registros se pueden aplicar dos veces sin daño (el stock se guarda como
+    valor final, no como diferencia), así que si el programa se cae entre el
+    renombrado y el vaciado del diario, al reiniciar todo queda igual.
+    """
+
+    def __init__(self, ruta_foto: str, binaria: bool = False):
+        self.ruta_foto = ruta_foto
+        self.binaria = binaria # La foto se escribe en formato binario (foto_binaria.py)
+        self.ruta = f"{ruta_foto}.diario"
+        self.pendientes = 0 # Registros escritos desde la última compactación
+        self._archivo = None
+
+    def registrar(self, registro: dict):
+        if self._archivo is None:
+            self._archivo = open(self.ruta, "a", encoding="utf-8")
+        self._archivo.write(json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._archivo.flush() # Que llegue al sistema operativo: sobrevive a una caída del programa
+        self.pendientes += 1
+
+    def reproducir(self, store: BibliotecaStore) -> int:
+        """Aplica sobre 'store' los cambios anotados después de la última foto. Retorna cuántos."""
+        try:
+            with open(self.ruta, "rb") as archivo:
+                lineas = archivo.readlines()
+        except FileNotFoundError:
+            return 0
+
+        aplicados = 0
+        bytes_validos = 0
+        for linea in lineas:
+            try:
+                registro = json.loads(linea)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                # Última línea a medio escribir (el programa se cayó): se corta del archivo
+                # para que los próximos registros no queden detrás de basura
+                with open(self.ruta, "r+b") as archivo:
+                    archivo.truncate(bytes_validos)
+                break
+            bytes_validos += len(linea)
+            libro = store.buscar_por_id(registro.get("id") or registro.get("libro", {}).get("id"))
+            if registro["op"] == "agregar" and libro is None:
+                store.agregar(Libro(**registro["libro"]))
+            elif registro["op"] == "eliminar" and libro is not None:
+                store.eliminar(libro)
+            elif registro["op"] == "stock" and libro is not None:
+                store.fijar_stock(libro, registro["cantidad"])
+            aplicados += 1
+        self.pendientes = aplicados
+        return aplicados
+
+    def compactar(self, libros: BibliotecaStore):
+        """Escribe la foto completa de forma atómica y vacía el diario."""
+        if self.binaria:
+            datos = [libro.a_dict() for libro in libros] # Carga la foto anterior (y la cierra) antes de reemplazarla
+            # La bandera sale de los registros que se escriben, no de los índices del almacén
+            claves = {foto_binaria.clave_libro(d) for d in datos}
+            banderas = foto_binaria.SIN_DUPLICADOS if len(claves) == len(datos) else 0
+            foto_binaria.escribir(self.ruta_foto, foto_binaria.ESQUEMA_LIBRO, datos, banderas)
+        else:
+            temporal = f"{self.ruta_foto}.tmp"
+            with open(temporal, "w", encoding="utf-8") as archivo:
+                json.dump([libro.a_dict() for libro in libros], archivo, indent=4)
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(temporal, self.ruta_foto)
+
+        if self._archivo is not None:
+            self._archivo.close()
+        self._archivo = open(self.ruta, "w", encoding="utf-8") # Diario vacío
+        self.pendientes = 0
+
 # ==============================
 # VARIABLES GLOBALES
 # ==============================
-biblioteca = []
+biblioteca = BibliotecaStore()
 
 # ==============================
 # LÓGICA DE NEGOCIO (Backend)
 # ==============================
 def sanitizar_biblioteca():
-    global biblioteca
-    diccionario_unico = {}
-    duplicados = 0
-    
-    # print(f"{BLUE}Verificando integridad...{RESET}") # Comentado para no molestar tanto
-    for libro in biblioteca:
-        clave = f"{libro.nombre.lower().strip()}|{libro.editorial.lower().strip()}"
-        if clave in diccionario_unico:
-            diccionario_unico[clave].cantidad += libro.cantidad
-            duplicados += 1
-        else:
-            diccionario_unico[clave] = libro
+    duplicados = biblioteca.fusionar_duplicados()
             
+    # Las fusiones ya quedaron anotadas en el diario: no hace falta reescribir el archivo
     if duplicados > 0:
-        biblioteca = list(diccionario_unico.values())
         print(f"{GREEN}Limpieza: {duplicados} libros fusionados.{RESET}")
-        guardar_biblioteca()
 
 # ### NUEVO: FUNCIÓN MAESTRA DE BÚSQUEDA ###
 def filtrar_libros(criterio: str, valor_busqueda: str) -> list[Libro]:
@@ -63,31 +406,23 @@ def filtrar_libros(criterio: str, valor_busqueda: str) -> list[Libro]:
     Busca libros según un criterio específico.
     criterio: '1' (Nombre), '2' (Categoría), '3' (Editorial)
     """
-    valor_busqueda = valor_busqueda.lower().strip()
-    resultados = []
-
-    for libro in biblioteca:
-        coincidencia = False
-        # Aquí decidimos "dónde alumbrar con la linterna"
-        if criterio == "1": # Nombre
-            if valor_busqueda in libro.nombre.lower(): coincidencia = True
-        elif criterio == "2": # Categoría
-            if valor_busqueda in libro.categoria.lower(): coincidencia = True
-        elif criterio == "3": # Editorial
-            if valor_busqueda in libro.editorial.lower(): coincidencia = True
-        
-        if coincidencia:
-            resultados.append(libro)
-            
-    return resultados
+    campos = {"1": "nombre", "2": "categoria", "3": "editorial"}
+    if criterio not in campos:
+        return []
+    # El almacén usa sus índices de palabras en lugar de recorrer todos los libros
+    return biblioteca.filtrar(campos[criterio], valor_busqueda)
+
+def filtrar_libros_difuso(criterio: str, valor_busqueda: str) -> list[Libro]:
+    """Igual que filtrar_libros, pero encuentra palabras parecidas ('Soledda' -> 'soledad')."""
+    campos = {"1": "nombre", "2": "categoria", "3": "editorial"}
+    if criterio not in campos:
+        return []
+    return biblioteca.filtrar_difuso(campos[criterio], valor_busqueda)
 
 # ### NUEVO: BUSCADOR DE UN SOLO LIBRO (Para eliminar/editar) ###
 def buscar_libro_exacto(nombre: str) -> Libro | None:
     """Retorna el OBJETO libro si lo encuentra por nombre exacto (o parecido)."""
-    for libro in biblioteca:
-        if libro.nombre.lower() == nombre.lower().strip():
-            return libro
-    return None
+    return biblioteca.buscar_por_nombre(nombre)
 
 # ### NUEVO: ACTUALIZAR STOCK ###
 def actualizar_stock(libro: Libro, nueva_cantidad: int) -> bool:
@@ -96,49 +431,60 @@ def actualizar_stock(libro: Libro, nueva_cantidad: int) -> bool:
     nueva_cantidad puede ser positiva (suma) o negativa (resta).
     Retorna True si se actualizó correctamente, False si quedaría negativo.
     """
-    if libro.cantidad + nueva_cantidad >= 0:
-        libro.cantidad += nueva_cantidad
-        return True
-    else:
-        return False
+    return biblioteca.ajustar_stock(libro, nueva_cantidad)
     
 def buscar_libro_unico(nombre: str, editorial: str) -> Libro | None:
     """
     Busca un libro específico coincidiendo Nombre Y Editorial.
     Es necesario para eliminar o modificar sin errores.
     """
-    nombre_busqueda = nombre.lower().strip()
-    editorial_busqueda = editorial.lower().strip()
-
-    for libro in biblioteca:
-        # Verificamos las DOS condiciones
-        if (libro.nombre.lower().strip() == nombre_busqueda and 
-            libro.editorial.lower().strip() == editorial_busqueda):
-            return libro # ¡Encontrado el exacto!
-            
-    return None # No existe esa combinación
+    # Diccionario por (nombre, editorial): O(1), sin recorrer la biblioteca
+    return biblioteca.buscar_por_clave(nombre, editorial)
 
 # ==============================
 # PERSISTENCIA
 # ==============================
 def guardar_biblioteca():
-    lista_datos = [libro.__dict__ for libro in biblioteca]
+    """Foto completa y atómica de la biblioteca (compacta el diario)."""
     try:
-        with open(ARCHIVO_DB, "w", encoding="utf-8") as archivo:
-            json.dump(lista_datos, archivo, indent=4)
+        if biblioteca.diario is not None:
+            diario = biblioteca.diario
+        elif os.path.exists(ARCHIVO_BINARIO):
+            diario = Diario(ARCHIVO_BINARIO, binaria=True)
+        else:
+            diario = Diario(ARCHIVO_DB)
+        diario.compactar(biblioteca)
         # print(f"{GREEN}Guardado exitoso.{RESET}") # Comentado para limpiar consola
     except Exception as e:
         print(f"{RED}Error guardando: {e}{RESET}")
 
-def cargar_biblioteca() -> list[Libro]:
+def cargar_biblioteca() -> BibliotecaStore:
+    """
+    Carga la última foto, aplica encima el diario y deja el diario conectado.
+    Con foto binaria (ARCHIVO_BINARIO) el arranque no depende del tamaño de la biblioteca.
+    """
+    binaria = os.path.exists(ARCHIVO_BINARIO)
+    ruta_foto = ARCHIVO_BINARIO if binaria else ARCHIVO_DB
+    store = BibliotecaStore()
     try:
-        with open(ARCHIVO_DB, "r", encoding="utf-8") as archivo:
-            datos = json.load(archivo)
-            return [Libro(**d) for d in datos]
+        if binaria:
+            store = BibliotecaStore(foto=foto_binaria.FotoBinaria(ARCHIVO_BINARIO, foto_binaria.ESQUEMA_LIBRO))
+        else:
+            with open(ARCHIVO_DB, "r", encoding="utf-8") as archivo:
+                datos = json.load(archivo)
+                store = BibliotecaStore([Libro(**d) for d in datos])
     except FileNotFoundError:
-        return []
-    except json.JSONDecodeError:
-        return []
+        pass
+    except (json.JSONDecodeError, foto_binaria.FormatoInvalido):
+        # No la tratamos como vacía: la próxima foto la sobrescribiría y se perderían los datos
+        respaldo = f"{ruta_foto}.corrupto"
+        os.replace(ruta_foto, respaldo)
+        print(f"{RED}El archivo '{ruta_foto}' está dañado; se movió a '{respaldo}'.{RESET}")
+
+    diario = Diario(ruta_foto, binaria)
+    diario.reproducir(store)
+    store.diario = diario
+    return store
 
 # ==============================
 # INTERFAZ DE USUARIO (Frontend)
@@ -180,7 +526,7 @@ def obtener_datos_libro() -> tuple:
             
     return (nombre, categoria, autor, editorial, paginas, cantidad)
 
-def mostrar_resultados_tabla(lista_libros: list[Libro]):
+def mostrar_resultados_tabla(lista_libros):
     """Función auxiliar para imprimir tablas bonitas sin repetir código"""
     if not lista_libros:
         print(f"{RED}No se encontraron libros.{RESET}")
@@ -208,7 +554,7 @@ def mostrar_menu() -> str:
 def ejecutar_opcion(opcion: str) -> bool:
     if opcion == "1":
         datos = obtener_datos_libro()
-        biblioteca.append(Libro(*datos))
+        biblioteca.agregar(Libro(*datos))
         print(f"{GREEN}Registrado.{RESET}")
 
     elif opcion == "2":
@@ -225,6 +571,11 @@ def ejecutar_opcion(opcion: str) -> bool:
         if sub_opcion in ["1", "2", "3"]:
             termino = input("Ingrese el término a buscar: ")
             resultados = filtrar_libros(sub_opcion, termino)
+            if not resultados and termino.strip():
+                # Nada exacto: probamos con palabras parecidas (errores de tipeo)
+                resultados = filtrar_libros_difuso(sub_opcion, termino)
+                if resultados:
+                    print(f"{BLUE}Sin coincidencias exactas. Mostrando resultados parecidos:{RESET}")
             mostrar_resultados_tabla(resultados)
         else:
             print(f"{RED}Opción de filtro no válida.{RESET}")
@@ -243,8 +594,7 @@ def ejecutar_opcion(opcion: str) -> bool:
             try:
                 if sub_opcion == "1":
                     nuevo_stock = int(input("Ingrese la NUEVA cantidad total: "))
-                    if nuevo_stock >= 0:
-                        libro_encontrado.cantidad = nuevo_stock
+                    if biblioteca.fijar_stock(libro_encontrado, nuevo_stock):
                         print(f"{GREEN}Stock actualizado a {nuevo_stock}.{RESET}")
                     else:
                         print(f"{RED}El stock no puede ser negativo.{RESET}")
@@ -283,7 +633,7 @@ def ejecutar_opcion(opcion: str) -> bool:
             confirmar = input("¿Está seguro de borrarlo permanentemente? (si/no): ").lower()
             
             if confirmar == "si":
-                biblioteca.remove(libro_encontrado)
+                biblioteca.eliminar(libro_encontrado)
                 print(f"{GREEN}Libro eliminado exitosamente.{RESET}")
             else:
                 print(f"{BLUE}Operación cancelada.{RESET}")
@@ -292,7 +642,9 @@ def ejecutar_opcion(opcion: str) -> bool:
 
     elif opcion == "6":
         sanitizar_biblioteca()
-        guardar_biblioteca()
+        # Solo reescribimos la foto si el diario tiene cambios pendientes
+        if biblioteca.diario is None or biblioteca.diario.pendientes:
+            guardar_biblioteca()
         print("¡Adiós!")
         return False
 
@@ -1,21 +1,51 @@
+import os
 from flask import Flask, render_template
 
 # Importamos el blueprint que acabamos de crear
-from rutas import rutas_globales 
+from rutas import rutas_globales
+from biblioteca_sql import Session, motor, sugerencias_libros, preparar_base
+import metricas
 
-app = Flask(__name__)
 
-app.secret_key = "mi_secreto_super_seguro_ingenero_taurus"
+def create_app() -> Flask:
+    """
+    Fábrica de la aplicación (punto de entrada WSGI).
+    Producción: gunicorn "app:create_app()" (configuración en gunicorn.conf.py)
+    """
+    # ARRANQUE: tablas, migraciones e índices (idempotente; con --preload corre una vez en el maestro)
+    preparar_base()
 
-# REGISTRAMOS EL BLUEPRINT
-# Le decimos al Gerente: "Contrata a este empleado para que maneje las rutas"
-app.register_blueprint(rutas_globales)
+    app = Flask(__name__)
+
+    # Todos los workers deben usar la misma clave (firma de la cookie de sesión y los mensajes flash)
+    app.secret_key = os.environ.get("BIBLIOTECA_SECRET_KEY", "mi_secreto_super_seguro_ingenero_taurus")
+
+    # REGISTRAMOS EL BLUEPRINT
+    # Le decimos al Gerente: "Contrata a este empleado para que maneje las rutas"
+    app.register_blueprint(rutas_globales)
+
+    # MÉTRICAS: latencia por ruta, consultas por petición y /metrics para Prometheus
+    metricas.instrumentar_app(app)
+
+    # AUTOCOMPLETAR Y BÚSQUEDA DIFUSA: índices en memoria con los textos del catálogo (una lectura al arrancar)
+    # Con gunicorn --preload se construyen una sola vez en el maestro y los workers los heredan
+    sugerencias_libros.construir(motor)
+
+    # CIERRE DE LA SESIÓN SQL AL TERMINAR CADA PETICIÓN
+    # Devuelve la conexión al pool y descarta cambios sin confirmar (si hubo error)
+    @app.teardown_appcontext
+    def cerrar_sesion(exception=None):
+        Session.remove()
+
+    # MANEJO DE ERROR 404 (Página no encontrada)
+    @app.errorhandler(404)
+    def pagina_no_encontrada(e):
+        # Nota el '404' al final, es el código de estado HTTP
+        return render_template('404.html'), 404
+
+    return app
 
-# MANEJO DE ERROR 404 (Página no encontrada)
-@app.errorhandler(404)
-def pagina_no_encontrada(e):
-    # Nota el '404' al final, es el código de estado HTTP
-    return render_template('404.html'), 404
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    # Servidor de desarrollo (un solo proceso, recarga automática)
+    create_app().run(debug=True, port=5000)
@@ -1,8 +1,21 @@
+import os
 import re
 import uuid
 # Importamos el motor SQL
-from sqlalchemy import create_engine, Column, String, Integer, func 
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import Column, String, Integer, Index, update, bindparam, select, and_, or_
+from sqlalchemy.orm import declarative_base, sessionmaker, scoped_session, validates
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from fabrica_motor import crear_motor, ruta_base_datos
+import busqueda_fts
+import busqueda_difusa
+import lectura
+from paginacion import paginar_keyset, recorrer_keyset
+import cache_busquedas
+import sugerencias
+import metricas
+import version_catalogo
+import migraciones
+from migraciones import normalizar_clave
 
 # ==============================
 # CONFIGURACIÓN SQL (El Motor)
@@ -22,6 +35,19 @@ class Libro(Base):
     paginas = Column(Integer)
     cantidad = Column(Integer)
 
+    # Claves normalizadas (minúsculas y sin espacios) para buscar duplicados.
+    # Se llenan solas al asignar nombre/editorial (ver _actualizar_clave).
+    nombre_clave = Column(String)
+    editorial_clave = Column(String)
+
+    __table_args__ = (
+        # Índice para la paginación por cursor: ordenar y "saltar" por (nombre, id)
+        Index('ix_libros_nombre_id', 'nombre', 'id'),
+        # Un mismo título + editorial solo puede existir una vez.
+        # También convierte buscar_libro_unico en una búsqueda O(log n).
+        Index('ux_libros_clave', 'nombre_clave', 'editorial_clave', unique=True),
+    )
+
     def __init__(self, nombre, categoria, autor, editorial, paginas, cantidad):
         self.id = str(uuid.uuid4())
         self.nombre = nombre
@@ -31,26 +57,153 @@ class Libro(Base):
         self.paginas = paginas
         self.cantidad = cantidad
 
+    @validates('nombre', 'editorial')
+    def _actualizar_clave(self, campo, valor):
+        # Cada vez que cambia el nombre o la editorial, recalculamos su clave
+        setattr(self, f"{campo}_clave", normalizar_clave(valor))
+        return valor
+
     #Propiedad para el Frontend (CSS)
     @property
     def clase_css_stock(self):
-        return "stock-bajo" if self.cantidad < 5 else "stock-alto"
+        # Misma regla que el CASE de lectura.clase_stock (las páginas usan ese)
+        return "stock-bajo" if self.cantidad < lectura.STOCK_BAJO else "stock-alto"
         
 
 # 3. Encender el motor
+# La fábrica aplica el pool y los PRAGMAS de rendimiento (WAL, synchronous, mmap...).
+# La ruta del archivo se puede cambiar con la variable de entorno BIBLIOTECA_DB.
 # echo=False para que no nos llene la pantalla de texto técnico
-motor = create_engine('sqlite:///biblioteca_produccion.sqlite', echo=False) 
-Base.metadata.create_all(motor)
+motor = crear_motor('biblioteca_produccion.sqlite', echo=False) 
+# Cronómetro de cada sentencia SQL (ver /metrics y BIBLIOTECA_SQL_LENTO_MS)
+metricas.instrumentar_motor(motor)
+
+# Índice de texto completo para las búsquedas (False si SQLite no trae FTS5).
+# Se sabe al preparar la base: léalo como biblioteca_sql.FTS_DISPONIBLE, no con "from ... import"
+FTS_DISPONIBLE = False
+_base_preparada = False
+
+def preparar_base() -> bool:
+    """
+    Paso de arranque EXPLÍCITO: esquema, migraciones, FTS y contador de versión.
+    Antes corría al importar este módulo, así que cada worker y cada script lo
+    pagaba con solo importar. Lo llaman create_app(), el menú de consola y los
+    scripts; es idempotente y solo trabaja la primera vez en cada proceso.
+    Con BIBLIOTECA_ESQUEMA_LISTO=1 no toca el esquema (lo hizo otro proceso).
+    Retorna FTS_DISPONIBLE.
+    """
+    global FTS_DISPONIBLE, _base_preparada
+    if _base_preparada:
+        return FTS_DISPONIBLE
+    if os.environ.get("BIBLIOTECA_ESQUEMA_LISTO") == "1":
+        # El maestro de gunicorn ya preparó la base (on_starting en gunicorn.conf.py):
+        # varios workers haciendo DDL a la vez sobre una base nueva chocan
+        # ("table libros already exists"), así que aquí solo se mira si hay FTS
+        FTS_DISPONIBLE = busqueda_fts.fts_instalado(motor)
+        _base_preparada = True
+        return FTS_DISPONIBLE
+    Base.metadata.create_all(motor)
+
+    # Bases de datos antiguas: agregar y rellenar las columnas de clave
+    migraciones.migrar_claves(motor)
 
-# 4. Crear la Sesión (Nuestra conexión permanente)
-Session = sessionmaker(bind=motor)
-session = Session()
+    # create_all no toca tablas que ya existen, así que los índices nuevos
+    # se crean aparte para las bases de datos antiguas
+    for indice in Libro.__table__.indexes:
+        indice.create(motor, checkfirst=True)
+
+    FTS_DISPONIBLE = busqueda_fts.instalar_fts(motor)
+
+    # Contador de versión del catálogo (ETag de /catalogo), mantenido por triggers
+    version_catalogo.instalar_version(motor)
+    _base_preparada = True
+    return FTS_DISPONIBLE
+
+# 4. Crear la Sesión (Una por hilo / petición)
+# scoped_session entrega a cada hilo su propia sesión (su propia conexión e
+# identity map). 'session' es un proxy: session.query(...) usa la sesión del
+# hilo actual, así que un commit fallido en una petición no envenena a las demás.
+# La app web la cierra al final de cada petición con Session.remove().
+Session = scoped_session(sessionmaker(bind=motor))
+session = Session
+
+# 5. Caché de resultados de búsqueda (se invalida sola con cada commit que toque 'libros')
+# Con BIBLIOTECA_CACHE_BUSQUEDAS=compartida, los workers comparten el archivo <base>.cache
+# Las claves llevan la versión del catálogo: un cambio hecho por OTRO proceso también la invalida
+busquedas = cache_busquedas.CacheBusquedas(
+    cache_busquedas.crear_backend(ruta_compartida=f"{ruta_base_datos('biblioteca_produccion.sqlite')}.cache"),
+    leer_version=lambda: version_catalogo.leer_version(session)[0])
+cache_busquedas.invalidar_con_eventos(Session.session_factory, Libro.__table__, busquedas)
+
+# 6. Índices en memoria del buscador: prefijos (autocompletar) y trigramas (búsqueda difusa)
+# La app web los llena al arrancar; los cambios de esta sesión se aplican al hacer commit
+sugerencias_libros = sugerencias.Sugerencias()
+sugerencias.sincronizar_con_eventos(Session.session_factory, Libro, sugerencias_libros)
+
+def preparar_proceso_hijo():
+    """
+    Llamar en cada proceso creado con fork después de importar este módulo
+    (gunicorn --preload, ver post_fork en gunicorn.conf.py). Una conexión
+    SQLite no se puede usar desde dos procesos: el hijo olvida las que heredó
+    del maestro, sin cerrarlas (siguen siendo del maestro), y abre las suyas.
+    """
+    motor.dispose(close=False)
+    busquedas.backend.tras_fork()
 
 # ==============================
 # COLORES Y UTILIDADES
 # ==============================
 RED, GREEN, BLUE, RESET = "\033[91m", "\033[92m", "\033[94m", "\033[0m"
 
+# ==============================
+# SALIDA POR PÁGINAS (Consola)
+# ==============================
+# Antes el catálogo hacía .all() y recién después imprimía: con una base grande
+# la terminal se congelaba y la memoria se disparaba.
+# Ahora cada pantalla es una consulta por cursor (keyset, ver paginacion.py):
+# la primera página sale en tiempo constante y "Siguiente" / "Anterior" cuestan
+# lo mismo en cualquier punto del catálogo. "Todo" imprime lo que falta en
+# flujo (yield_per / stream_results): las filas nunca están todas en memoria.
+POR_PAGINA_CONSOLA = 20
+LOTE_CONSOLA = 500 # Filas por viaje al imprimir "todo"
+
+def paginar_en_consola(obtener_pagina, imprimir_fila, resto=None, primera=None):
+    """
+    Muestra los resultados de a una página y pregunta hacia dónde seguir.
+    obtener_pagina(despues, antes) -> (filas, cursor_anterior, cursor_siguiente)
+    resto(cursor) -> filas que siguen a 'cursor', en flujo (opción "Todo")
+    primera: la primera página si el llamador ya la pidió.
+    """
+    filas, anterior, siguiente = primera or obtener_pagina(None, None)
+    numero = 1
+    while True:
+        for fila in filas:
+            imprimir_fila(fila)
+
+        opciones = []
+        if siguiente:
+            opciones.append("[s] Siguiente")
+        if anterior:
+            opciones.append("[a] Anterior")
+        if siguiente and resto:
+            opciones.append("[t] Todo")
+        if not opciones:
+            return # Todo cupo en esta página
+
+        eleccion = input(f"{BLUE}Página {numero} | {' | '.join(opciones)} | [Enter] Volver: {RESET}").strip().lower()
+        if eleccion == "s" and siguiente:
+            filas, anterior, siguiente = obtener_pagina(siguiente, None)
+            numero += 1
+        elif eleccion == "a" and anterior:
+            filas, anterior, siguiente = obtener_pagina(None, anterior)
+            numero -= 1
+        elif eleccion == "t" and siguiente and resto:
+            for fila in resto(siguiente):
+                imprimir_fila(fila)
+            return
+        else:
+            return
+
 # ==============================
 # LÓGICA DE NEGOCIO (SQL)
 # ==============================
@@ -60,15 +213,121 @@ def buscar_libro_unico(nombre: str, editorial: str):
     Busca en la BD ignorando mayúsculas/minúsculas y espacios extra.
     Devuelve el objeto Libro o None si no lo encuentra.
     """
-    nombre_usuario = nombre.strip().lower()
-    editorial_usuario = editorial.strip().lower()
-
+    # Comparamos contra las columnas de clave: usa el índice único ux_libros_clave
     # session.query(Modelo).filter(...).first() devuelve el objeto o None
     return session.query(Libro).filter(
-        func.lower(Libro.nombre) == nombre_usuario,
-        func.lower(Libro.editorial) == editorial_usuario
+        Libro.nombre_clave == normalizar_clave(nombre),
+        Libro.editorial_clave == normalizar_clave(editorial)
     ).first()
 
+def buscar_con_cache(termino: str, pagina: str, calcular) -> tuple[list, dict]:
+    """
+    Resultados de una búsqueda pasando por la caché.
+    calcular() ejecuta la consulta real y retorna (libros, extra) donde 'extra'
+    son datos serializables (cursores, total...). Retorna (libros, resultado)
+    con resultado = {"ids": [...], **extra}.
+    """
+    cargados = []
+    def calcular_ids():
+        libros, extra = calcular()
+        cargados.extend(libros)
+        return {"ids": [l.id for l in libros], **extra}
+
+    resultado = busquedas.consultar(termino, pagina, calcular_ids)
+    if not cargados and resultado["ids"]:
+        # Acierto: solo se cargan los libros de la página, por llave primaria
+        cargados = busqueda_fts.cargar_en_orden(session, Libro, resultado["ids"])
+    return cargados, resultado
+
+# ### STOCK ATÓMICO (Un solo UPDATE, sin SELECT previo) ###
+# "cantidad = cantidad + delta" lo calcula SQLite dentro de la misma sentencia:
+# dos peticiones simultáneas ya no se pisan el resultado (lost update).
+_tabla_libros = Libro.__table__
+
+_SQL_AJUSTE = (
+    update(_tabla_libros)
+    .where(_tabla_libros.c.id == bindparam("b_id"))
+    .where(_tabla_libros.c.cantidad + bindparam("b_delta") >= 0)
+    .values(cantidad=_tabla_libros.c.cantidad + bindparam("b_delta"))
+)
+
+def ajustar_stock(id_libro: str, delta: int) -> bool:
+    """
+    Suma (delta positivo) o resta (delta negativo) stock en una sola sentencia.
+    Retorna True si se aplicó, False si el libro no existe o quedaría negativo.
+    El commit lo hace quien llama.
+    """
+    resultado = session.execute(_SQL_AJUSTE, {"b_id": id_libro, "b_delta": delta})
+    return resultado.rowcount == 1
+
+def fijar_stock(id_libro: str, nuevo_stock: int) -> bool:
+    """Establece el stock a un valor exacto (>= 0) con un único UPDATE."""
+    if nuevo_stock < 0:
+        return False
+    resultado = session.execute(
+        update(_tabla_libros).where(_tabla_libros.c.id == id_libro).values(cantidad=nuevo_stock)
+    )
+    return resultado.rowcount == 1
+
+def ajustar_stock_lote(ajustes: list[tuple[str, int]]) -> list[dict]:
+    """
+    Aplica muchos (id, delta) en UNA transacción (ej: sincronización de una caja).
+    Camino rápido: un solo executemany. Si alguna fila fue rechazada, se deshace
+    ese intento (SAVEPOINT) y se repite fila por fila para saber cuáles fallaron.
+    Retorna la lista de rechazados: [{"id", "delta", "motivo"}]. El commit lo hace quien llama.
+    """
+    if not ajustes:
+        return []
+    parametros = [{"b_id": id_libro, "b_delta": delta} for id_libro, delta in ajustes]
+    # session.execute (y no la conexión directa) para que la caché de búsquedas vea la escritura
+    punto = session.begin_nested()
+    if session.execute(_SQL_AJUSTE, parametros).rowcount == len(parametros):
+        punto.commit()
+        return []
+    punto.rollback()
+
+    # Camino lento: solo cuando hay al menos un rechazo
+    rechazados = []
+    for id_libro, delta in ajustes:
+        if session.execute(_SQL_AJUSTE, {"b_id": id_libro, "b_delta": delta}).rowcount != 1:
+            rechazados.append({"id": id_libro, "delta": delta})
+
+    # Una sola consulta para distinguir "no existe" de "stock insuficiente"
+    existentes = set(session.execute(
+        select(_tabla_libros.c.id).where(_tabla_libros.c.id.in_({r["id"] for r in rechazados}))
+    ).scalars())
+    for rechazo in rechazados:
+        rechazo["motivo"] = "stock insuficiente" if rechazo["id"] in existentes else "no existe"
+    return rechazados
+
+# ### REGISTRO ATÓMICO (Upsert) ###
+# Un solo INSERT ... ON CONFLICT: si ya hay un libro con la misma clave
+# (nombre + editorial normalizados), SQLite le suma la cantidad en la misma
+# sentencia. Sin SELECT previo, dos registros simultáneos no pueden crear duplicados.
+def registrar_o_sumar(nombre: str, categoria: str, autor: str, editorial: str,
+                      paginas: int, cantidad: int) -> tuple[str, bool]:
+    """
+    Crea el libro o suma 'cantidad' al existente.
+    Retorna (id del libro, True si era nuevo). El commit lo hace quien llama.
+    """
+    id_nuevo = str(uuid.uuid4())
+    sentencia = sqlite_insert(_tabla_libros).values(
+        id=id_nuevo, nombre=nombre, categoria=categoria, autor=autor, editorial=editorial,
+        paginas=paginas, cantidad=cantidad,
+        nombre_clave=normalizar_clave(nombre), editorial_clave=normalizar_clave(editorial),
+    )
+    sentencia = sentencia.on_conflict_do_update(
+        index_elements=["nombre_clave", "editorial_clave"],
+        set_={"cantidad": _tabla_libros.c.cantidad + sentencia.excluded.cantidad},
+    ).returning(_tabla_libros.c.id)
+    id_libro = session.execute(sentencia).scalar_one()
+    es_nuevo = id_libro == id_nuevo
+    if es_nuevo:
+        # Core no pasa por el flush del ORM: avisamos al índice de sugerencias (se aplica en el commit)
+        session.info.setdefault("libros_registrados", []).append(
+            {"nombre": nombre, "categoria": categoria, "autor": autor, "editorial": editorial})
+    return id_libro, es_nuevo
+
 def registrar_libro_sql():
     print(f"\n{BLUE}--- Nuevo Registro SQL ---{RESET}")
     # 1. Pedimos Nombre y Editorial primero
@@ -88,7 +347,9 @@ def registrar_libro_sql():
                 try:
                     cant = int(input("Cantidad a sumar: "))
                     if cant > 0:
-                        existe.cantidad += cant # SQL Alchemy detecta el cambio
+                        # Mismo upsert que un registro nuevo: si alguien lo borró mientras tanto, se vuelve a crear
+                        registrar_o_sumar(existe.nombre, existe.categoria, existe.autor, existe.editorial,
+                                          existe.paginas, cant)
                         session.commit() # ¡GUARDADO!
                         print(f"{GREEN}Stock actualizado.{RESET}")
                         break
@@ -121,26 +382,28 @@ def registrar_libro_sql():
         except ValueError:
             print(f"{RED}Error: Ingrese un número entero.{RESET}")
     
-    # CREAR (Insert)
-    nuevo_libro = Libro(nombre, categoria, autor, editorial, paginas, cantidad)
-    # ...
-
-    # CREAR (Insert)
+    # CREAR (Insert) o, si otro lo registró mientras tanto, sumar el stock
     try:
-        nuevo_libro = Libro(nombre, categoria, autor, editorial, paginas, cantidad)
-        session.add(nuevo_libro)
+        id_libro, es_nuevo = registrar_o_sumar(nombre, categoria, autor, editorial, paginas, cantidad)
         session.commit() # ¡GUARDADO PERMANENTE!
-        print(f"{GREEN}Libro guardado en SQLite con ID: {nuevo_libro.id}{RESET}")
+        if es_nuevo:
+            print(f"{GREEN}Libro guardado en SQLite con ID: {id_libro}{RESET}")
+        else:
+            print(f"{GREEN}El libro ya existía: se sumaron {cantidad} unidades al stock.{RESET}")
     except Exception as e:
         session.rollback() # En caso de error, revertir cambios
         print(f"{RED}Error al guardar el libro: {e}{RESET}")
 
 def ver_catalogo_sql():
-    # LEER (Select All)
-    # session.query(Libro).all() trae TODA la tabla convertida en objetos
-    libros = session.query(Libro).all()
-    
-    if not libros:
+    # LEER (por páginas)
+    # Solo las columnas que se imprimen, como tuplas: sin un objeto Libro por fila
+    consulta = lectura.consulta_catalogo(session, Libro)
+
+    def obtener_pagina(despues, antes):
+        return paginar_keyset(consulta, Libro, despues=despues, antes=antes, por_pagina=POR_PAGINA_CONSOLA)
+
+    primera = obtener_pagina(None, None)
+    if not primera[0]:
         print("La base de datos está vacía.")
         return
 
@@ -149,9 +412,13 @@ def ver_catalogo_sql():
     print("=" * 120)
     print(f"\n{'TÍTULO':<40} | {'CATEGORIA':<15} | {'AUTOR':<15} | {'EDITORIAL':<15} | {'PÁGINAS':<15} | STOCK")
     print("-" * 120)
-    for l in libros:
+
+    def imprimir(l):
         print(f"{l.nombre:<40} | {l.categoria:<15} | {l.autor:<15} | {l.editorial:<15} | {l.paginas:<15} | {l.cantidad}")
 
+    paginar_en_consola(obtener_pagina, imprimir, primera=primera,
+                       resto=lambda cursor: recorrer_keyset(consulta, Libro, cursor, LOTE_CONSOLA))
+
 def eliminar_libro_sql():
     nombre = input("Nombre exacto: ")
     editorial = input("Editorial exacta: ")
@@ -167,6 +434,51 @@ def eliminar_libro_sql():
     else:
         print(f"{RED}No encontrado.{RESET}")
 
+def buscar_en_columna(columna: str, termino: str, alternativas: list = None) -> tuple:
+    """
+    Libros cuyo 'columna' coincide con el término, listos para paginar_en_consola:
+    retorna (obtener_pagina, resto).
+    alternativas: palabras parecidas de la búsqueda difusa (IndiceTrigramas.corregir)
+    que se usan en lugar de las palabras del término.
+    """
+    expresion = None
+    if FTS_DISPONIBLE:
+        expresion = (busqueda_fts.expresion_alternativas(alternativas, columnas=(columna,)) if alternativas
+                     else busqueda_fts.expresion_fts(termino, columnas=(columna,)))
+    if expresion:
+        # Índice de texto completo: resultados por relevancia y por prefijo ("pot" -> "Potter")
+        def paginar(despues, antes):
+            return busqueda_fts.buscar_paginado(session, Libro, expresion, despues=despues, antes=antes,
+                                                por_pagina=POR_PAGINA_CONSOLA)
+        def resto(cursor):
+            return busqueda_fts.recorrer(session, Libro, expresion, despues=cursor, tamano_lote=LOTE_CONSOLA)
+    else:
+        # Respaldo: .ilike() ignora mayúsculas/minúsculas pero recorre toda la tabla
+        columna_orm = getattr(Libro, columna)
+        consulta = lectura.consulta_catalogo(session, Libro) # Solo se muestran: filas, no objetos
+        if alternativas:
+            consulta = consulta.filter(and_(*(
+                or_(*(columna_orm.ilike(f"%{palabra}%") for palabra, _ in grupo)) for grupo in alternativas
+            )))
+        else:
+            consulta = consulta.filter(columna_orm.ilike(f"%{termino}%"))
+        def paginar(despues, antes):
+            return paginar_keyset(consulta, Libro, despues=despues, antes=antes, por_pagina=POR_PAGINA_CONSOLA)
+        def resto(cursor):
+            return recorrer_keyset(consulta, Libro, cursor, LOTE_CONSOLA)
+
+    def obtener_pagina(despues, antes):
+        # Cada página repetida sale de la caché (hasta que un commit cambie 'libros')
+        def calcular():
+            libros, anterior, siguiente = paginar(despues, antes)
+            return libros, {"anterior": anterior, "siguiente": siguiente}
+        modo = "difusa" if alternativas else "exacta"
+        libros, resultado = buscar_con_cache(f"{columna}:{modo}:{termino}",
+                                             f"despues={despues or ''}|antes={antes or ''}", calcular)
+        return libros, resultado["anterior"], resultado["siguiente"]
+
+    return obtener_pagina, resto
+
 def filtrar_sql():
     print(f"\n{BLUE}--- Búsqueda Avanzada ---{RESET}")
     print("1. Buscar por Nombre")
@@ -182,23 +494,31 @@ def filtrar_sql():
     # 2. Solo si pasó la validación, pedimos el término
     term = input("Ingrese término a buscar: ").strip()
     
-    resultados = []
-    
-    # Usamos .ilike() en lugar de .contains() para que ignore mayúsculas/minúsculas
-    # (SQLAlchemy traduce ilike a una búsqueda flexible)
-    if op == "1":
-        resultados = session.query(Libro).filter(Libro.nombre.ilike(f"%{term}%")).all()
-    elif op == "2":
-        resultados = session.query(Libro).filter(Libro.categoria.ilike(f"%{term}%")).all()
+    columna = "nombre" if op == "1" else "categoria"
+
+    # Solo se pide la primera página: el resto llega a medida que el usuario avanza
+    obtener_pagina, resto = buscar_en_columna(columna, term)
+    primera = obtener_pagina(None, None)
+
+    # Nada exacto: probamos con las palabras del catálogo que más se parecen ("Soledda" -> "soledad")
+    if not primera[0] and term:
+        sugerencias_libros.asegurar(motor) # La consola arma el vocabulario la primera vez que lo usa
+        alternativas = sugerencias_libros.trigramas.corregir(term, campos=(columna,))
+        if alternativas:
+            obtener_pagina, resto = buscar_en_columna(columna, term, alternativas)
+            primera = obtener_pagina(None, None)
+            if primera[0]:
+                print(f"{BLUE}Sin coincidencias exactas. Resultados parecidos a: "
+                      f"{busqueda_difusa.describir(alternativas)}{RESET}")
         
     # 3. Reporte de Resultados
-    if resultados:
-        print(f"\n{GREEN}Se encontraron {len(resultados)} libros:{RESET}")
+    if primera[0]:
+        print(f"\n{GREEN}Libros encontrados:{RESET}")
         print("-" * 40)
         print(f"\n {'TÍTULO':<15} | {'EDITORIAL':<5} | STOCK")
         print("-" * 40)
-        for l in resultados:
-            print(f"📖 {l.nombre} | ({l.editorial}) | {l.cantidad}")
+        paginar_en_consola(obtener_pagina, lambda l: print(f"📖 {l.nombre} | ({l.editorial}) | {l.cantidad}"),
+                           resto=resto, primera=primera)
     else:
         print(f"{RED}No se encontraron libros que coincidan con '{term}'.{RESET}")
 
@@ -206,6 +526,7 @@ def filtrar_sql():
 # MENÚ PRINCIPAL
 # ==============================
 def main():
+    preparar_base()
     while True:
         print("\n" + "="*30)
         print("      🏛️ BIBLIOTECA SQL")
@@ -0,0 +1,158 @@
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+
+# ==============================
+# BÚSQUEDA TOLERANTE A ERRORES (Trigramas)
+# ==============================
+# "Soledda" no es subcadena de nada, así que ni ilike ni FTS lo encuentran.
+# En lugar de comparar el término contra CADA libro (Levenshtein fila por fila),
+# corregimos las palabras del término contra el VOCABULARIO del catálogo
+# (las palabras distintas de títulos, autores, editoriales y categorías):
+#
+#   1. Cada palabra se parte en trigramas: "soledad" -> "  s", " so", "sol", ..., "ad "
+#   2. Un índice invertido trigrama -> palabras da los candidatos que comparten
+#      trigramas; los que comparten muy pocos se descartan sin calcular nada (poda).
+#   3. Similitud = trigramas en común / trigramas en total (Jaccard, como pg_trgm).
+#   4. Con las palabras corregidas se hace la búsqueda normal (FTS o ilike).
+#
+# El vocabulario crece mucho más lento que el catálogo: corregir cuesta lo mismo
+# con mil libros que con un millón de libros del mismo tipo.
+
+# Similitud mínima para aceptar una palabra parecida (0.3 es el valor por defecto de pg_trgm)
+UMBRAL_SIMILITUD = float(os.environ.get("BIBLIOTECA_UMBRAL_DIFUSO", "0.3"))
+MAX_ALTERNATIVAS = 3 # Palabras parecidas que se prueban por cada palabra del término
+LARGO_MINIMO = 3     # Palabras más cortas no se corrigen (tienen muy pocos trigramas)
+
+
+def normalizar(texto: str) -> str:
+    """'  García Márquez' -> 'garcia marquez' (sin tildes, minúsculas, espacios simples)."""
+    descompuesto = unicodedata.normalize("NFKD", texto.lower())
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_tildes.split())
+
+
+def palabras(texto: str) -> list[str]:
+    """Palabras buscables de un texto, normalizadas."""
+    return re.findall(r"\w+", normalizar(texto or ""))
+
+
+def trigramas(palabra: str) -> frozenset:
+    """Con dos espacios al inicio y uno al final, como pg_trgm: pesa más el comienzo de la palabra."""
+    relleno = f"  {palabra} "
+    return frozenset(relleno[i:i + 3] for i in range(len(relleno) - 2))
+
+
+class IndiceTrigramas:
+    """
+    Vocabulario del catálogo con su índice invertido de trigramas.
+    Cuenta en cuántos textos aparece cada (campo, palabra): cuando el último
+    libro que la usaba se borra, la palabra sale del índice.
+    """
+
+    def __init__(self):
+        self._conteos = {}      # (campo, palabra) -> textos que la contienen
+        self._campos = {}       # palabra -> {campos donde aparece}
+        self._trigramas = {}    # palabra -> frozenset de trigramas
+        self._por_trigrama = {} # trigrama -> {palabras}
+        self._candado = threading.Lock()
+
+    @classmethod
+    def construir(cls, conteos_textos) -> "IndiceTrigramas":
+        """Desde {(campo, texto): cuántos libros lo tienen}; cada texto distinto se parte una sola vez."""
+        indice = cls()
+        for (campo, texto), veces in conteos_textos.items():
+            for palabra in set(palabras(texto)):
+                indice._sumar(campo, palabra, veces)
+        return indice
+
+    def _sumar(self, campo: str, palabra: str, veces: int):
+        clave = (campo, palabra)
+        total = self._conteos.get(clave, 0) + veces
+        if total > 0:
+            self._conteos[clave] = total
+            self._campos.setdefault(palabra, set()).add(campo)
+        else:
+            self._conteos.pop(clave, None)
+            campos = self._campos.get(palabra)
+            if campos is not None:
+                campos.discard(campo)
+        if palabra not in self._trigramas and self._campos.get(palabra):
+            # Palabra nueva en el vocabulario
+            trigramas_palabra = self._trigramas[palabra] = trigramas(palabra)
+            for trigrama in trigramas_palabra:
+                self._por_trigrama.setdefault(trigrama, set()).add(palabra)
+        elif palabra in self._trigramas and not self._campos.get(palabra):
+            # Ya ningún libro la usa
+            self._campos.pop(palabra, None)
+            for trigrama in self._trigramas.pop(palabra):
+                grupo = self._por_trigrama[trigrama]
+                grupo.discard(palabra)
+                if not grupo:
+                    del self._por_trigrama[trigrama]
+
+    def agregar(self, campo: str, texto: str):
+        with self._candado:
+            for palabra in set(palabras(texto)):
+                self._sumar(campo, palabra, 1)
+
+    def quitar(self, campo: str, texto: str):
+        with self._candado:
+            for palabra in set(palabras(texto)):
+                self._sumar(campo, palabra, -1)
+
+    def similares(self, palabra: str, campos: tuple = None, umbral: float = UMBRAL_SIMILITUD,
+                  limite: int = MAX_ALTERNATIVAS) -> list[tuple[str, float]]:
+        """Palabras del vocabulario con similitud >= umbral, de la más parecida a la menos."""
+        propios = trigramas(palabra)
+        # Poda: con c trigramas en común la similitud nunca supera c / len(propios),
+        # y una palabra con más de len(propios) / umbral trigramas tampoco puede llegar
+        minimo_comunes = math.ceil(umbral * len(propios))
+        maximo_largo = len(propios) / umbral
+        with self._candado:
+            comunes = Counter()
+            for trigrama in propios:
+                comunes.update(self._por_trigrama.get(trigrama, ()))
+            resultado = []
+            for candidata, c in comunes.items():
+                if c < minimo_comunes:
+                    continue
+                ajenos = self._trigramas[candidata]
+                if len(ajenos) > maximo_largo:
+                    continue
+                if campos is not None and not self._campos[candidata].intersection(campos):
+                    continue
+                similitud = c / (len(propios) + len(ajenos) - c)
+                if similitud >= umbral:
+                    resultado.append((candidata, similitud))
+        resultado.sort(key=lambda par: (-par[1], par[0]))
+        return resultado[:limite]
+
+    def corregir(self, termino: str, campos: tuple = None,
+                 umbral: float = UMBRAL_SIMILITUD) -> list[list[tuple[str, float]]] | None:
+        """
+        Alternativas para cada palabra del término: [[("soledad", 0.45)], [("cien", 1.0)]].
+        Las palabras cortas se dejan tal cual. Retorna None si alguna palabra no se
+        parece a nada del catálogo (la búsqueda no puede tener resultados).
+        """
+        alternativas = []
+        for palabra in palabras(termino):
+            if len(palabra) < LARGO_MINIMO:
+                alternativas.append([(palabra, 1.0)])
+                continue
+            parecidas = self.similares(palabra, campos, umbral)
+            if not parecidas:
+                return None
+            alternativas.append(parecidas)
+        return alternativas or None
+
+    def __len__(self):
+        return len(self._trigramas)
+
+
+def describir(alternativas: list[list[tuple[str, float]]]) -> str:
+    """'soledad/soledades cien' para mostrarle al usuario qué se buscó."""
+    return " ".join("/".join(p for p, _ in grupo) for grupo in alternativas)
@@ -0,0 +1,246 @@
+import re
+from contextlib import contextmanager
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from paginacion import codificar_cursor, decodificar_cursor, POR_PAGINA
+import lectura
+
+# ==============================
+# BÚSQUEDA DE TEXTO COMPLETO (SQLite FTS5)
+# ==============================
+# ilike('%term%') nunca puede usar un índice: recorre TODA la tabla.
+# FTS5 guarda un índice invertido (palabra -> libros), así que buscar
+# cuesta lo mismo con 100 libros que con un millón.
+#
+# La tabla virtual 'libros_fts' es de "contenido externo": no duplica el
+# texto, solo apunta al rowid de 'libros'. Los triggers la mantienen al día
+# en cada INSERT, UPDATE y DELETE.
+
+TABLA_FTS = "libros_fts"
+
+# bm25 con un peso por columna (nombre, autor, editorial, categoria):
+# un acierto en el título pesa más que uno en el autor, etc.
+PESOS_RANKING = "bm25(10.0, 5.0, 2.0, 1.0)"
+
+# Columnas donde busca el catálogo web (la categoría está en el índice pero no se busca).
+# La búsqueda difusa debe corregir contra estas mismas (ver rutas._buscar_pagina)
+COLUMNAS_BUSQUEDA = ("nombre", "autor", "editorial")
+
+_DDL_FTS = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA_FTS} USING fts5(
+        nombre, autor, editorial, categoria,
+        content='libros', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS libros_fts_ai AFTER INSERT ON libros BEGIN
+        INSERT INTO {TABLA_FTS}(rowid, nombre, autor, editorial, categoria)
+        VALUES (new.rowid, new.nombre, new.autor, new.editorial, new.categoria);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS libros_fts_ad AFTER DELETE ON libros BEGIN
+        INSERT INTO {TABLA_FTS}({TABLA_FTS}, rowid, nombre, autor, editorial, categoria)
+        VALUES ('delete', old.rowid, old.nombre, old.autor, old.editorial, old.categoria);
+    END""",
+    # Solo se dispara si cambia el texto: actualizar el stock no toca el índice
+    f"""CREATE TRIGGER IF NOT EXISTS libros_fts_au AFTER UPDATE OF nombre, autor, editorial, categoria ON libros BEGIN
+        INSERT INTO {TABLA_FTS}({TABLA_FTS}, rowid, nombre, autor, editorial, categoria)
+        VALUES ('delete', old.rowid, old.nombre, old.autor, old.editorial, old.categoria);
+        INSERT INTO {TABLA_FTS}(rowid, nombre, autor, editorial, categoria)
+        VALUES (new.rowid, new.nombre, new.autor, new.editorial, new.categoria);
+    END""",
+]
+
+
+def instalar_fts(motor) -> bool:
+    """
+    Crea la tabla FTS5 y sus triggers si no existen.
+    Si la tabla es nueva (base de datos antigua) la llena con los libros actuales.
+    Retorna False si este SQLite no trae FTS5; en ese caso se sigue usando ilike.
+    """
+    try:
+        with motor.begin() as conexion:
+            existia = conexion.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :nombre"),
+                {"nombre": TABLA_FTS},
+            ).first() is not None
+            for sentencia in _DDL_FTS:
+                conexion.execute(text(sentencia))
+            if not existia:
+                conexion.execute(text(f"INSERT INTO {TABLA_FTS}({TABLA_FTS}, rank) VALUES ('rank', :r)"),
+                                 {"r": PESOS_RANKING})
+                conexion.execute(text(f"INSERT INTO {TABLA_FTS}({TABLA_FTS}) VALUES ('rebuild')"))
+        return True
+    except OperationalError as error:
+        # Solo "no hay FTS5" significa ilike; un "database is locked" u otro fallo
+        # del DDL no debe dejar al proceso sin índice en silencio por el resto de su vida
+        if "no such module: fts5" in str(error):
+            return False
+        raise
+
+
+def fts_instalado(motor) -> bool:
+    """
+    ¿La base ya tiene el índice y este SQLite sabe leerlo? Solo lee, no crea nada
+    (para los procesos que no preparan el esquema, ver biblioteca_sql.preparar_base).
+    """
+    with motor.connect() as conexion:
+        try:
+            conexion.execute(text(f"SELECT rowid FROM {TABLA_FTS} LIMIT 0"))
+        except OperationalError as error:
+            if "no such table" in str(error) or "no such module" in str(error):
+                return False
+            raise
+    return True
+
+
+def reconstruir_fts(motor):
+    """
+    Regenera el índice desde cero.
+    Necesario tras un VACUUM: 'libros' no tiene INTEGER PRIMARY KEY y SQLite
+    puede renumerar sus rowid, dejando el índice apuntando a filas equivocadas.
+    Lo hace deduplicar.py al terminar (y después de su --vacuum).
+    """
+    with motor.begin() as conexion:
+        conexion.execute(text(f"INSERT INTO {TABLA_FTS}({TABLA_FTS}) VALUES ('rebuild')"))
+
+
+@contextmanager
+def carga_masiva(motor):
+    """
+    Para insertar muchísimas filas de una vez (ej: importar_json.py con la base vacía).
+    Quita el trigger de INSERT, que indexa fila por fila, y al terminar
+    reconstruye el índice completo UNA sola vez.
+    Cada paso va en su propia transacción: el trigger vuelve aunque la carga falle.
+    """
+    with motor.begin() as conexion:
+        conexion.execute(text("DROP TRIGGER IF EXISTS libros_fts_ai"))
+    try:
+        yield
+    finally:
+        with motor.begin() as conexion:
+            conexion.execute(text(_DDL_FTS[1]))
+            conexion.execute(text(f"INSERT INTO {TABLA_FTS}({TABLA_FTS}) VALUES ('rebuild')"))
+
+
+def expresion_fts(termino: str, columnas: tuple = COLUMNAS_BUSQUEDA) -> str | None:
+    """
+    Traduce lo que escribe el usuario a una consulta MATCH segura.
+    'harry pot' -> {nombre autor editorial} : ("harry"* AND "pot"*)
+    Cada palabra va entre comillas (así los operadores de FTS5 no se inyectan)
+    y con '*' para que funcione como prefijo mientras el usuario escribe.
+    Retorna None si el término no tiene ninguna palabra buscable.
+    """
+    palabras = re.findall(r"\w+", termino.lower())
+    if not palabras:
+        return None
+    terminos = " AND ".join(f'"{p}"*' for p in palabras)
+    return f"{{{' '.join(columnas)}}} : ({terminos})"
+
+
+def expresion_alternativas(alternativas: list[list[tuple[str, float]]],
+                           columnas: tuple = COLUMNAS_BUSQUEDA) -> str:
+    """
+    Versión de expresion_fts para la búsqueda difusa: cada palabra del usuario
+    se reemplaza por sus palabras parecidas (busqueda_difusa.IndiceTrigramas.corregir).
+    [[("soledad", .45), ("soledades", .32)], [("cien", 1)]]
+    -> {nombre autor editorial} : (("soledad"* OR "soledades"*) AND ("cien"*))
+    """
+    grupos = " AND ".join(
+        "(" + " OR ".join(f'"{palabra}"*' for palabra, _ in grupo) + ")" for grupo in alternativas
+    )
+    return f"{{{' '.join(columnas)}}} : ({grupos})"
+
+
+def _ids_rankeados(session, expresion: str, despues=None, antes=None, limite: int = None):
+    """Ejecuta el MATCH y devuelve filas (id, rank, rowid) ordenadas por relevancia."""
+    parametros = {"expresion": expresion}
+    filtro_cursor = ""
+    orden = "ASC"
+    if despues is not None:
+        filtro_cursor = "AND (f.rank, f.rowid) > (:rank, :rowid)"
+        parametros.update(rank=despues[0], rowid=despues[1])
+    elif antes is not None:
+        filtro_cursor = "AND (f.rank, f.rowid) < (:rank, :rowid)"
+        parametros.update(rank=antes[0], rowid=antes[1])
+        orden = "DESC"
+    sql = f"""
+        SELECT l.id, f.rank, f.rowid
+        FROM {TABLA_FTS} AS f JOIN libros AS l ON l.rowid = f.rowid
+        WHERE {TABLA_FTS} MATCH :expresion {filtro_cursor}
+        ORDER BY f.rank {orden}, f.rowid {orden}
+    """
+    if limite is not None:
+        sql += " LIMIT :limite"
+        parametros["limite"] = limite
+    return session.execute(text(sql), parametros).all()
+
+
+def cargar_en_orden(session, modelo, ids: list) -> list:
+    """
+    Trae los libros por su llave primaria respetando el orden del ranking.
+    Son filas de solo columnas (lectura.py), no objetos: los resultados solo se muestran.
+    """
+    return lectura.filas_por_id(session, modelo, ids)
+
+
+def buscar(session, modelo, expresion: str) -> list:
+    """Todos los libros que coinciden, del más relevante al menos relevante."""
+    filas = _ids_rankeados(session, expresion)
+    return cargar_en_orden(session, modelo, [f.id for f in filas])
+
+
+def subconsulta_ids(expresion: str):
+    """SELECT de los ids que coinciden, para usar dentro de un .filter(Libro.id.in_(...))."""
+    return text(
+        f"SELECT l.id FROM {TABLA_FTS} AS f JOIN libros AS l ON l.rowid = f.rowid "
+        f"WHERE {TABLA_FTS} MATCH :expresion"
+    ).bindparams(expresion=expresion)
+
+
+def contar(session, expresion: str) -> int:
+    """Cuántos libros coinciden (solo se usa cuando se pide el total exacto)."""
+    return session.execute(
+        text(f"SELECT count(*) FROM {TABLA_FTS} WHERE {TABLA_FTS} MATCH :expresion"),
+        {"expresion": expresion},
+    ).scalar()
+
+
+def buscar_paginado(session, modelo, expresion: str, despues: str = None, antes: str = None,
+                    por_pagina: int = POR_PAGINA):
+    """
+    Igual que paginacion.paginar_keyset pero ordenado por relevancia:
+    el cursor guarda (rank, rowid) de la fila frontera.
+    Retorna (libros, cursor_anterior, cursor_siguiente).
+    """
+    cursor_despues = decodificar_cursor(despues, tipos=(float, int))
+    cursor_antes = decodificar_cursor(antes, tipos=(float, int)) if cursor_despues is None else None
+
+    filas = _ids_rankeados(session, expresion, despues=cursor_despues, antes=cursor_antes,
+                           limite=por_pagina + 1)
+    if cursor_antes is not None:
+        hay_mas_atras = len(filas) > por_pagina
+        filas = list(reversed(filas[:por_pagina]))
+        hay_mas_adelante = True
+    else:
+        hay_mas_adelante = len(filas) > por_pagina
+        filas = filas[:por_pagina]
+        hay_mas_atras = cursor_despues is not None
+
+    if not filas:
+        return [], None, None
+
+    cursor_anterior = codificar_cursor(filas[0].rank, filas[0].rowid) if hay_mas_atras else None
+    cursor_siguiente = codificar_cursor(filas[-1].rank, filas[-1].rowid) if hay_mas_adelante else None
+    return cargar_en_orden(session, modelo, [f.id for f in filas]), cursor_anterior, cursor_siguiente
+
+
+def recorrer(session, modelo, expresion: str, despues: str = None, tamano_lote: int = 500):
+    """
+    Generador de todos los libros que coinciden a partir del cursor 'despues',
+    en orden de relevancia. Los pide por lotes con buscar_paginado: la memoria
+    no crece con la cantidad de resultados.
+    """
+    while True:
+        libros, _, despues = buscar_paginado(session, modelo, expresion, despues=despues, por_pagina=tamano_lote)
+        yield from libros
+        if despues is None:
+            return
@@ -0,0 +1,268 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+import metricas
+
+# ==============================
+# CACHÉ DE BÚSQUEDAS (LRU + TTL)
+# ==============================
+# Los términos populares ("harry", "garcía"...) repiten la misma consulta una
+# y otra vez. Aquí se guarda (término normalizado, página) -> ids encontrados
+# (más cursores / total), así la segunda vez solo se cargan esos libros por id.
+#
+# Invalidación exacta: cada clave lleva la versión del catálogo
+# (version_catalogo.leer_version, un contador que suben triggers de SQLite con
+# cualquier INSERT / UPDATE / DELETE sobre 'libros'). Lo guardado antes de un
+# cambio ya nunca se vuelve a leer, venga el cambio de este proceso, de otro
+# worker de gunicorn, de la consola o de importar_json.py / deduplicar.py.
+# Además, los eventos de la sesión de SQLAlchemy vacían la caché cuando ESTE
+# proceso confirma un cambio (libera la memoria de lo que ya no sirve).
+#
+# Backends intercambiables:
+#   - BackendMemoria: un diccionario por proceso (por defecto).
+#   - BackendCompartido: un archivo SQLite que comparten todos los workers de
+#     gunicorn de la misma máquina. Hace las veces de Redis/Memcached.
+# Sin leer_version (por ejemplo, fuera de la app), la clave usa la "generación"
+# del backend, que solo suben los commits de las sesiones conectadas.
+#
+# Configuración (variables de entorno):
+#   BIBLIOTECA_CACHE_BUSQUEDAS = memoria | compartida | apagada
+#   BIBLIOTECA_CACHE_BUSQUEDAS_TTL = segundos que vive cada resultado (por defecto 300)
+#   BIBLIOTECA_CACHE_BUSQUEDAS_MAXIMO = resultados guardados como máximo (por defecto 1024)
+
+TTL_POR_DEFECTO = float(os.environ.get("BIBLIOTECA_CACHE_BUSQUEDAS_TTL", "300"))
+MAXIMO_POR_DEFECTO = int(os.environ.get("BIBLIOTECA_CACHE_BUSQUEDAS_MAXIMO", "1024"))
+
+
+def normalizar_termino(termino: str) -> str:
+    """'  Harry   POTTER ' -> 'harry potter' (misma búsqueda, misma clave)."""
+    return " ".join(termino.lower().split())
+
+
+# ==============================
+# BACKENDS
+# ==============================
+class BackendMemoria:
+    """LRU en un OrderedDict, con vencimiento por TTL. Seguro entre hilos."""
+
+    def __init__(self, maximo: int = MAXIMO_POR_DEFECTO):
+        self.maximo = maximo
+        self._datos = OrderedDict() # clave -> (vence, valor)
+        self._generacion = 0
+        self._candado = threading.Lock()
+
+    def obtener(self, clave: str):
+        with self._candado:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return None
+            if entrada[0] < time.monotonic():
+                del self._datos[clave]
+                return None
+            self._datos.move_to_end(clave)
+            return entrada[1]
+
+    def guardar(self, clave: str, valor, ttl: float):
+        with self._candado:
+            self._datos[clave] = (time.monotonic() + ttl, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maximo:
+                self._datos.popitem(last=False)
+
+    def generacion(self) -> int:
+        return self._generacion
+
+    def subir_generacion(self):
+        with self._candado:
+            self._generacion += 1
+            self._datos.clear() # Nada de lo guardado vuelve a servir: liberamos la memoria ya
+
+    def tras_fork(self):
+        pass # El hijo recibe su propia copia del diccionario
+
+    def __len__(self):
+        return len(self._datos)
+
+
+class BackendCompartido:
+    """
+    La misma interfaz sobre un archivo SQLite aparte (no la base de los libros).
+    Varios procesos pueden abrirlo a la vez; cada hilo usa su propia conexión.
+    Los valores se guardan como JSON.
+    """
+
+    def __init__(self, ruta: str, maximo: int = MAXIMO_POR_DEFECTO):
+        self.ruta = ruta
+        self.maximo = maximo
+        self._local = threading.local()
+        with self._conexion() as conexion:
+            conexion.execute("""CREATE TABLE IF NOT EXISTS cache (
+                clave TEXT PRIMARY KEY, valor TEXT NOT NULL, vence REAL NOT NULL, usado REAL NOT NULL)""")
+            conexion.execute("CREATE INDEX IF NOT EXISTS ix_cache_usado ON cache (usado)")
+            conexion.execute("CREATE TABLE IF NOT EXISTS generacion (id INTEGER PRIMARY KEY CHECK (id = 1), valor INTEGER NOT NULL)")
+            conexion.execute("INSERT OR IGNORE INTO generacion (id, valor) VALUES (1, 0)")
+
+    def _conexion(self) -> sqlite3.Connection:
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            conexion = self._local.conexion = sqlite3.connect(self.ruta, timeout=5)
+            conexion.execute("PRAGMA journal_mode = WAL")
+            conexion.execute("PRAGMA synchronous = OFF") # Es una caché: perderla no hace daño
+        return conexion
+
+    def obtener(self, clave: str):
+        with self._conexion() as conexion:
+            fila = conexion.execute("SELECT valor, vence FROM cache WHERE clave = ?", (clave,)).fetchone()
+            if fila is None:
+                return None
+            if fila[1] < time.time():
+                conexion.execute("DELETE FROM cache WHERE clave = ?", (clave,))
+                return None
+            conexion.execute("UPDATE cache SET usado = ? WHERE clave = ?", (time.time(), clave))
+            return json.loads(fila[0])
+
+    def guardar(self, clave: str, valor, ttl: float):
+        ahora = time.time()
+        with self._conexion() as conexion:
+            conexion.execute("INSERT OR REPLACE INTO cache (clave, valor, vence, usado) VALUES (?, ?, ?, ?)",
+                             (clave, json.dumps(valor), ahora + ttl, ahora))
+            # Recorte LRU: se van las menos usadas
+            conexion.execute("""DELETE FROM cache WHERE clave IN (
+                SELECT clave FROM cache ORDER BY usado
+                LIMIT max(0, (SELECT COUNT(*) FROM cache) - ?))""", (self.maximo,))
+
+    def generacion(self) -> int:
+        return self._conexion().execute("SELECT valor FROM generacion WHERE id = 1").fetchone()[0]
+
+    def subir_generacion(self):
+        with self._conexion() as conexion:
+            conexion.execute("UPDATE generacion SET valor = valor + 1 WHERE id = 1")
+            conexion.execute("DELETE FROM cache")
+
+    def tras_fork(self):
+        """En un proceso hijo: olvidar las conexiones heredadas (un archivo SQLite no se comparte por fork)."""
+        self._local = threading.local()
+
+    def __len__(self):
+        return self._conexion().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+class BackendApagado:
+    """Sin caché: siempre 'fallo' (útil para comparar tiempos)."""
+
+    def obtener(self, clave: str):
+        return None
+
+    def guardar(self, clave: str, valor, ttl: float):
+        pass
+
+    def generacion(self) -> int:
+        return 0
+
+    def subir_generacion(self):
+        pass
+
+    def tras_fork(self):
+        pass
+
+    def __len__(self):
+        return 0
+
+
+def crear_backend(tipo: str = None, ruta_compartida: str = None, maximo: int = MAXIMO_POR_DEFECTO):
+    """Backend según BIBLIOTECA_CACHE_BUSQUEDAS (memoria | compartida | apagada)."""
+    tipo = (tipo or os.environ.get("BIBLIOTECA_CACHE_BUSQUEDAS", "memoria")).lower()
+    if tipo == "memoria":
+        return BackendMemoria(maximo)
+    if tipo == "compartida":
+        if not ruta_compartida:
+            raise ValueError("La caché compartida necesita la ruta de su archivo")
+        return BackendCompartido(ruta_compartida, maximo)
+    if tipo == "apagada":
+        return BackendApagado()
+    raise ValueError(f"BIBLIOTECA_CACHE_BUSQUEDAS desconocido: '{tipo}'")
+
+
+# ==============================
+# CACHÉ + INVALIDACIÓN
+# ==============================
+class CacheBusquedas:
+    """Fachada sobre el backend: claves normalizadas, TTL y contadores de aciertos/fallos."""
+
+    def __init__(self, backend, ttl: float = TTL_POR_DEFECTO, leer_version=None):
+        self.backend = backend
+        self.ttl = ttl
+        self.leer_version = leer_version # () -> int, la versión del catálogo en la base
+        self.aciertos = 0
+        self.fallos = 0
+
+    def consultar(self, termino: str, pagina: str, calcular):
+        """
+        Resultado guardado para (termino, pagina) o, si no hay, el de calcular()
+        (que debe ser serializable en JSON: listas, textos, números).
+        """
+        # La versión se lee ANTES de consultar la base: si un commit llega
+        # mientras se calcula, el resultado queda con la versión vieja y no se usa
+        generacion = self.leer_version() if self.leer_version else self.backend.generacion()
+        clave = f"{generacion}\x1f{normalizar_termino(termino)}\x1f{pagina}"
+        valor = self.backend.obtener(clave)
+        if valor is not None:
+            self.aciertos += 1
+            metricas.busqueda_cache.incrementar("acierto")
+            return valor
+        self.fallos += 1
+        metricas.busqueda_cache.incrementar("fallo")
+        valor = calcular()
+        self.backend.guardar(clave, valor, self.ttl)
+        return valor
+
+    def invalidar(self):
+        self.backend.subir_generacion()
+        metricas.busqueda_cache.incrementar("invalidacion")
+
+
+def invalidar_con_eventos(fabrica_sesiones, tabla, cache: CacheBusquedas):
+    """
+    Conecta la caché a las sesiones de 'fabrica_sesiones' (un sessionmaker):
+    cualquier escritura sobre 'tabla' (ORM o sentencias insert/update/delete
+    ejecutadas con session.execute) que cambie filas marca la sesión, y al
+    hacer commit se invalida.
+    Un rollback descarta la marca: lo que no se guardó no cambia los resultados.
+    """
+
+    def marcar(sesion):
+        sesion.info["cambio_en_" + tabla.name] = True
+
+    @event.listens_for(fabrica_sesiones, "after_flush")
+    def revisar_flush(sesion, contexto):
+        for objeto in (*sesion.new, *sesion.dirty, *sesion.deleted):
+            if getattr(objeto, "__table__", None) is tabla:
+                marcar(sesion)
+                return
+
+    @event.listens_for(fabrica_sesiones, "do_orm_execute")
+    def revisar_sentencia(estado):
+        if ((estado.is_insert or estado.is_update or estado.is_delete)
+                and getattr(estado.statement, "table", None) is tabla):
+            # Se ejecuta aquí mismo para mirar rowcount: un UPDATE que no tocó
+            # ninguna fila (stock insuficiente, id inexistente) no invalida nada.
+            # Con RETURNING, SQLite no sabe el rowcount hasta leer las filas: se marca siempre
+            resultado = estado.invoke_statement()
+            if resultado.returns_rows or resultado.rowcount != 0:
+                marcar(estado.session)
+            return resultado
+
+    @event.listens_for(fabrica_sesiones, "after_commit")
+    def al_confirmar(sesion):
+        # El RELEASE de un SAVEPOINT también dispara after_commit: esperamos al commit real
+        if not sesion.in_nested_transaction() and sesion.info.pop("cambio_en_" + tabla.name, False):
+            cache.invalidar()
+
+    @event.listens_for(fabrica_sesiones, "after_rollback")
+    def al_deshacer(sesion):
+        if not sesion.in_nested_transaction():
+            sesion.info.pop("cambio_en_" + tabla.name, None)
@@ -0,0 +1,55 @@
+import argparse
+import os
+import time
+from fabrica_motor import crear_motor, ruta_base_datos
+import migraciones
+import busqueda_fts
+
+# ==============================
+# DEDUPLICAR LA BASE (Una sola vez)
+# ==============================
+# Fusiona los libros repetidos (misma clave nombre + editorial) que ya están
+# en una base SQLite. Todo ocurre dentro de SQL con GROUP BY: ningún libro
+# pasa por Python. Al terminar queda el índice único ux_libros_clave, así que
+# los registros nuevos (upsert de registrar_o_sumar) ya no pueden duplicarse
+# y no hace falta volver a ejecutarlo.
+#
+# También es el paso de mantenimiento de la base: con --vacuum compacta el
+# archivo (recupera el espacio de los libros borrados) y, siempre, reconstruye
+# el índice FTS5 (un VACUUM puede renumerar los rowid a los que apunta).
+#
+# Uso (desde la carpeta biblioteca_libros):
+#   python deduplicar.py                     # la base de la app (BIBLIOTECA_DB)
+#   python deduplicar.py --db ../biblioteca.sqlite
+#   python deduplicar.py --vacuum
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fusiona libros duplicados directamente en SQLite.")
+    parser.add_argument("--db", default=None, help="Base SQLite a limpiar (por defecto la de la app)")
+    parser.add_argument("--vacuum", action="store_true", help="Compactar el archivo al terminar (VACUUM)")
+    args = parser.parse_args()
+
+    if args.db:
+        os.environ["BIBLIOTECA_DB"] = args.db # crear_motor toma la ruta del entorno
+    ruta = ruta_base_datos('biblioteca_produccion.sqlite')
+    motor = crear_motor(ruta)
+    inicio = time.perf_counter()
+    resumen = migraciones.deduplicar(motor)
+    if args.vacuum:
+        # VACUUM no puede ir dentro de una transacción
+        with motor.connect().execution_options(isolation_level="AUTOCOMMIT") as conexion:
+            conexion.exec_driver_sql("VACUUM")
+    reconstruido = busqueda_fts.fts_instalado(motor)
+    if reconstruido:
+        busqueda_fts.reconstruir_fts(motor)
+    motor.dispose()
+
+    print(f"{ruta}: {resumen['filas_antes']} libros | Claves rellenadas: {resumen['claves_rellenadas']} | "
+          f"Fusionados: {resumen['fusionados']} | Quedan: {resumen['filas_despues']}")
+    print(f"VACUUM: {'sí' if args.vacuum else 'no'} | Índice FTS: {'reconstruido' if reconstruido else 'no instalado'}")
+    print(f"{time.perf_counter() - inicio:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
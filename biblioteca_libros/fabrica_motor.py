@@ -0,0 +1,95 @@
+import os
+from sqlalchemy import create_engine, event
+
+# ==============================
+# FÁBRICA DEL MOTOR SQL (Un solo lugar para crear el Engine)
+# ==============================
+# Todos los puntos de entrada (CLI, app web, workers de gunicorn, scripts)
+# piden su motor aquí, así comparten la misma configuración.
+#
+# Variables de entorno:
+#   BIBLIOTECA_DB                  Ruta del archivo SQLite (sobrescribe la ruta por defecto)
+#   BIBLIOTECA_POOL_SIZE / _MAX_OVERFLOW / _POOL_TIMEOUT / _POOL_RECYCLE
+#   BIBLIOTECA_SQLITE_<PRAGMA>     Ej: BIBLIOTECA_SQLITE_SYNCHRONOUS=FULL
+
+# PRAGMAS que se aplican a CADA conexión nueva
+# - journal_mode=WAL: los lectores ya no se bloquean mientras alguien escribe
+# - synchronous=NORMAL: en WAL es seguro ante caídas de la app y evita un fsync por commit
+# - mmap_size: lee el archivo mapeado en memoria (menos copias de datos)
+# - cache_size: negativo = KiB de caché de páginas por conexión
+# - temp_store=MEMORY: ordenamientos e índices temporales en RAM
+# - busy_timeout: milisegundos esperando un bloqueo antes de fallar con "database is locked"
+PRAGMAS_POR_DEFECTO = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 268435456,   # 256 MiB
+    "cache_size": -65536,     # 64 MiB
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+
+
+def _leer_pragmas() -> dict:
+    """Pragmas por defecto, sobrescritos por BIBLIOTECA_SQLITE_<NOMBRE> si existe."""
+    pragmas = {}
+    for nombre, valor in PRAGMAS_POR_DEFECTO.items():
+        pragmas[nombre] = os.environ.get(f"BIBLIOTECA_SQLITE_{nombre.upper()}", valor)
+    return pragmas
+
+
+def _leer_pool() -> dict:
+    """Tamaño del pool de conexiones (cada hilo toma su propia conexión)."""
+    return {
+        "pool_size": int(os.environ.get("BIBLIOTECA_POOL_SIZE", "5")),          # Conexiones que se mantienen abiertas
+        "max_overflow": int(os.environ.get("BIBLIOTECA_MAX_OVERFLOW", "10")),    # Extras permitidas en picos de tráfico
+        "pool_timeout": float(os.environ.get("BIBLIOTECA_POOL_TIMEOUT", "30")),  # Segundos esperando una conexión libre
+        "pool_recycle": int(os.environ.get("BIBLIOTECA_POOL_RECYCLE", "3600")),  # Renovar conexiones viejas (segundos)
+        "pool_pre_ping": True,
+    }
+
+
+def ruta_base_datos(ruta_por_defecto: str) -> str:
+    """La ruta del entorno (BIBLIOTECA_DB) gana sobre la del código."""
+    return os.environ.get("BIBLIOTECA_DB", ruta_por_defecto)
+
+
+def crear_motor(ruta_por_defecto: str, pragmas: dict = None, usar_entorno: bool = True, **opciones):
+    """
+    Crea el Engine de SQLite con el pool configurado y los PRAGMAS aplicados.
+    Con usar_entorno=False la ruta es siempre 'ruta_por_defecto' (BIBLIOTECA_DB no la cambia).
+    'opciones' se pasa tal cual a create_engine (ej: echo=True).
+    """
+    configuracion = _leer_pool()
+    configuracion.update(opciones)
+    ruta = ruta_base_datos(ruta_por_defecto) if usar_entorno else ruta_por_defecto
+    motor = create_engine(f"sqlite:///{ruta}", **configuracion)
+
+    pragmas_finales = _leer_pragmas()
+    pragmas_finales.update(pragmas or {})
+
+    @event.listens_for(motor, "connect")
+    def aplicar_pragmas(conexion_dbapi, registro_conexion):
+        cursor = conexion_dbapi.cursor()
+        for nombre, valor in pragmas_finales.items():
+            cursor.execute(f"PRAGMA {nombre} = {valor}")
+        cursor.close()
+
+    return motor
+
+
+def calentar_pool(motor, cantidad: int) -> int:
+    """
+    Abre hasta 'cantidad' conexiones (cada una con sus PRAGMAS) y las deja
+    esperando en el pool: las primeras peticiones no pagan por conectarse.
+    Retorna cuántas se abrieron.
+    """
+    conexiones = []
+    try:
+        for _ in range(min(cantidad, motor.pool.size())):
+            conexion = motor.connect()
+            conexion.exec_driver_sql("SELECT 1")
+            conexiones.append(conexion)
+    finally:
+        for conexion in conexiones:
+            conexion.close() # Vuelve al pool, no se cierra de verdad
+    return len(conexiones)
@@ -0,0 +1,106 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+
+# ==============================
+# GUNICORN (Servidor de producción)
+# ==============================
+# Uso (desde la carpeta biblioteca_libros; gunicorn lee este archivo solo):
+#   gunicorn "app:create_app()"
+#
+# Variables de entorno:
+#   BIBLIOTECA_BIND           Dirección donde escuchar (por defecto 127.0.0.1:8000)
+#   BIBLIOTECA_WORKERS        Procesos (por defecto uno por núcleo)
+#   BIBLIOTECA_THREADS        Hilos por proceso (por defecto 4)
+#   BIBLIOTECA_PRELOAD        1 = importar la app UNA vez en el maestro y luego hacer fork
+#   BIBLIOTECA_CALENTAR_POOL  Conexiones que cada worker abre antes de su primera petición
+#
+# Esquema: el maestro prepara la base (tablas, migraciones, índices, FTS) UNA
+# vez antes de crear los workers; los workers no hacen DDL (BIBLIOTECA_ESQUEMA_LISTO).
+#
+# Recarga sin cortar peticiones: kill -HUP <pid del maestro>
+#   Arrancan workers nuevos y los viejos terminan lo que estaban atendiendo
+#   (hasta graceful_timeout segundos). Con BIBLIOTECA_PRELOAD=1 el código ya
+#   está cargado en el maestro y HUP no lo relee: para desplegar código nuevo
+#   se reemplaza el maestro (kill -USR2 <pid>, y luego -TERM al maestro viejo).
+
+# 1. Procesos e hilos
+# Python ejecuta un hilo a la vez por proceso (GIL): dibujar plantillas y
+# armar filas usa CPU, así que un proceso por núcleo aprovecha toda la máquina.
+# Los hilos cubren las esperas (SQLite en disco, clientes lentos).
+bind = os.environ.get("BIBLIOTECA_BIND", "127.0.0.1:8000")
+workers = int(os.environ.get("BIBLIOTECA_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.environ.get("BIBLIOTECA_THREADS", "4"))
+worker_class = "gthread" if threads > 1 else "sync"
+
+# Cada hilo usa su propia sesión y su propia conexión: el pool de cada worker
+# del tamaño de sus hilos evita abrir y cerrar conexiones "extra" en los picos.
+# (Se lee al crear el motor, que ocurre después de cargar esta configuración)
+os.environ.setdefault("BIBLIOTECA_POOL_SIZE", str(threads))
+
+# 2. Tiempos
+timeout = 30          # Worker colgado más de 30 s -> se reemplaza
+graceful_timeout = 30 # Al recargar o apagar: tiempo para terminar las peticiones en curso
+keepalive = 5
+
+# Reciclar cada worker tras ~10.000 peticiones (el jitter evita que todos reinicien a la vez)
+max_requests = 10000
+max_requests_jitter = 1000
+
+# Latidos de los workers en memoria y no en disco
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+# 3. Precarga
+# Con preload, el maestro importa la app (migraciones e índices en memoria una
+# sola vez) y los workers nacen como copias: arrancan y se reemplazan al instante.
+preload_app = os.environ.get("BIBLIOTECA_PRELOAD", "0") == "1"
+
+CALENTAR_POOL = int(os.environ.get("BIBLIOTECA_CALENTAR_POOL", "0"))
+
+CARPETA_APP = os.path.dirname(os.path.abspath(__file__))
+
+
+# ==============================
+# GANCHOS (Hooks)
+# ==============================
+def _preparar_esquema(server):
+    """
+    preparar_base() una sola vez, antes de que nazca cualquier worker.
+    Sin preload corre en un proceso aparte: así el maestro no importa la app
+    y HUP sigue cargando el código nuevo en los workers.
+    Si falla, gunicorn no arranca (mejor que workers muriendo uno por uno).
+    """
+    if not server.cfg.preload_app: # Con preload, create_app() ya la preparó en el maestro
+        entorno = {k: v for k, v in os.environ.items() if k != "BIBLIOTECA_ESQUEMA_LISTO"}
+        subprocess.run([sys.executable, "-c", "import biblioteca_sql; biblioteca_sql.preparar_base()"],
+                       cwd=CARPETA_APP, env=entorno, check=True)
+    os.environ["BIBLIOTECA_ESQUEMA_LISTO"] = "1" # Los workers heredan el entorno del maestro
+    server.log.info("Base de datos preparada")
+
+
+def on_starting(server):
+    _preparar_esquema(server)
+
+
+def on_reload(server):
+    # HUP: el código nuevo puede traer migraciones nuevas
+    _preparar_esquema(server)
+
+
+def post_fork(server, worker):
+    # Con preload, el motor y sus conexiones se crearon en el maestro:
+    # cada worker debe abrir las suyas (sin preload todavía no existen)
+    if "biblioteca_sql" in sys.modules:
+        from biblioteca_sql import preparar_proceso_hijo
+        preparar_proceso_hijo()
+
+
+def post_worker_init(worker):
+    # La app ya está cargada en este worker: abrir conexiones antes de recibir tráfico
+    if CALENTAR_POOL > 0:
+        from biblioteca_sql import motor
+        from fabrica_motor import calentar_pool
+        abiertas = calentar_pool(motor, CALENTAR_POOL)
+        worker.log.info("Pool calentado: %d conexiones", abiertas)
@@ -0,0 +1,205 @@
+import argparse
+import contextlib
+import json
+import os
+import time
+import uuid
+from sqlalchemy import bindparam, insert, select, tuple_, update
+
+# ==============================
+# IMPORTAR biblioteca.json -> SQLite
+# ==============================
+# Pasa los libros de la versión de consola (biblioteca.py) a la base de la web.
+#   - Lee el JSON en flujo: nunca tiene el archivo completo en memoria.
+#   - Fusiona duplicados con la misma clave que sanitizar_biblioteca
+#     (nombre + editorial sin espacios y en minúsculas): el primero se queda
+#     con la suma del stock.
+#   - Inserta con insert() de Core en lotes grandes (executemany), todo dentro
+#     de UNA transacción, conservando los id originales.
+#   - Con la base vacía, el índice de texto (FTS) se construye una sola vez
+#     al final en lugar de fila por fila.
+#   - Se puede ejecutar varias veces: los libros cuyo id o clave ya están en la
+#     base se omiten, así que la segunda corrida no cambia nada.
+#
+# Uso (desde la carpeta biblioteca_libros):
+#   python importar_json.py ../biblioteca.json
+#   python importar_json.py ../biblioteca.json --db otra_base.sqlite
+
+TAMANO_LOTE = 10_000       # Filas por executemany
+TAMANO_BLOQUE = 1 << 20    # Caracteres leídos del archivo por vuelta
+TAMANO_CONSULTA = 500      # Valores por cláusula IN al buscar los que ya existen
+CAMPOS = ("id", "nombre", "categoria", "autor", "editorial", "paginas", "cantidad")
+
+
+# ==============================
+# LECTURA EN FLUJO
+# ==============================
+def leer_json_en_flujo(ruta: str, tamano_bloque: int = TAMANO_BLOQUE):
+    """
+    Generador de los elementos de una lista JSON ([{...}, {...}]) leyendo el
+    archivo por bloques. Cada objeto se decodifica apenas está completo.
+    """
+    decodificador = json.JSONDecoder()
+    with open(ruta, "r", encoding="utf-8") as archivo:
+        buffer = archivo.read(tamano_bloque)
+        fin_archivo = not buffer
+        posicion = len(buffer) - len(buffer.lstrip())
+        if buffer[posicion:posicion + 1] != "[":
+            raise ValueError(f"'{ruta}' no contiene una lista JSON")
+        posicion += 1
+
+        while True:
+            # Saltar espacios y comas entre elementos
+            while posicion < len(buffer) and buffer[posicion] in " \t\r\n,":
+                posicion += 1
+            if posicion < len(buffer) and buffer[posicion] == "]":
+                return
+            if posicion < len(buffer):
+                try:
+                    elemento, posicion = decodificador.raw_decode(buffer, posicion)
+                    yield elemento
+                    continue
+                except json.JSONDecodeError:
+                    if fin_archivo:
+                        raise
+            elif fin_archivo:
+                raise ValueError(f"'{ruta}' termina antes de cerrar la lista")
+
+            # El elemento quedó partido entre dos bloques: leer el siguiente
+            bloque = archivo.read(tamano_bloque)
+            fin_archivo = not bloque
+            buffer = buffer[posicion:] + bloque
+            posicion = 0
+
+
+# ==============================
+# IMPORTACIÓN
+# ==============================
+def _ya_existentes(conexion, tabla, candidatos: list[dict]) -> tuple[set, set]:
+    """(ids, claves) de 'candidatos' que ya están en la base, consultando por trozos."""
+    ids, claves = set(), set()
+    for inicio in range(0, len(candidatos), TAMANO_CONSULTA):
+        trozo = candidatos[inicio:inicio + TAMANO_CONSULTA]
+        ids.update(conexion.execute(
+            select(tabla.c.id).where(tabla.c.id.in_([f["id"] for f in trozo]))
+        ).scalars())
+        claves.update(tuple(fila) for fila in conexion.execute(
+            select(tabla.c.nombre_clave, tabla.c.editorial_clave).where(
+                tuple_(tabla.c.nombre_clave, tabla.c.editorial_clave).in_(
+                    [(f["nombre_clave"], f["editorial_clave"]) for f in trozo]))
+        ))
+    return ids, claves
+
+
+def importar_libros(motor, registros, tamano_lote: int = TAMANO_LOTE) -> dict:
+    """
+    Inserta 'registros' (diccionarios como los de biblioteca.json) en la tabla libros.
+    Retorna el resumen: leidos, insertados, fusionados, omitidos y segundos.
+    """
+    from biblioteca_sql import Libro, preparar_base
+    from migraciones import normalizar_clave
+    import busqueda_fts
+
+    fts_disponible = preparar_base() # Tablas e índices de la base de destino
+    tabla = Libro.__table__
+    sumar_stock = (update(tabla).where(tabla.c.id == bindparam("b_id"))
+                   .values(cantidad=tabla.c.cantidad + bindparam("b_delta")))
+    resumen = {"leidos": 0, "insertados": 0, "fusionados": 0, "omitidos": 0}
+    principales = {} # clave -> id del libro que se quedó con ella (None si ya existía en la base)
+    ids_vistos = set() # Un id repetido en el JSON con otra clave chocaría con la llave primaria
+    inicio = time.perf_counter()
+
+    # Base vacía al empezar: nada puede existir todavía, no hace falta consultar
+    with motor.connect() as conexion:
+        base_vacia = conexion.execute(select(tabla.c.id).limit(1)).first() is None
+    indexado = (busqueda_fts.carga_masiva(motor) if base_vacia and fts_disponible
+                else contextlib.nullcontext())
+
+    with indexado, motor.begin() as conexion:
+        def guardar_lote(lote: list[dict]):
+            candidatos, repetidos, sumas = {}, {}, {}
+            for fila in lote:
+                clave = (fila["nombre_clave"], fila["editorial_clave"])
+                if clave in candidatos:
+                    candidatos[clave]["cantidad"] += fila["cantidad"]
+                    repetidos[clave] = repetidos.get(clave, 0) + 1
+                elif clave in principales:
+                    if principales[clave] is None:
+                        resumen["omitidos"] += 1 # Su libro ya estaba en la base antes de importar
+                    else:
+                        sumas[principales[clave]] = sumas.get(principales[clave], 0) + fila["cantidad"]
+                        resumen["fusionados"] += 1
+                else:
+                    candidatos[clave] = fila
+
+            nuevos = []
+            for fila in candidatos.values():
+                if fila["id"] not in ids_vistos:
+                    ids_vistos.add(fila["id"])
+                    nuevos.append(fila)
+            if not base_vacia and nuevos:
+                ids, claves = _ya_existentes(conexion, tabla, nuevos)
+                nuevos = [f for f in nuevos if f["id"] not in ids
+                          and (f["nombre_clave"], f["editorial_clave"]) not in claves]
+            for clave in candidatos:
+                principales[clave] = None
+            for fila in nuevos:
+                principales[(fila["nombre_clave"], fila["editorial_clave"])] = fila["id"]
+            for clave in candidatos:
+                if principales[clave] is None:
+                    resumen["omitidos"] += 1 + repetidos.get(clave, 0)
+                else:
+                    resumen["fusionados"] += repetidos.get(clave, 0)
+
+            if nuevos:
+                conexion.execute(insert(tabla), nuevos)
+                resumen["insertados"] += len(nuevos)
+            if sumas:
+                # Duplicados de un libro que se insertó en un lote anterior de esta misma corrida
+                conexion.execute(sumar_stock, [{"b_id": i, "b_delta": d} for i, d in sumas.items()])
+
+        lote = []
+        for registro in registros:
+            resumen["leidos"] += 1
+            fila = {campo: registro.get(campo) for campo in CAMPOS}
+            fila["id"] = fila["id"] or str(uuid.uuid4()) # Archivos muy viejos no tenían id
+            fila["cantidad"] = fila["cantidad"] or 0
+            fila["nombre_clave"] = normalizar_clave(fila["nombre"])
+            fila["editorial_clave"] = normalizar_clave(fila["editorial"])
+            lote.append(fila)
+            if len(lote) == tamano_lote:
+                guardar_lote(lote)
+                lote = []
+        if lote:
+            guardar_lote(lote)
+
+    resumen["segundos"] = time.perf_counter() - inicio
+    return resumen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa biblioteca.json a la base SQLite de la web.")
+    parser.add_argument("archivo", help="Ruta de biblioteca.json")
+    parser.add_argument("--db", default=None, help="Base SQLite de destino (por defecto la de la app)")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE, help="Filas por executemany")
+    parser.add_argument("--ignorar-diario", action="store_true",
+                        help="Importar aunque biblioteca.json.diario tenga cambios sin compactar")
+    args = parser.parse_args()
+
+    diario = f"{args.archivo}.diario"
+    if os.path.exists(diario) and os.path.getsize(diario) > 0 and not args.ignorar_diario:
+        parser.error(f"'{diario}' tiene cambios que aún no están en '{args.archivo}'. "
+                     f"Abra biblioteca.py y salga con la opción 6 para guardarlos, o use --ignorar-diario.")
+    if args.db:
+        os.environ["BIBLIOTECA_DB"] = args.db # Antes de importar biblioteca_sql, que crea el motor
+    from biblioteca_sql import motor
+
+    resumen = importar_libros(motor, leer_json_en_flujo(args.archivo), args.lote)
+    velocidad = resumen["leidos"] / resumen["segundos"] if resumen["segundos"] else 0
+    print(f"Leídos: {resumen['leidos']} | Insertados: {resumen['insertados']} | "
+          f"Fusionados: {resumen['fusionados']} | Ya existían: {resumen['omitidos']}")
+    print(f"{resumen['segundos']:.2f} s ({velocidad:,.0f} filas/s)")
+
+
+if __name__ == "__main__":
+    main()
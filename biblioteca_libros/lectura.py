@@ -0,0 +1,44 @@
+from sqlalchemy import case, select
+
+# ==============================
+# LECTURA LIVIANA (Solo columnas, sin objetos ORM)
+# ==============================
+# Para MOSTRAR libros no hace falta un objeto Libro por fila: cada objeto
+# pasa por el identity map de la sesión, guarda su estado para detectar
+# cambios (_sa_instance_state) y queda vivo hasta el próximo commit.
+# Aquí se piden SOLO las columnas que se muestran, y la clase CSS del stock
+# la calcula SQLite con un CASE. Cada fila es una Row (una tupla con nombres:
+# fila.nombre, fila.clase_css_stock), así que la plantilla no cambia.
+#
+# Estas filas son de solo lectura: para registrar, editar o borrar se sigue
+# usando el modelo.
+
+STOCK_BAJO = 5 # Con menos unidades que esto, el stock se pinta en rojo
+
+
+def clase_stock(cantidad):
+    """CASE WHEN cantidad < 5 THEN 'stock-bajo' ELSE 'stock-alto' END."""
+    return case((cantidad < STOCK_BAJO, "stock-bajo"), else_="stock-alto")
+
+
+def columnas_catalogo(modelo) -> tuple:
+    """Lo que dibuja catalogo.html, nada más."""
+    return (modelo.id, modelo.nombre, modelo.categoria, modelo.autor, modelo.editorial,
+            modelo.paginas, modelo.cantidad, clase_stock(modelo.cantidad).label("clase_css_stock"))
+
+
+def consulta_catalogo(session, modelo):
+    """
+    session.query() sobre columnas en lugar del modelo: admite los mismos
+    filter / order_by / count (paginar_keyset no cambia) pero devuelve Rows.
+    """
+    return session.query(*columnas_catalogo(modelo))
+
+
+def filas_por_id(session, modelo, ids: list, columnas: tuple = None) -> list:
+    """Filas de los 'ids' (en el mismo orden), p. ej. los de una búsqueda guardada en caché."""
+    if not ids:
+        return []
+    columnas = columnas or columnas_catalogo(modelo)
+    por_id = {f.id: f for f in session.execute(select(*columnas).where(modelo.id.in_(ids)))}
+    return [por_id[i] for i in ids if i in por_id]
@@ -0,0 +1,196 @@
+import logging
+import os
+import re
+import threading
+import time
+from flask import g, has_app_context, request, Response
+from sqlalchemy import event
+
+# ==============================
+# MÉTRICAS (Formato Prometheus)
+# ==============================
+# ¿Dónde se va el tiempo en producción?
+# - Cada sentencia SQL se cronometra con los eventos before/after_cursor_execute.
+# - Cada petición HTTP se cronometra con before/after_request y cuenta sus consultas.
+# - Todo se publica en /metrics en el formato de texto de Prometheus.
+# - Opcional: las consultas más lentas que BIBLIOTECA_SQL_LENTO_MS se escriben en el log.
+#
+# Ojo: los números viven en la memoria de cada proceso. Con varios workers de
+# gunicorn, cada worker expone los suyos (Prometheus los suma por instancia).
+
+BUCKETS_SEGUNDOS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+log_sql_lento = logging.getLogger("biblioteca.sql_lento")
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _etiquetas(nombres: tuple, valores: tuple, extra: str = "") -> str:
+    partes = [f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores)]
+    if extra:
+        partes.append(extra)
+    return "{" + ",".join(partes) + "}" if partes else ""
+
+
+class Contador:
+    """Número que solo sube (ej: total de consultas ejecutadas)."""
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: tuple = ()):
+        self.nombre, self.ayuda, self.etiquetas = nombre, ayuda, etiquetas
+        self._valores = {}
+        self._candado = threading.Lock()
+
+    def incrementar(self, *valores_etiquetas, cantidad: float = 1):
+        with self._candado:
+            self._valores[valores_etiquetas] = self._valores.get(valores_etiquetas, 0) + cantidad
+
+    def exportar(self) -> list[str]:
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} counter"]
+        with self._candado:
+            for valores, total in sorted(self._valores.items()):
+                lineas.append(f"{self.nombre}{_etiquetas(self.etiquetas, valores)} {total}")
+        return lineas
+
+
+class Histograma:
+    """Distribución de valores en 'buckets' acumulados (ej: latencias)."""
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: tuple = (), buckets: tuple = BUCKETS_SEGUNDOS):
+        self.nombre, self.ayuda, self.etiquetas, self.buckets = nombre, ayuda, etiquetas, buckets
+        self._series = {} # valores_etiquetas -> [conteos por bucket, suma, total]
+        self._candado = threading.Lock()
+
+    def observar(self, valor: float, *valores_etiquetas):
+        with self._candado:
+            serie = self._series.get(valores_etiquetas)
+            if serie is None:
+                serie = self._series[valores_etiquetas] = [[0] * len(self.buckets), 0.0, 0]
+            for i, limite in enumerate(self.buckets):
+                if valor <= limite:
+                    serie[0][i] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def exportar(self) -> list[str]:
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} histogram"]
+        with self._candado:
+            for valores, (conteos, suma, total) in sorted(self._series.items()):
+                for limite, conteo in zip(self.buckets, conteos):
+                    etiquetas = _etiquetas(self.etiquetas, valores, f'le="{limite}"')
+                    lineas.append(f"{self.nombre}_bucket{etiquetas} {conteo}")
+                etiquetas = _etiquetas(self.etiquetas, valores, 'le="+Inf"')
+                lineas.append(f"{self.nombre}_bucket{etiquetas} {total}")
+                lineas.append(f"{self.nombre}_sum{_etiquetas(self.etiquetas, valores)} {suma}")
+                lineas.append(f"{self.nombre}_count{_etiquetas(self.etiquetas, valores)} {total}")
+        return lineas
+
+
+# ==============================
+# REGISTRO DE MÉTRICAS
+# ==============================
+sql_duracion = Histograma("biblioteca_sql_duracion_segundos",
+                          "Latencia de cada sentencia SQL por operación y tabla.", ("operacion", "tabla"))
+sql_lentas = Contador("biblioteca_sql_lentas_total",
+                      "Sentencias que superaron el umbral de consulta lenta.", ("operacion", "tabla"))
+http_duracion = Histograma("biblioteca_http_duracion_segundos",
+                           "Latencia de cada petición HTTP por ruta.", ("ruta", "metodo", "estado"))
+http_consultas = Histograma("biblioteca_http_consultas_por_peticion",
+                            "Cantidad de sentencias SQL ejecutadas por petición.", ("ruta",),
+                            buckets=BUCKETS_CONSULTAS)
+
+cache_catalogo = Contador("biblioteca_catalogo_cache_total",
+                          "Respuestas de /catalogo: 304, página servida desde caché o dibujada.", ("resultado",))
+
+busqueda_cache = Contador("biblioteca_busqueda_cache_total",
+                           "Caché de búsquedas: aciertos, fallos e invalidaciones.", ("resultado",))
+
+REGISTRO = [sql_duracion, sql_lentas, http_duracion, http_consultas, cache_catalogo, busqueda_cache]
+
+
+def exportar_prometheus() -> str:
+    lineas = []
+    for metrica in REGISTRO:
+        lineas.extend(metrica.exportar())
+    return "\n".join(lineas) + "\n"
+
+
+# ==============================
+# INSTRUMENTACIÓN SQL
+# ==============================
+_PATRON_TABLA = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN)\s+\"?(\w+)", re.IGNORECASE)
+_OPERACIONES_CON_TABLA = {"SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH"}
+
+
+def clasificar_sentencia(sql: str) -> tuple[str, str]:
+    """('SELECT', 'libros') a partir del texto SQL. Etiquetas pocas y estables para Prometheus."""
+    texto = sql.lstrip()
+    operacion = texto.split(None, 1)[0].upper() if texto else "?"
+    if operacion not in _OPERACIONES_CON_TABLA:
+        return operacion, "-" # DDL y PRAGMA: no vale la pena desglosarlos por tabla
+    coincidencia = _PATRON_TABLA.search(texto)
+    return operacion, coincidencia.group(1) if coincidencia else "-"
+
+
+def umbral_lento_por_defecto() -> float | None:
+    """Milisegundos de BIBLIOTECA_SQL_LENTO_MS, o None si el log de consultas lentas está apagado."""
+    valor = os.environ.get("BIBLIOTECA_SQL_LENTO_MS")
+    return float(valor) if valor not in (None, "") else None
+
+
+def instrumentar_motor(motor, umbral_lento_ms: float = None):
+    """
+    Cronometra cada sentencia del motor.
+    umbral_lento_ms: si se indica (o viene de BIBLIOTECA_SQL_LENTO_MS), las sentencias
+    que tarden más se escriben en el logger 'biblioteca.sql_lento'. Con 0 se registran todas.
+    """
+    if umbral_lento_ms is None:
+        umbral_lento_ms = umbral_lento_por_defecto()
+
+    @event.listens_for(motor, "before_cursor_execute")
+    def iniciar_cronometro(conexion, cursor, sentencia, parametros, contexto, executemany):
+        conexion.info.setdefault("inicio_consulta", []).append(time.perf_counter())
+
+    @event.listens_for(motor, "after_cursor_execute")
+    def detener_cronometro(conexion, cursor, sentencia, parametros, contexto, executemany):
+        duracion = time.perf_counter() - conexion.info["inicio_consulta"].pop()
+        operacion, tabla = clasificar_sentencia(sentencia)
+        sql_duracion.observar(duracion, operacion, tabla)
+
+        # Conteo de consultas de la petición web en curso (si la hay)
+        if has_app_context() and "consultas_sql" in g:
+            g.consultas_sql += 1
+
+        if umbral_lento_ms is not None and duracion * 1000 >= umbral_lento_ms:
+            sql_lentas.incrementar(operacion, tabla)
+            log_sql_lento.warning("%.2f ms%s | %s | %r", duracion * 1000,
+                                  " (executemany)" if executemany else "", " ".join(sentencia.split()),
+                                  parametros if not executemany else f"{len(parametros)} filas")
+
+
+# ==============================
+# INSTRUMENTACIÓN FLASK
+# ==============================
+def instrumentar_app(app):
+    """Cronometra cada petición y publica todas las métricas en /metrics."""
+
+    @app.before_request
+    def iniciar_peticion():
+        g.inicio_peticion = time.perf_counter()
+        g.consultas_sql = 0
+
+    @app.after_request
+    def registrar_peticion(respuesta):
+        if "inicio_peticion" in g:
+            # Usamos la regla ('/eliminar/<id>') y no la URL real para no crear una serie por libro
+            ruta = request.url_rule.rule if request.url_rule else "sin_ruta"
+            http_duracion.observar(time.perf_counter() - g.inicio_peticion, ruta, request.method,
+                                   respuesta.status_code)
+            http_consultas.observar(g.consultas_sql, ruta)
+        return respuesta
+
+    @app.route("/metrics")
+    def metricas():
+        return Response(exportar_prometheus(), mimetype="text/plain; version=0.0.4; charset=utf-8")
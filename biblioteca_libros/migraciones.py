@@ -0,0 +1,135 @@
+import logging
+from sqlalchemy import text, inspect
+
+# ==============================
+# MIGRACIONES DEL ESQUEMA
+# ==============================
+# create_all() solo crea tablas que NO existen; nunca agrega columnas a una
+# tabla vieja. Aquí van los pasos para poner al día bases de datos creadas
+# con versiones anteriores de la app. Todas las funciones son idempotentes:
+# se pueden ejecutar en cada arranque sin efectos secundarios.
+
+TAMANO_LOTE = 5000 # Filas por lote al rellenar columnas nuevas
+
+# Corre al arrancar la app web: avisa por el log, nunca con print
+log_migraciones = logging.getLogger("biblioteca.migraciones")
+
+
+def normalizar_clave(texto: str | None) -> str:
+    """
+    Clave de comparación: sin espacios a los lados y en minúsculas.
+    Se calcula en Python porque lower() de SQLite solo entiende ASCII
+    ('AÑOS' quedaría 'aÑos').
+    """
+    return (texto or "").strip().lower()
+
+
+def _columnas_libros(conexion) -> set:
+    return {col["name"] for col in inspect(conexion).get_columns("libros")}
+
+
+def fusionar_duplicados(conexion) -> int:
+    """
+    Fusiona libros repetidos (misma clave nombre + editorial) dentro de SQL:
+    el primero (menor rowid) se queda con la suma del stock y los demás se borran.
+    Retorna cuántas filas se eliminaron.
+    """
+    # 1. Un solo GROUP BY: sobreviviente (menor rowid) y stock total de cada grupo repetido.
+    #    Se guarda en una tabla temporal con llave primaria para no repetir el
+    #    GROUP BY (ni una subconsulta correlacionada) por cada fila a actualizar.
+    conexion.execute(text("DROP TABLE IF EXISTS temp.grupos_duplicados"))
+    conexion.execute(text(
+        "CREATE TEMP TABLE grupos_duplicados (fila INTEGER PRIMARY KEY, total INTEGER)"))
+    conexion.execute(text("""
+        INSERT INTO grupos_duplicados (fila, total)
+        SELECT MIN(rowid), SUM(COALESCE(cantidad, 0)) FROM libros
+        GROUP BY nombre_clave, editorial_clave
+        HAVING COUNT(*) > 1
+    """))
+    conexion.execute(text("""
+        UPDATE libros
+        SET cantidad = (SELECT total FROM grupos_duplicados WHERE fila = libros.rowid)
+        WHERE rowid IN (SELECT fila FROM grupos_duplicados)
+    """))
+    conexion.execute(text("DROP TABLE temp.grupos_duplicados"))
+    # 2. Se borran todas las filas que no son el sobreviviente de su grupo
+    resultado = conexion.execute(text("""
+        DELETE FROM libros
+        WHERE rowid NOT IN (
+            SELECT MIN(rowid) FROM libros
+            GROUP BY nombre_clave, editorial_clave
+        )
+    """))
+    return resultado.rowcount
+
+
+def rellenar_claves(conexion, solo_vacias: bool = False) -> int:
+    """
+    Calcula nombre_clave / editorial_clave por lotes recorriendo el rowid
+    (sin cargar toda la tabla). Con solo_vacias=True únicamente toca las filas
+    que no tienen clave (por ejemplo, las escritas por programas que no la conocen).
+    Retorna cuántas filas actualizó.
+    """
+    condicion = "AND (nombre_clave IS NULL OR editorial_clave IS NULL) " if solo_vacias else ""
+    ultimo, total = 0, 0
+    while True:
+        filas = conexion.execute(
+            text("SELECT rowid, nombre, editorial FROM libros "
+                 f"WHERE rowid > :ultimo {condicion}ORDER BY rowid LIMIT :lote"),
+            {"ultimo": ultimo, "lote": TAMANO_LOTE},
+        ).all()
+        if not filas:
+            return total
+        conexion.execute(
+            text("UPDATE libros SET nombre_clave = :nombre, editorial_clave = :editorial "
+                 "WHERE rowid = :fila"),
+            [{"fila": f.rowid,
+              "nombre": normalizar_clave(f.nombre),
+              "editorial": normalizar_clave(f.editorial)} for f in filas],
+        )
+        total += len(filas)
+        ultimo = filas[-1].rowid
+
+
+def _agregar_columnas_clave(conexion) -> bool:
+    """ALTER TABLE de las columnas de clave que falten. Retorna True si agregó alguna."""
+    columnas = _columnas_libros(conexion)
+    faltantes = [c for c in ("nombre_clave", "editorial_clave") if c not in columnas]
+    for columna in faltantes:
+        conexion.execute(text(f"ALTER TABLE libros ADD COLUMN {columna} VARCHAR"))
+    return bool(faltantes)
+
+
+def migrar_claves(motor) -> int:
+    """
+    Agrega y rellena las columnas nombre_clave / editorial_clave en bases antiguas.
+    Después fusiona duplicados para que el índice único se pueda crear.
+    Retorna cuántos libros duplicados fusionó.
+    """
+    with motor.begin() as conexion:
+        if not _agregar_columnas_clave(conexion):
+            return 0 # Ya está migrada
+
+        rellenar_claves(conexion)
+        fusionados = fusionar_duplicados(conexion)
+    if fusionados:
+        log_migraciones.warning("Migración: %d libros duplicados fusionados.", fusionados)
+    return fusionados
+
+
+def deduplicar(motor) -> dict:
+    """
+    Limpieza completa en UNA transacción, todo dentro de SQL:
+    columnas de clave, claves vacías, fusión con GROUP BY y el índice único
+    (que impide que vuelvan a aparecer duplicados).
+    Retorna el resumen: filas_antes, claves_rellenadas, fusionados, filas_despues.
+    """
+    with motor.begin() as conexion:
+        filas_antes = conexion.execute(text("SELECT COUNT(*) FROM libros")).scalar_one()
+        _agregar_columnas_clave(conexion)
+        rellenadas = rellenar_claves(conexion, solo_vacias=True)
+        fusionados = fusionar_duplicados(conexion)
+        conexion.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ux_libros_clave "
+                              "ON libros (nombre_clave, editorial_clave)"))
+    return {"filas_antes": filas_antes, "claves_rellenadas": rellenadas,
+            "fusionados": fusionados, "filas_despues": filas_antes - fusionados}
@@ -0,0 +1,98 @@
+import base64
+import json
+from sqlalchemy import tuple_, func, literal_column
+
+# ==============================
+# PAGINACIÓN POR CURSOR (Keyset / Seek)
+# ==============================
+# En lugar de "salta N filas y toma 20" (OFFSET), recordamos la ÚLTIMA fila
+# que vimos y pedimos "las 20 que vienen después de esta".
+# Con el índice (nombre, id) la base de datos salta directo a ese punto,
+# así que la página 5.000 cuesta lo mismo que la página 1.
+
+POR_PAGINA = 20
+
+
+def codificar_cursor(*clave) -> str:
+    """Convierte la clave de orden (ej: nombre, id) en un token seguro para la URL."""
+    crudo = json.dumps(list(clave), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(crudo).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(token: str, tipos: tuple = (str, str)) -> tuple | None:
+    """
+    Devuelve la tupla de la clave (por defecto (nombre, id)) o None si el token es inválido.
+    Un token manipulado no debe tumbar la página: simplemente empezamos de cero.
+    """
+    if not token:
+        return None
+    try:
+        relleno = "=" * (-len(token) % 4)
+        clave = json.loads(base64.urlsafe_b64decode(token + relleno))
+        if (isinstance(clave, list) and len(clave) == len(tipos)
+                and all(isinstance(v, t) for v, t in zip(clave, tipos))):
+            return tuple(clave)
+    except (ValueError, TypeError):
+        pass
+    return None
+
+
+def paginar_keyset(query, modelo, despues: str = None, antes: str = None, por_pagina: int = POR_PAGINA):
+    """
+    Aplica paginación por cursor a una consulta ordenada por (nombre, id).
+
+    despues: token de la última fila de la página actual (botón "Siguiente").
+    antes: token de la primera fila de la página actual (botón "Anterior").
+
+    Retorna (filas, cursor_anterior, cursor_siguiente). Un cursor en None
+    significa que no hay más páginas en esa dirección.
+    """
+    clave = tuple_(modelo.nombre, modelo.id)
+    cursor_despues = decodificar_cursor(despues)
+    cursor_antes = decodificar_cursor(antes) if cursor_despues is None else None
+
+    # Pedimos una fila de más para saber si existe otra página sin usar COUNT
+    if cursor_antes is not None:
+        # Caminamos hacia atrás y luego damos la vuelta a la lista
+        filas = (query.filter(clave < tuple_(*cursor_antes))
+                 .order_by(modelo.nombre.desc(), modelo.id.desc())
+                 .limit(por_pagina + 1).all())
+        hay_mas_atras = len(filas) > por_pagina
+        filas = list(reversed(filas[:por_pagina]))
+        hay_mas_adelante = True
+    else:
+        if cursor_despues is not None:
+            query = query.filter(clave > tuple_(*cursor_despues))
+        filas = (query.order_by(modelo.nombre, modelo.id)
+                 .limit(por_pagina + 1).all())
+        hay_mas_adelante = len(filas) > por_pagina
+        filas = filas[:por_pagina]
+        hay_mas_atras = cursor_despues is not None
+
+    if not filas:
+        return [], None, None
+
+    cursor_anterior = codificar_cursor(filas[0].nombre, filas[0].id) if hay_mas_atras else None
+    cursor_siguiente = codificar_cursor(filas[-1].nombre, filas[-1].id) if hay_mas_adelante else None
+    return filas, cursor_anterior, cursor_siguiente
+
+
+def contar_aproximado(session, modelo) -> int:
+    """
+    Total aproximado de filas sin recorrer la tabla.
+    MAX(rowid) se resuelve con una sola búsqueda en el árbol B de SQLite;
+    puede sobreestimar si hubo borrados, por eso se muestra como "≈".
+    """
+    return session.query(func.max(literal_column("rowid"))).select_from(modelo).scalar() or 0
+
+
+def recorrer_keyset(query, modelo, despues: str = None, tamano_lote: int = 500):
+    """
+    Todas las filas que siguen al cursor 'despues', en orden (nombre, id), como flujo.
+    yield_per activa stream_results: las filas se piden al cursor de a
+    'tamano_lote' y nunca están todas en memoria (para imprimir "todo" en la consola).
+    """
+    cursor_despues = decodificar_cursor(despues)
+    if cursor_despues is not None:
+        query = query.filter(tuple_(modelo.nombre, modelo.id) > tuple_(*cursor_despues))
+    return query.order_by(modelo.nombre, modelo.id).yield_per(tamano_lote)
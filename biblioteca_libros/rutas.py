@@ -1,12 +1,19 @@
 from flask import Flask, flash
 from datetime import datetime
-import json
-import pandas as pd
-import io # Para manejo de flujos de datos en memoria RAM
-from flask import Blueprint, render_template, request, redirect, send_file
-from biblioteca_sql import session, Libro
+import tempfile # Archivo temporal en disco para armar el Excel sin llenar la RAM
+from werkzeug.http import http_date
+from flask import Blueprint, render_template, request, redirect, send_file, Response, stream_with_context, jsonify, get_flashed_messages
+import biblioteca_sql
+from biblioteca_sql import session, Libro, buscar_con_cache, sugerencias_libros, registrar_o_sumar, ajustar_stock, fijar_stock, ajustar_stock_lote
+import busqueda_fts
+import busqueda_difusa
+import lectura
+import metricas
+import version_catalogo
+from exportacion import escribir_excel, generar_csv
+from paginacion import paginar_keyset, contar_aproximado, POR_PAGINA
 import math
-from sqlalchemy import or_
+from sqlalchemy import or_, and_
 
 # 1. Creamos el Blueprint (El "Módulo" de rutas)
 # Lo llamamos 'global' porque manejará las rutas generales
@@ -19,23 +26,117 @@ rutas_globales = Blueprint('global', __name__)
 def inicio():
     return render_template('index.html')
 
+# Páginas del catálogo ya dibujadas (por ETag). BIBLIOTECA_CACHE_PAGINAS=0 la apaga
+paginas_catalogo = version_catalogo.CachePaginas()
+
 @rutas_globales.route('/catalogo')
 def ver_catalogo():
+    # Con mensajes flash pendientes la página es única: se dibuja sin caché ni ETag
+    if get_flashed_messages():
+        return _dibujar_catalogo()
+
+    # 1. ¿CAMBIÓ ALGO? La versión sube con cada escritura en 'libros'
+    version, modificado = version_catalogo.leer_version(session)
+    etag = version_catalogo.etiqueta(version, request.args, biblioteca_sql.FTS_DISPONIBLE)
+    cabeceras = {"ETag": f'"{etag}"',
+                 "Last-Modified": http_date(modificado),
+                 # El navegador puede guardarla, pero debe preguntar cada vez (y recibir 304)
+                 "Cache-Control": "private, no-cache"}
+
+    # 2. El navegador ya la tiene: 304 sin consultar libros ni dibujar
+    if version_catalogo.no_modificado(request, etag, modificado):
+        metricas.cache_catalogo.incrementar("304")
+        return Response(status=304, headers=cabeceras)
+
+    # 3. Otro usuario ya pidió esta misma página con esta misma versión
+    html = paginas_catalogo.obtener(version, etag)
+    if html is not None:
+        metricas.cache_catalogo.incrementar("acierto")
+    else:
+        metricas.cache_catalogo.incrementar("fallo")
+        html = _dibujar_catalogo()
+        paginas_catalogo.guardar(version, etag, html)
+    return Response(html, headers=cabeceras)
+
+def _dibujar_catalogo() -> str:
     # 1. CAPTURAR PARÁMETROS DE LA URL
-    # ?page=1 (Por defecto página 1)
-    page = request.args.get('page', 1, type=int) 
     # ?q=Harry (Por defecto vacío)
     busqueda = request.args.get('q', '', type=str) 
-    
+    # ?despues=<cursor> / ?antes=<cursor> (Paginación por cursor)
+    despues = request.args.get('despues', '', type=str)
+    antes = request.args.get('antes', '', type=str)
+    # ?total=1 pide el conteo exacto (es opcional porque recorre la tabla)
+    contar_exacto = request.args.get('total', 0, type=int) == 1
+    # ?page=3 (Modo antiguo con OFFSET, se mantiene para enlaces guardados)
+    page = request.args.get('page', None, type=int)
+    # ?difusa=1 busca también palabras parecidas ("Soledda" -> "soledad")
+    difusa = request.args.get('difusa', 0, type=int) == 1
+
+    datos = _buscar_pagina(busqueda, despues, antes, contar_exacto, page, difusa)
+
+    # Sin coincidencias exactas en la primera página: probamos con palabras parecidas
+    # (los enlaces de paginación ya llevan &difusa=1)
+    if busqueda and not difusa and not datos["libros"] and not (despues or antes) and page is None:
+        difusa = True
+        datos = _buscar_pagina(busqueda, despues, antes, contar_exacto, page, difusa)
+
+    # ENVIAR TODO AL HTML
+    return render_template('catalogo.html', busqueda=busqueda, difusa=difusa, **datos)
+
+def _buscar_pagina(busqueda: str, despues: str, antes: str, contar_exacto: bool,
+                   page: int | None, difusa: bool) -> dict:
+    """Libros de la página pedida y los datos de paginación para la plantilla."""
     # Configuración
-    per_page = 20 # Libros por página
-    
-    # 2. CONSTRUIR LA CONSULTA BASE (Query Builder)
-    query = session.query(Libro)
+    per_page = POR_PAGINA # Libros por página
+    vacia = dict(libros=[], page=None, total_pages=None, total_libros=None, total_aproximado=False,
+                 cursor_anterior=None, cursor_siguiente=None, correccion=None)
+
+    # 2. BÚSQUEDA DIFUSA: cada palabra se cambia por las del catálogo que más se le parecen
+    alternativas = None
+    if busqueda and difusa:
+        # Solo palabras de los campos donde se busca: una que solo está en la categoría no encontraría nada
+        alternativas = sugerencias_libros.trigramas.corregir(busqueda, campos=busqueda_fts.COLUMNAS_BUSQUEDA)
+        if alternativas is None:
+            return vacia # Ninguna palabra del catálogo se parece: no hace falta consultar
+        vacia["correccion"] = busqueda_difusa.describir(alternativas)
+
+    # 3. CONSTRUIR LA CONSULTA BASE (Query Builder)
+    # Solo las columnas de la tabla (y la clase CSS del stock calculada en SQL):
+    # la página recibe filas livianas en lugar de objetos Libro
+    query = lectura.consulta_catalogo(session, Libro)
     
-    # 3. APLICAR FILTRO DE BÚSQUEDA (Si el usuario escribió algo)
-    if busqueda:
-        # Busca si el texto está en el Nombre O en el Autor O en la Editorial
+    # 4. APLICAR FILTRO DE BÚSQUEDA (Si el usuario escribió algo)
+    # Con FTS5 la búsqueda va por el índice de texto completo y sale ordenada por relevancia
+    expresion = None
+    if busqueda and biblioteca_sql.FTS_DISPONIBLE:
+        expresion = (busqueda_fts.expresion_alternativas(alternativas) if alternativas
+                     else busqueda_fts.expresion_fts(busqueda))
+    # Las búsquedas pasan por la caché: (término, página) -> ids de la página + cursores/total
+    pagina_cache = f"despues={despues}|antes={antes}|page={page}|total={int(contar_exacto)}"
+    modo = "difusa" if alternativas else "exacta"
+    if expresion and page is None:
+        def calcular():
+            libros, anterior, siguiente = busqueda_fts.buscar_paginado(
+                session, Libro, expresion, despues=despues, antes=antes, por_pagina=per_page
+            )
+            total = busqueda_fts.contar(session, expresion) if contar_exacto else None
+            return libros, {"anterior": anterior, "siguiente": siguiente, "total": total}
+        lista_libros, resultado = buscar_con_cache(f"fts:{modo}:{busqueda}", pagina_cache, calcular)
+        return dict(vacia, libros=lista_libros, total_libros=resultado["total"],
+                    cursor_anterior=resultado["anterior"], cursor_siguiente=resultado["siguiente"])
+
+    if expresion:
+        # Modo antiguo (?page=N) pero filtrando con el índice de texto completo
+        query = query.filter(Libro.id.in_(busqueda_fts.subconsulta_ids(expresion)))
+    elif alternativas:
+        # Respaldo sin FTS5: cada palabra (o una parecida) en el Nombre, el Autor o la Editorial
+        query = query.filter(and_(*(
+            or_(*(columna.ilike(f"%{palabra}%")
+                  for palabra, _ in grupo for columna in (Libro.nombre, Libro.autor, Libro.editorial)))
+            for grupo in alternativas
+        )))
+    elif busqueda:
+        # Respaldo sin FTS5: busca si el texto está en el Nombre O en el Autor O en la Editorial
         query = query.filter(
             or_(
                 Libro.nombre.ilike(f"%{busqueda}%"),
@@ -44,24 +145,45 @@ def ver_catalogo():
             )
         )
     
-    # 4. MATEMÁTICAS DE PAGINACIÓN
-    total_libros = query.count() # ¿Cuántos libros cumplen el filtro?
-    total_pages = math.ceil(total_libros / per_page) # Redondeamos hacia arriba
-    
-    # Calcular el recorte (Offset)
-    # Pág 1: Salta 0, toma 20.
-    # Pág 2: Salta 20, toma 20.
-    offset = (page - 1) * per_page
-    
-    # 5. EJECUTAR LA CONSULTA RECORTADA
-    lista_libros = query.limit(per_page).offset(offset).all()
-    
-    # 6. ENVIAR TODO AL HTML
-    return render_template('catalogo.html', 
-                           libros=lista_libros, 
-                           page=page, 
-                           total_pages=total_pages,
-                           busqueda=busqueda)
+    # 5A. MODO ANTIGUO (OFFSET): solo si la URL trae ?page=N
+    if page is not None:
+        page = max(page, 1)
+        offset = (page - 1) * per_page
+        def calcular():
+            total = query.count() # ¿Cuántos libros cumplen el filtro?
+            return query.order_by(Libro.nombre, Libro.id).limit(per_page).offset(offset).all(), {"total": total}
+        if busqueda:
+            lista_libros, resultado = buscar_con_cache(f"texto:{modo}:{busqueda}", pagina_cache, calcular)
+            total_libros = resultado["total"]
+        else:
+            lista_libros, extra = calcular()
+            total_libros = extra["total"]
+        total_pages = math.ceil(total_libros / per_page) # Redondeamos hacia arriba
+        return dict(vacia, libros=lista_libros, page=page, total_pages=total_pages, total_libros=total_libros)
+
+    # 5B. MODO CURSOR (Keyset): el costo no depende de qué tan "profunda" sea la página
+    # 6. TOTAL OPCIONAL: exacto solo si se pide; sin búsqueda damos uno aproximado gratis
+    def calcular():
+        libros, anterior, siguiente = paginar_keyset(
+            query, Libro, despues=despues, antes=antes, por_pagina=per_page
+        )
+        total = query.count() if contar_exacto else None
+        return libros, {"anterior": anterior, "siguiente": siguiente, "total": total}
+
+    if busqueda:
+        # Respaldo con ilike: es justo la consulta que recorre la tabla, la que más vale guardar
+        lista_libros, resultado = buscar_con_cache(f"texto:{modo}:{busqueda}", pagina_cache, calcular)
+    else:
+        lista_libros, resultado = calcular()
+
+    total_libros = resultado["total"]
+    total_aproximado = False
+    if not contar_exacto and not busqueda:
+        total_libros = contar_aproximado(session, Libro)
+        total_aproximado = True
+
+    return dict(vacia, libros=lista_libros, total_libros=total_libros, total_aproximado=total_aproximado,
+                cursor_anterior=resultado["anterior"], cursor_siguiente=resultado["siguiente"])
 
 @rutas_globales.route('/registrar', methods=['GET', 'POST'])
 def registrar():
@@ -75,12 +197,15 @@ def registrar():
             paginas = int(request.form['paginas'])
             cantidad = int(request.form['cantidad'])
             
-            # Guardado
-            nuevo_libro = Libro(nombre, categoria, autor, editorial, paginas, cantidad)
-            session.add(nuevo_libro)
+            # Guardado: un solo upsert. Si el libro ya existe (mismo nombre + editorial)
+            # se suma la cantidad; reenviar el formulario nunca crea una fila duplicada
+            _, es_nuevo = registrar_o_sumar(nombre, categoria, autor, editorial, paginas, cantidad)
             session.commit()
 
-            flash("Libro registrado con éxito.", "success")
+            if es_nuevo:
+                flash("Libro registrado con éxito.", "success")
+            else:
+                flash(f"El libro ya existía: se sumaron {cantidad} unidades al stock.", "info")
             return redirect('/catalogo')
         except ValueError:
             return "Error: Datos inválidos"
@@ -90,15 +215,37 @@ def registrar():
 @rutas_globales.route('/actualizar_stock', methods=['POST'])
 def actualizar_stock():
     id_libro = request.form['id_libro']
-    nuevo_stock = int(request.form['nuevo_stock'])
-    libro = session.query(Libro).filter_by(id=id_libro).first()
-    if libro:
-        libro.cantidad = nuevo_stock
-        session.commit()
+    try:
+        # Un solo UPDATE en la BD (sin cargar el libro primero)
+        if 'delta' in request.form:
+            aplicado = ajustar_stock(id_libro, int(request.form['delta']))
+        else:
+            aplicado = fijar_stock(id_libro, int(request.form['nuevo_stock']))
+    except ValueError:
+        return "Error: Datos inválidos"
 
+    if aplicado:
+        session.commit()
         flash("Stock actualizado con éxito.", "info")
+    else:
+        session.rollback()
+        flash("No se pudo actualizar: el stock no puede quedar negativo.", "warning")
     return redirect('/catalogo')
 
+# API para ajustar muchos stocks de una vez (Ej: sincronización de un punto de venta)
+# Recibe: {"ajustes": [{"id": "...", "delta": -2}, ...]}
+@rutas_globales.route('/api/stock/lote', methods=['POST'])
+def ajustar_stock_en_lote():
+    datos = request.get_json(silent=True) or {}
+    try:
+        ajustes = [(str(a['id']), int(a['delta'])) for a in datos['ajustes']]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Formato esperado: {\"ajustes\": [{\"id\": ..., \"delta\": ...}]}"}), 400
+
+    rechazados = ajustar_stock_lote(ajustes)
+    session.commit() # Todo el lote en una sola transacción
+    return jsonify({"aplicados": len(ajustes) - len(rechazados), "rechazados": rechazados})
+
 @rutas_globales.route('/eliminar/<id>')
 def eliminar_libro(id):
     libro = session.query(Libro).filter_by(id=id).first()
@@ -109,53 +256,54 @@ def eliminar_libro(id):
         flash("Libro eliminado con éxito de la base de datos.", "warning")
     return redirect('/catalogo')
 
-# Ruta para descargar el inventario en Excel 
+# API de autocompletar: /api/sugerencias?prefix=har&k=8
+# Responde desde el índice en memoria (bisect), sin tocar SQLite
+@rutas_globales.route('/api/sugerencias')
+def api_sugerencias():
+    prefijo = request.args.get('prefix', '', type=str)
+    k = request.args.get('k', 8, type=int)
+    return jsonify({"prefix": prefijo, "sugerencias": sugerencias_libros.buscar(prefijo, k)})
+
+# Ruta para descargar el inventario en Excel
+# OJO: esta descarga NO es streaming. Un .xlsx es un zip que openpyxl solo puede
+# cerrar al final, así que el archivo se arma completo en disco antes de enviar
+# el primer byte (la memoria sí queda acotada). Para catálogos grandes, /descargar_csv.
 @rutas_globales.route('/descargar_excel')
 def descargar_excel():
-    # 1. Consultamos todos los libros
-    libros = session.query(Libro).all()
-    
-    # 2. Convertimos Objetos SQL -> Lista de Diccionarios (Para Pandas)
-    lista_datos = []
-    for l in libros:
-        lista_datos.append({
-            "Título": l.nombre,
-            "Categoría": l.categoria,
-            "Autor": l.autor,
-            "Editorial": l.editorial,
-            "Páginas": l.paginas,
-            "Stock": l.cantidad,
-            "ID Sistema": l.id
-        })
-        
-    # 3. Creamos el DataFrame
-    df = pd.read_json(json.dumps(lista_datos)) if not lista_datos else pd.DataFrame(lista_datos)
-    # (Nota simple: pd.DataFrame(lista_datos) es suficiente si la lista no está vacía)
-    
-    if not lista_datos:
+    # 1. Consulta barata: ¿hay al menos un libro?
+    if session.query(Libro.id).first() is None:
         return "No hay datos para descargar"
 
-    df = pd.DataFrame(lista_datos)
-
-    # 4. Magia de Ingeniero: Guardar en RAM (BytesIO)
-    # En lugar de crear un archivo en tu disco, lo creamos en el aire.
-    output = io.BytesIO()
-    
-    # Usamos ExcelWriter para guardar el df en el buffer 'output'
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Inventario')
+    # 2. Escribimos el Excel COMPLETO por lotes en un archivo temporal
+    # (modo write_only de openpyxl: la memoria no crece con el número de libros,
+    # pero el tiempo hasta el primer byte sí crece con el catálogo)
+    output = tempfile.TemporaryFile()
+    escribir_excel(session, Libro, output)
     
     # "Rebobinamos" el archivo al principio para poder leerlo y enviarlo
     output.seek(0)
     
-    # 5. Generar nombre con fecha (Ej: biblioteca_2026-01-20.xlsx)
+    # 3. Generar nombre con fecha (Ej: biblioteca_2026-01-20.xlsx)
     fecha_hoy = datetime.now().strftime("%Y-%m-%d")
     nombre_archivo = f"biblioteca_{fecha_hoy}.xlsx"
 
-    # 6. Enviamos el archivo al navegador
+    # 4. Enviamos el archivo al navegador (Flask lo envía por trozos y lo cierra al final)
     return send_file(
         output, 
         download_name=nombre_archivo, 
         as_attachment=True, # Esto fuerza la descarga
         mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
\ No newline at end of file
+    )
+
+# Ruta para descargar el inventario en CSV (Streaming: la primera fila sale de inmediato)
+@rutas_globales.route('/descargar_csv')
+def descargar_csv():
+    fecha_hoy = datetime.now().strftime("%Y-%m-%d")
+    nombre_archivo = f"biblioteca_{fecha_hoy}.csv"
+
+    # stream_with_context mantiene viva la petición mientras el generador produce trozos
+    return Response(
+        stream_with_context(generar_csv(session, Libro)),
+        mimetype='text/csv; charset=utf-8',
+        headers={'Content-Disposition': f'attachment; filename={nombre_archivo}'}
+    )
@@ -22,4 +22,46 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
 
+    // 5. AUTOCOMPLETAR EN EL BUSCADOR
+    const buscador = document.querySelector('.search-form input[name="q"]');
+    const lista = document.getElementById('sugerencias');
+    if (buscador && lista) {
+        let temporizador = null;   // Debounce: solo preguntamos cuando el usuario deja de teclear
+        let peticion = null;       // Para cancelar la petición anterior si llega otra tecla
+        const recientes = new Map(); // prefijo -> sugerencias (no repetir la misma consulta)
+
+        const mostrar = function(sugerencias) {
+            lista.replaceChildren(...sugerencias.map(s => {
+                const opcion = document.createElement('option');
+                opcion.value = s.texto;
+                opcion.label = `${s.tipo} · ${s.libros} libro(s)`;
+                return opcion;
+            }));
+        };
+
+        buscador.addEventListener('input', function() {
+            const prefijo = buscador.value.trim();
+            clearTimeout(temporizador);
+            if (prefijo.length < 2) {
+                lista.replaceChildren();
+                return;
+            }
+            if (recientes.has(prefijo)) {
+                mostrar(recientes.get(prefijo));
+                return;
+            }
+            temporizador = setTimeout(function() {
+                if (peticion) peticion.abort();
+                peticion = new AbortController();
+                fetch(`/api/sugerencias?prefix=${encodeURIComponent(prefijo)}&k=8`, { signal: peticion.signal })
+                    .then(respuesta => respuesta.json())
+                    .then(datos => {
+                        recientes.set(prefijo, datos.sugerencias);
+                        mostrar(datos.sugerencias);
+                    })
+                    .catch(() => {}); // Cancelada o sin red: el buscador sigue funcionando normal
+            }, 150);
+        });
+    }
+
 });
\ No newline at end of file
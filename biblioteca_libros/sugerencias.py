@@ -0,0 +1,216 @@
+import bisect
+import os
+import threading
+import time
+from collections import Counter
+from sqlalchemy import event, inspect, text
+from busqueda_difusa import IndiceTrigramas, normalizar
+
+# ==============================
+# SUGERENCIAS AL ESCRIBIR (Índice de prefijos)
+# ==============================
+# Para autocompletar no conviene preguntarle a SQLite en cada tecla
+# (un ilike 'har%' por pulsación). Guardamos en memoria una lista ORDENADA
+# de (texto normalizado, tipo, texto original) con los títulos, autores y
+# editoriales. Buscar un prefijo es un bisect (O(log n)) y luego leer las
+# k entradas siguientes: microsegundos, aunque haya un millón de libros.
+#
+# - Se construye una vez al arrancar la app web, en la misma pasada que el
+#   vocabulario de trigramas de la búsqueda difusa (busqueda_difusa.py).
+# - Se actualiza en el momento con los cambios que hace ESTE proceso
+#   (eventos de la sesión: se aplican al hacer commit, nunca si hay rollback).
+# - Lo que cambien otros procesos (otros workers, la consola) se recoge con
+#   una reconstrucción en segundo plano cuando la versión del catálogo cambió
+#   y pasaron BIBLIOTECA_SUGERENCIAS_REFRESCO segundos (por defecto 300).
+
+TIPOS = (("titulo", "nombre"), ("autor", "autor"), ("editorial", "editorial"))
+TIPO_DE_CAMPO = {campo: tipo for tipo, campo in TIPOS}
+# Campos que se siguen en los eventos: los de las sugerencias más la categoría (solo para trigramas)
+CAMPOS = ("nombre", "autor", "editorial", "categoria")
+MAXIMO_SUGERENCIAS = 20
+REFRESCO_SEGUNDOS = float(os.environ.get("BIBLIOTECA_SUGERENCIAS_REFRESCO", "300"))
+
+
+class IndicePrefijos:
+    """
+    Lista ordenada + conteo de libros por entrada. Un autor con 300 libros
+    ocupa UNA entrada; cuando su último libro se borra, la entrada desaparece.
+    """
+
+    def __init__(self):
+        self._entradas = [] # (clave normalizada, tipo, texto), ordenada
+        self._conteos = {}  # (tipo, texto) -> libros que lo usan
+        self._candado = threading.Lock()
+
+    @classmethod
+    def construir(cls, conteos: dict) -> "IndicePrefijos":
+        """Desde {(tipo, texto): cuántos libros lo tienen}. Un solo sort al final: O(n log n)."""
+        indice = cls()
+        indice._conteos = {clave: n for clave, n in conteos.items() if clave[1] and clave[1].strip()}
+        indice._entradas = sorted((normalizar(texto), tipo, texto) for tipo, texto in indice._conteos)
+        return indice
+
+    def agregar(self, tipo: str, texto: str):
+        if not texto or not texto.strip():
+            return
+        with self._candado:
+            conteo = self._conteos.get((tipo, texto), 0)
+            self._conteos[(tipo, texto)] = conteo + 1
+            if conteo == 0:
+                bisect.insort(self._entradas, (normalizar(texto), tipo, texto))
+
+    def quitar(self, tipo: str, texto: str):
+        if not texto or not texto.strip():
+            return
+        with self._candado:
+            conteo = self._conteos.get((tipo, texto), 0)
+            if conteo > 1:
+                self._conteos[(tipo, texto)] = conteo - 1
+            elif conteo == 1:
+                del self._conteos[(tipo, texto)]
+                entrada = (normalizar(texto), tipo, texto)
+                posicion = bisect.bisect_left(self._entradas, entrada)
+                if posicion < len(self._entradas) and self._entradas[posicion] == entrada:
+                    del self._entradas[posicion]
+
+    def buscar(self, prefijo: str, k: int = 8) -> list[dict]:
+        """Las primeras k entradas (en orden alfabético) que empiezan por 'prefijo'."""
+        clave = normalizar(prefijo)
+        if not clave:
+            return []
+        resultado = []
+        with self._candado:
+            posicion = bisect.bisect_left(self._entradas, (clave,))
+            while posicion < len(self._entradas) and len(resultado) < k:
+                normalizada, tipo, texto = self._entradas[posicion]
+                if not normalizada.startswith(clave):
+                    break
+                resultado.append({"texto": texto, "tipo": tipo, "libros": self._conteos[(tipo, texto)]})
+                posicion += 1
+        return resultado
+
+    def __len__(self):
+        return len(self._entradas)
+
+
+# ==============================
+# ÍNDICE DE LA APP (Construcción y sincronización)
+# ==============================
+class Sugerencias:
+    """
+    Los índices en memoria del buscador: prefijos (autocompletar) y trigramas
+    (búsqueda difusa), más lo necesario para mantenerlos al día.
+    """
+
+    def __init__(self):
+        self.indice = IndicePrefijos()
+        self.trigramas = IndiceTrigramas()
+        self._motor = None
+        self._version = None       # Versión del catálogo con la que se construyó
+        self._revisado = 0.0       # Última vez que se comparó la versión (time.monotonic)
+        self._reconstruyendo = threading.Lock()
+
+    def construir(self, motor):
+        """Lee los textos de la base (una sola pasada) y reemplaza los dos índices."""
+        import version_catalogo
+        self._motor = motor
+        conteos = Counter() # (campo, texto) -> libros: los textos repetidos se procesan una vez
+        with motor.connect() as conexion:
+            version, _ = version_catalogo.leer_version(conexion)
+            for fila in conexion.execute(text(f"SELECT {', '.join(CAMPOS)} FROM libros")):
+                conteos.update(zip(CAMPOS, fila))
+        prefijos = IndicePrefijos.construir({(TIPO_DE_CAMPO[campo], texto): n
+                                             for (campo, texto), n in conteos.items() if campo in TIPO_DE_CAMPO})
+        self.indice, self.trigramas = prefijos, IndiceTrigramas.construir(conteos)
+        self._version = version
+        self._revisado = time.monotonic()
+
+    def asegurar(self, motor):
+        """Construye los índices si nadie lo hizo aún (la consola los arma al primer uso)."""
+        if self._motor is None:
+            self.construir(motor)
+
+    def buscar(self, prefijo: str, k: int = 8) -> list[dict]:
+        self._revisar_version()
+        return self.indice.buscar(prefijo, min(max(k, 1), MAXIMO_SUGERENCIAS))
+
+    def _revisar_version(self):
+        """Cada REFRESCO_SEGUNDOS: si otro proceso cambió el catálogo, reconstruir en un hilo aparte."""
+        if self._motor is None or time.monotonic() - self._revisado < REFRESCO_SEGUNDOS:
+            return
+        if not self._reconstruyendo.acquire(blocking=False):
+            return # Ya hay una reconstrucción en curso
+        self._revisado = time.monotonic()
+
+        def reconstruir():
+            try:
+                import version_catalogo
+                with self._motor.connect() as conexion:
+                    version, _ = version_catalogo.leer_version(conexion)
+                if version != self._version:
+                    self.construir(self._motor)
+            finally:
+                self._reconstruyendo.release()
+
+        threading.Thread(target=reconstruir, name="sugerencias", daemon=True).start()
+
+    def aplicar(self, cambios: list[tuple[int, str, str]]):
+        """cambios = [(+1 o -1, campo, texto)]."""
+        indice, trigramas = self.indice, self.trigramas
+        for signo, campo, texto in cambios:
+            tipo = TIPO_DE_CAMPO.get(campo)
+            if signo > 0:
+                if tipo:
+                    indice.agregar(tipo, texto)
+                trigramas.agregar(campo, texto)
+            else:
+                if tipo:
+                    indice.quitar(tipo, texto)
+                trigramas.quitar(campo, texto)
+
+
+def sincronizar_con_eventos(fabrica_sesiones, modelo, sugerencias: Sugerencias):
+    """
+    Mantiene los índices al día con lo que haga la sesión sobre 'modelo':
+    libros nuevos, borrados y cambios de texto (ORM), más los registrados con
+    sentencias Core que se anuncien en session.info["libros_registrados"] (diccionarios).
+    Los cambios esperan al commit; un rollback los descarta.
+    """
+
+    def pendientes(sesion) -> list:
+        return sesion.info.setdefault("sugerencias_pendientes", [])
+
+    @event.listens_for(fabrica_sesiones, "after_flush")
+    def anotar_cambios(sesion, contexto):
+        cambios = pendientes(sesion)
+        for objeto in sesion.new:
+            if isinstance(objeto, modelo):
+                cambios.extend((+1, campo, getattr(objeto, campo)) for campo in CAMPOS)
+        for objeto in sesion.deleted:
+            if isinstance(objeto, modelo):
+                cambios.extend((-1, campo, getattr(objeto, campo)) for campo in CAMPOS)
+        for objeto in sesion.dirty:
+            if not isinstance(objeto, modelo):
+                continue
+            atributos = inspect(objeto).attrs # En after_flush la historia todavía está disponible
+            for campo in CAMPOS:
+                historia = atributos[campo].history
+                if historia.deleted or historia.added:
+                    cambios.extend((-1, campo, v) for v in historia.deleted)
+                    cambios.extend((+1, campo, v) for v in historia.added)
+
+    @event.listens_for(fabrica_sesiones, "after_commit")
+    def aplicar_cambios(sesion):
+        if sesion.in_nested_transaction():
+            return
+        cambios = sesion.info.pop("sugerencias_pendientes", [])
+        for registro in sesion.info.pop("libros_registrados", []):
+            cambios.extend((+1, campo, registro[campo]) for campo in CAMPOS)
+        if cambios:
+            sugerencias.aplicar(cambios)
+
+    @event.listens_for(fabrica_sesiones, "after_rollback")
+    def descartar_cambios(sesion):
+        if not sesion.in_nested_transaction():
+            sesion.info.pop("sugerencias_pendientes", None)
+            sesion.info.pop("libros_registrados", None)
@@ -0,0 +1,131 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from sqlalchemy import text
+
+# ==============================
+# VERSIÓN DEL CATÁLOGO (Caché HTTP)
+# ==============================
+# Un contador que SOLO sube cada vez que cambia la tabla 'libros'
+# (registrar, actualizar stock, eliminar, la API por lotes, la consola...).
+# Lo mantienen triggers dentro de SQLite, así que todos los workers de
+# gunicorn y los programas de consola ven el mismo número.
+#
+# Con él, /catalogo arma un ETag (versión + parámetros de la URL):
+#   - Si el navegador ya tiene esa versión, responde 304 sin consultar
+#     los libros ni dibujar la plantilla.
+#   - Si no, puede servir el HTML guardado en la caché de páginas.
+
+TABLA_VERSION = "catalogo_version"
+
+# Una sola fila (id = 1). 'modificado' en segundos Unix, para Last-Modified
+_SQL_SUBIR = f"""UPDATE {TABLA_VERSION}
+        SET version = version + 1, modificado = CAST(strftime('%s', 'now') AS INTEGER)
+        WHERE id = 1;"""
+
+_DDL_VERSION = [
+    f"""CREATE TABLE IF NOT EXISTS {TABLA_VERSION} (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL,
+        modificado INTEGER NOT NULL
+    )""",
+    f"""INSERT OR IGNORE INTO {TABLA_VERSION} (id, version, modificado)
+        VALUES (1, 1, CAST(strftime('%s', 'now') AS INTEGER))""",
+    f"CREATE TRIGGER IF NOT EXISTS libros_version_ai AFTER INSERT ON libros BEGIN {_SQL_SUBIR} END",
+    f"CREATE TRIGGER IF NOT EXISTS libros_version_au AFTER UPDATE ON libros BEGIN {_SQL_SUBIR} END",
+    f"CREATE TRIGGER IF NOT EXISTS libros_version_ad AFTER DELETE ON libros BEGIN {_SQL_SUBIR} END",
+]
+
+# Tamaño de la caché de páginas dibujadas (0 la apaga)
+PAGINAS_EN_CACHE = int(os.environ.get("BIBLIOTECA_CACHE_PAGINAS", "128"))
+
+# Parámetros de /catalogo que cambian el contenido de la página
+PARAMETROS_CATALOGO = ("q", "despues", "antes", "total", "page", "difusa")
+
+# Si se edita la plantilla, los ETag viejos dejan de servir (igual en todos los workers)
+_HUELLA_PLANTILLA = str(os.path.getmtime(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "catalogo.html")))
+
+
+def instalar_version(motor):
+    """Crea la tabla del contador y sus triggers si no existen (idempotente)."""
+    with motor.begin() as conexion:
+        for sentencia in _DDL_VERSION:
+            conexion.execute(text(sentencia))
+
+
+def leer_version(session) -> tuple[int, datetime]:
+    """(versión, fecha del último cambio). Es una búsqueda por llave primaria: cuesta microsegundos."""
+    version, modificado = session.execute(
+        text(f"SELECT version, modificado FROM {TABLA_VERSION} WHERE id = 1")
+    ).one()
+    return version, datetime.fromtimestamp(modificado, timezone.utc)
+
+
+def etiqueta(version: int, argumentos, *extra) -> str:
+    """ETag de una página: versión del catálogo + parámetros que la definen (en orden fijo)."""
+    partes = [_HUELLA_PLANTILLA, *map(str, extra)]
+    partes += [f"{p}={argumentos.get(p, '')}" for p in PARAMETROS_CATALOGO]
+    resumen = hashlib.sha1("\x1f".join(partes).encode("utf-8")).hexdigest()[:16]
+    return f"{version}-{resumen}"
+
+
+def no_modificado(peticion, etag: str, modificado: datetime) -> bool:
+    """
+    ¿El navegador ya tiene esta página? If-None-Match manda; If-Modified-Since
+    solo se mira si no vino ETag (tiene resolución de segundos).
+    """
+    if peticion.if_none_match:
+        return peticion.if_none_match.contains(etag)
+    if peticion.if_modified_since:
+        return modificado <= peticion.if_modified_since
+    return False
+
+
+# ==============================
+# CACHÉ DE PÁGINAS DIBUJADAS
+# ==============================
+class CachePaginas:
+    """
+    LRU de HTML ya dibujado, por ETag. Como el ETag lleva la versión, una
+    página vieja nunca se sirve; al ver una versión nueva se vacía de una vez.
+    Vive en la memoria de cada proceso (cada worker tiene la suya).
+    """
+
+    def __init__(self, maximo: int = PAGINAS_EN_CACHE):
+        self.maximo = maximo
+        self._paginas = OrderedDict()
+        self._version = None
+        self._candado = threading.Lock()
+
+    def obtener(self, version: int, etag: str) -> str | None:
+        with self._candado:
+            if version != self._version:
+                self._paginas.clear()
+                self._version = version
+                return None
+            html = self._paginas.get(etag)
+            if html is not None:
+                self._paginas.move_to_end(etag)
+            return html
+
+    def guardar(self, version: int, etag: str, html: str):
+        if self.maximo <= 0:
+            return
+        with self._candado:
+            if version != self._version:
+                return # Mientras se dibujaba llegó una versión más nueva
+            self._paginas[etag] = html
+            self._paginas.move_to_end(etag)
+            if len(self._paginas) > self.maximo:
+                self._paginas.popitem(last=False) # La menos usada
+
+    def vaciar(self):
+        """Olvida todas las páginas (los benchmarks la usan para medir en frío)."""
+        with self._candado:
+            self._paginas.clear()
+
+    def __len__(self):
+        return len(self._paginas)
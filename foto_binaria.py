@@ -0,0 +1,236 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+
+# ==============================
+# FOTO BINARIA (Snapshot leído con mmap)
+# ==============================
+# Alternativa opcional a biblioteca.json / inventario.json para arrancar rápido.
+# El JSON hay que leerlo y convertirlo completo antes de mostrar el menú; este
+# archivo se "mapea" en memoria y cada registro se decodifica solo cuando se pide.
+#
+# Estructura del archivo:
+#   CABECERA  firma b"FOTOBIN\0", versión, banderas, cantidad de registros, largo del esquema
+#   ESQUEMA   texto "id:s,nombre:s,...,cantidad:i" (el archivo se describe a sí mismo)
+#   TABLA     un registro de ancho fijo por elemento:
+#               texto   -> (posición en el heap, largo en bytes)
+#               entero  -> int64
+#               decimal -> float64
+#   HEAP      los textos en UTF-8, uno detrás de otro. Los repetidos (categorías,
+#             editoriales...) se guardan UNA sola vez.
+#
+# Conversión desde la consola:
+#   python foto_binaria.py a-binario biblioteca.json --tipo libro
+#   python foto_binaria.py a-json biblioteca.bin --tipo libro
+
+FIRMA = b"FOTOBIN\x00"
+VERSION = 1
+SIN_DUPLICADOS = 0b1 # Bandera: quien escribió la foto garantiza que no hay claves repetidas
+
+_CABECERA = struct.Struct("<8sHHQI")
+_FORMATOS = {"s": "QI", "i": "q", "f": "d"}
+
+ESQUEMA_LIBRO = (("id", "s"), ("nombre", "s"), ("categoria", "s"), ("autor", "s"),
+                 ("editorial", "s"), ("paginas", "i"), ("cantidad", "i"))
+ESQUEMA_PRODUCTO = (("nombre", "s"), ("precio", "f"), ("cantidad", "i"))
+
+
+class FormatoInvalido(ValueError):
+    """El archivo no es una foto binaria, es de otra versión o está incompleto."""
+
+
+def _estructura(esquema: tuple) -> struct.Struct:
+    return struct.Struct("<" + "".join(_FORMATOS[tipo] for _, tipo in esquema))
+
+
+def _texto_esquema(esquema: tuple) -> bytes:
+    return ",".join(f"{campo}:{tipo}" for campo, tipo in esquema).encode("utf-8")
+
+
+# ==============================
+# ESCRITURA
+# ==============================
+def escribir(ruta: str, esquema: tuple, registros, banderas: int = 0) -> int:
+    """
+    Escribe 'registros' (diccionarios) como foto binaria, de forma atómica:
+    primero a un temporal y luego se renombra encima. Retorna cuántos registros escribió.
+    """
+    estructura = _estructura(esquema)
+    tabla = bytearray()
+    heap = bytearray()
+    posiciones = {} # texto -> (posición, largo) para no repetirlo en el heap
+    cantidad = 0
+
+    for registro in registros:
+        valores = []
+        for campo, tipo in esquema:
+            valor = registro[campo]
+            if tipo == "s":
+                posicion = posiciones.get(valor)
+                if posicion is None:
+                    datos = valor.encode("utf-8")
+                    posicion = posiciones[valor] = (len(heap), len(datos))
+                    heap += datos
+                valores.extend(posicion)
+            else:
+                valores.append(valor)
+        tabla += estructura.pack(*valores)
+        cantidad += 1
+
+    esquema_bytes = _texto_esquema(esquema)
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(_CABECERA.pack(FIRMA, VERSION, banderas, cantidad, len(esquema_bytes)))
+        archivo.write(esquema_bytes)
+        archivo.write(tabla)
+        archivo.write(heap)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, ruta)
+    return cantidad
+
+
+# ==============================
+# LECTURA (Perezosa)
+# ==============================
+class FotoBinaria:
+    """
+    Vista de solo lectura sobre una foto binaria. Abrirla cuesta lo mismo con
+    diez registros que con un millón: solo se lee la cabecera. foto[i] decodifica
+    el registro i (un diccionario) directamente desde el mapa de memoria.
+    """
+
+    def __init__(self, ruta: str, esquema: tuple):
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        try:
+            try:
+                self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+                firma, version, self.banderas, self._cantidad, largo_esquema = _CABECERA.unpack_from(self._mapa, 0)
+            except (ValueError, struct.error): # Archivo vacío o más corto que la cabecera
+                raise FormatoInvalido(f"'{ruta}' es demasiado corto para ser una foto binaria")
+            if firma != FIRMA:
+                raise FormatoInvalido(f"'{ruta}' no es una foto binaria")
+            if version != VERSION:
+                raise FormatoInvalido(f"'{ruta}' es de la versión {version}; se esperaba la {VERSION}")
+            inicio_esquema = _CABECERA.size
+            if self._mapa[inicio_esquema:inicio_esquema + largo_esquema] != _texto_esquema(esquema):
+                raise FormatoInvalido(f"'{ruta}' no tiene los campos esperados")
+
+            self._esquema = esquema
+            self._estructura = _estructura(esquema)
+            self._inicio_tabla = inicio_esquema + largo_esquema
+            self._inicio_heap = self._inicio_tabla + self._cantidad * self._estructura.size
+            if len(self._mapa) < self._inicio_heap:
+                raise FormatoInvalido(f"'{ruta}' está incompleto")
+        except (OSError, ValueError):
+            self.cerrar()
+            raise
+        self._textos = {} # posición -> str: cada texto repetido se decodifica una sola vez
+
+    def __len__(self):
+        return self._cantidad
+
+    def __getitem__(self, indice: int) -> dict:
+        if indice < 0:
+            indice += self._cantidad
+        if not 0 <= indice < self._cantidad:
+            raise IndexError("registro fuera de rango")
+        valores = iter(self._estructura.unpack_from(self._mapa, self._inicio_tabla + indice * self._estructura.size))
+        registro = {}
+        for campo, tipo in self._esquema:
+            if tipo == "s":
+                registro[campo] = self._texto(next(valores), next(valores))
+            else:
+                registro[campo] = next(valores)
+        return registro
+
+    def __iter__(self):
+        for indice in range(self._cantidad):
+            yield self[indice]
+
+    def _texto(self, posicion: int, largo: int) -> str:
+        texto = self._textos.get(posicion)
+        if texto is None:
+            inicio = self._inicio_heap + posicion
+            texto = self._textos[posicion] = self._mapa[inicio:inicio + largo].decode("utf-8")
+        return texto
+
+    def cerrar(self):
+        """Libera el mapa y el archivo (en Windows no se puede reemplazar un archivo mapeado)."""
+        if getattr(self, "_mapa", None) is not None:
+            self._mapa.close()
+            self._mapa = None
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+# ==============================
+# CONVERSORES JSON <-> BINARIO
+# ==============================
+def clave_libro(registro: dict) -> tuple:
+    return (registro["nombre"].lower().strip(), registro["editorial"].lower().strip())
+
+
+def clave_producto(registro: dict) -> str:
+    return registro["nombre"].lower().strip()
+
+
+TIPOS = {
+    "libro": (ESQUEMA_LIBRO, clave_libro),
+    "producto": (ESQUEMA_PRODUCTO, clave_producto),
+}
+
+
+def json_a_binario(ruta_json: str, ruta_binaria: str, tipo: str) -> int:
+    """Convierte biblioteca.json / inventario.json en foto binaria. Retorna cuántos registros."""
+    esquema, clave = TIPOS[tipo]
+    with open(ruta_json, "r", encoding="utf-8") as archivo:
+        datos = json.load(archivo)
+    banderas = SIN_DUPLICADOS if len({clave(d) for d in datos}) == len(datos) else 0
+    return escribir(ruta_binaria, esquema, datos, banderas)
+
+
+def binario_a_json(ruta_binaria: str, ruta_json: str, tipo: str) -> int:
+    """Convierte la foto binaria de vuelta al mismo JSON que escriben los programas."""
+    esquema, _ = TIPOS[tipo]
+    with FotoBinaria(ruta_binaria, esquema) as foto:
+        datos = list(foto)
+    temporal = f"{ruta_json}.tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump(datos, archivo, indent=4)
+    os.replace(temporal, ruta_json)
+    return len(datos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convierte entre el JSON y la foto binaria.")
+    parser.add_argument("direccion", choices=["a-binario", "a-json"])
+    parser.add_argument("origen")
+    parser.add_argument("destino", nargs="?", help="Por defecto, el mismo nombre con .bin o .json")
+    parser.add_argument("--tipo", choices=sorted(TIPOS), required=True)
+    args = parser.parse_args()
+
+    base = os.path.splitext(args.origen)[0]
+    if args.direccion == "a-binario":
+        destino = args.destino or f"{base}.bin"
+        cantidad = json_a_binario(args.origen, destino, args.tipo)
+    else:
+        destino = args.destino or f"{base}.json"
+        cantidad = binario_a_json(args.origen, destino, args.tipo)
+    print(f"{cantidad} registros: {args.origen} -> {destino}")
+    diario = f"{args.origen}.diario"
+    if os.path.exists(diario) and os.path.getsize(diario) > 0:
+        print(f"Aviso: '{diario}' tiene cambios que NO están en la foto; "
+              f"abra y cierre el programa (opción Guardar) antes de convertir.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 import json
+import os
+import foto_binaria
 
 
 # ==========================================
@@ -9,6 +11,9 @@ ROJO = '\033[91m'
 BLUE = '\033[94m'
 RESET = '\033[0m'  # Restablece el color de la consola
 
+# Si existe, se usa en lugar de inventario.json (convertir con foto_binaria.py)
+ARCHIVO_BINARIO = "inventario.bin"
+
 # ==========================================
 # FUNCIONES AUXILIARES
 # ==========================================
@@ -17,34 +22,22 @@ def formato_pesos_colombianos(precio):
     texto = f"${precio:,.2f}"
     return texto.replace(",", "_").replace(".", ",").replace("_", ".")
 
+def normalizar(nombre: str) -> str:
+    """Clave de comparación: minúsculas y sin espacios a los lados."""
+    return nombre.lower().strip()
+
 def sanitizar_inventario():
     """
-    Fusiona productos duplicados en la lista global inventario.
+    Fusiona productos duplicados en el inventario global.
     Suma las cantidades y deja un solo registro por nombre.
     """
-    global inventario # Necesario para modificar la lista principal
-    diccionario_unico = {}
-    duplicados_corregidos = 0
-
     print(f"{BLUE}Verificando duplicados en la base de datos...{RESET}")
 
-    for producto in inventario:
-        # Normalizamos el nombre (minusculas y sin espacios extra)
-        clave_nombre = producto.nombre.lower().strip()
+    # El almacén ya fusiona al cargar (su diccionario no admite dos productos con
+    # el mismo nombre); aquí solo informamos cuántos encontró
+    duplicados_corregidos = inventario.fusionar_duplicados()
 
-        if clave_nombre in diccionario_unico:
-            # ¡DUPLICADO DETECTADO!
-            # Sumamos la cantidad del duplicado al que ya guardamos
-            diccionario_unico[clave_nombre].cantidad += producto.cantidad
-            duplicados_corregidos += 1
-        else:
-            # Es el primero que encontramos, lo guardamos
-            diccionario_unico[clave_nombre] = producto
-
-    # Si encontramos errores, actualizamos la lista real
     if duplicados_corregidos > 0:
-        # Reemplazamos la lista vieja con los valores únicos del diccionario
-        inventario = list(diccionario_unico.values())
         print(f"{VERDE}¡Limpieza completada! Se fusionaron {duplicados_corregidos} registros repetidos.{RESET}")
         guardar_datos() # Guardamos inmediatamente el arreglo en el JSON
     else:
@@ -55,7 +48,10 @@ def sanitizar_inventario():
 # ==========================================
 class Producto:
     """Clase que representa un producto individual en el almacén."""
-    
+
+    # __slots__: cada producto ocupa menos memoria (sin diccionario interno por objeto)
+    __slots__ = ("nombre", "precio", "cantidad")
+
     def __init__(self, nombre, precio, cantidad):
         self.nombre = nombre
         self.precio = precio
@@ -64,10 +60,10 @@ class Producto:
     def mostrar_info(self):
         """Devuelve una tupla con los datos del producto para formato tabla."""
         return (self.nombre, formato_pesos_colombianos(self.precio), self.cantidad)
-    
+
     def actualizar_stock(self, cantidad_cambio):
         """
-        Modifica el stock. 
+        Modifica el stock.
         Recibe: cantidad_cambio (int). Positivo para comprar, negativo para vender.
         Retorna: True si la operación fue exitosa, False si no hay stock suficiente.
         """
@@ -76,24 +72,148 @@ class Producto:
         self.cantidad += cantidad_cambio
         return True
 
+    def a_dict(self) -> dict:
+        """Los datos del producto tal como se guardan en el JSON."""
+        return {"nombre": self.nombre, "precio": self.precio, "cantidad": self.cantidad}
+
+class InventarioStore:
+    """
+    Reemplaza la lista global de productos: un diccionario por nombre normalizado
+    (mantiene el orden de llegada). Buscar, registrar, vender o eliminar
+    cuesta O(1) en lugar de recorrer todo el inventario.
+
+    Se puede importar y usar sin el menú (otros servicios, pruebas de carga).
+    Si se crea desde una foto binaria, los productos se construyen la primera
+    vez que algo los necesita.
+    """
+
+    def __init__(self, productos: list[Producto] = None, foto: foto_binaria.FotoBinaria = None):
+        self._por_nombre = {}  # nombre normalizado -> Producto
+        self._fusionados = 0   # Duplicados fusionados al cargar (los reporta sanitizar)
+        self._foto = None
+        for producto in productos or []:
+            self._agregar(producto)
+        self._foto = foto      # Foto binaria aún sin convertir en productos
+
+    def _cargar_foto(self):
+        """Crea los productos de la foto binaria la primera vez que se necesitan."""
+        if self._foto is None:
+            return
+        foto, self._foto = self._foto, None
+        try:
+            for dato in foto:
+                self._agregar(Producto(dato["nombre"], dato["precio"], dato["cantidad"]))
+        finally:
+            foto.cerrar()
+
+    def _agregar(self, producto: Producto):
+        """Carga un producto; si el nombre ya existe, suma su cantidad al primero."""
+        existente = self._por_nombre.get(normalizar(producto.nombre))
+        if existente is None:
+            self._por_nombre[normalizar(producto.nombre)] = producto
+        else:
+            existente.cantidad += producto.cantidad
+            self._fusionados += 1
+
+    # --- Lista de productos ---
+    def __iter__(self):
+        self._cargar_foto()
+        return iter(list(self._por_nombre.values()))
+
+    def __len__(self):
+        return len(self._foto) if self._foto is not None else len(self._por_nombre)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def solo_en_foto(self) -> bool:
+        """True si aún no se cargó nada de la foto binaria (y por lo tanto nada cambió)."""
+        return self._foto is not None
+
+    # --- Operaciones de un producto ---
+    def buscar(self, nombre: str) -> Producto | None:
+        self._cargar_foto()
+        return self._por_nombre.get(normalizar(nombre))
+
+    def registrar(self, nombre: str, precio: float, cantidad: int) -> tuple[Producto, bool]:
+        """
+        Upsert: si el producto no existe lo crea; si existe, suma la cantidad
+        (el precio registrado se conserva). Retorna (producto, es_nuevo).
+        """
+        existente = self.buscar(nombre)
+        if existente is not None:
+            existente.actualizar_stock(cantidad)
+            return existente, False
+        producto = Producto(nombre, precio, cantidad)
+        self._por_nombre[normalizar(nombre)] = producto
+        return producto, True
+
+    def cambiar_stock(self, nombre: str, cambio: int) -> bool:
+        """Suma o resta stock. False si el producto no existe o quedaría negativo."""
+        producto = self.buscar(nombre)
+        return producto is not None and producto.actualizar_stock(cambio)
+
+    def eliminar(self, nombre: str) -> Producto | None:
+        """Quita el producto y lo retorna (None si no existía)."""
+        self._cargar_foto()
+        return self._por_nombre.pop(normalizar(nombre), None)
+
+    # --- Operaciones en lote ---
+    def registrar_lote(self, filas) -> int:
+        """Registra (nombre, precio, cantidad) en bloque. Retorna cuántos productos eran nuevos."""
+        return sum(1 for fila in filas if self.registrar(*fila)[1])
+
+    def cambiar_stock_lote(self, cambios) -> list[dict]:
+        """
+        Aplica (nombre, cambio) en bloque. Los cambios válidos se aplican;
+        los demás se devuelven con su motivo, igual que ajustar_stock_lote de la web.
+        """
+        rechazados = []
+        for nombre, cambio in cambios:
+            producto = self.buscar(nombre)
+            if producto is None:
+                rechazados.append({"nombre": nombre, "motivo": "no existe"})
+            elif not producto.actualizar_stock(cambio):
+                rechazados.append({"nombre": nombre, "motivo": "stock insuficiente"})
+        return rechazados
+
+    def eliminar_lote(self, nombres) -> int:
+        """Elimina varios productos. Retorna cuántos existían."""
+        return sum(1 for nombre in nombres if self.eliminar(nombre) is not None)
+
+    # --- Limpieza ---
+    def fusionar_duplicados(self) -> int:
+        """Retorna (y olvida) cuántos duplicados se fusionaron al cargar."""
+        if self._foto is not None:
+            # La foto dice si al escribirla ya estaba limpia: no hace falta cargarla para saberlo
+            if self._foto.banderas & foto_binaria.SIN_DUPLICADOS:
+                return 0
+            self._cargar_foto()
+        fusionados, self._fusionados = self._fusionados, 0
+        return fusionados
+
 # ==========================================
 # FUNCIONES DE PERSISTENCIA (Manejo de Archivos)
 # ==========================================
 def guardar_datos():
-    """Serializa la lista de objetos a JSON y la guarda en disco."""
-    
+    """Serializa el inventario a JSON y lo guarda en disco."""
+    if os.path.exists(ARCHIVO_BINARIO) and inventario.solo_en_foto():
+        # Nada se cargó, así que nada cambió: la foto en disco ya está al día
+        print(f"\n{VERDE}Sin cambios: '{ARCHIVO_BINARIO}' ya está al día.{RESET}")
+        return
+
     # 1. Transformación (RAM): Convertimos Objetos -> Lista de Diccionarios
     # Optimizamos: Creamos la lista en memoria ANTES de abrir el archivo.
-    lista_datos = []
-    for item in inventario:
-        lista_datos.append({
-            "nombre": item.nombre, 
-            "precio": item.precio, 
-            "cantidad": item.cantidad
-        })
-    
+    lista_datos = [item.a_dict() for item in inventario]
+
     # 2. Escritura (Disco): Abrimos el archivo solo el tiempo necesario
     try:
+        if os.path.exists(ARCHIVO_BINARIO):
+            # El almacén no admite nombres repetidos: la foto siempre queda limpia
+            foto_binaria.escribir(ARCHIVO_BINARIO, foto_binaria.ESQUEMA_PRODUCTO, lista_datos,
+                                  foto_binaria.SIN_DUPLICADOS)
+            print(f"\n{VERDE}Datos guardados exitosamente en '{ARCHIVO_BINARIO}'.{RESET}")
+            return
         with open("inventario.json", "w") as archivo:
             json.dump(lista_datos, archivo, indent=4) # indent=4 lo hace legible para humanos
         print(f"\n{VERDE}Datos guardados exitosamente en 'inventario.json'.{RESET}")
@@ -101,17 +221,31 @@ def guardar_datos():
         print(f"{ROJO}Error al guardar datos: {e}{RESET}")
 
 def cargar_datos():
-    """Lee el JSON del disco y reconstruye los objetos en memoria."""
+    """Lee el JSON del disco y reconstruye el inventario en memoria."""
+    global inventario
+    if os.path.exists(ARCHIVO_BINARIO):
+        # Foto binaria: solo se lee la cabecera; los productos se crean al primer uso
+        try:
+            foto = foto_binaria.FotoBinaria(ARCHIVO_BINARIO, foto_binaria.ESQUEMA_PRODUCTO)
+            inventario = InventarioStore(foto=foto)
+            print(f"{VERDE}Datos cargados exitosamente desde '{ARCHIVO_BINARIO}'{RESET}")
+            return
+        except foto_binaria.FormatoInvalido as e:
+            # No la tratamos como vacía: guardar_datos la sobrescribiría y se perderían los datos
+            # (igual que biblioteca.cargar_biblioteca). Seguimos con el JSON, si existe
+            respaldo = f"{ARCHIVO_BINARIO}.corrupto"
+            os.replace(ARCHIVO_BINARIO, respaldo)
+            print(f"{ROJO}Error: {e}. El archivo se movió a '{respaldo}'.{RESET}")
+
     try:
         with open("inventario.json", "r") as archivo:
             lista_datos = json.load(archivo) # Carga la lista de diccionarios
-            
-            for dato in lista_datos:
-                # Reconstrucción: Diccionario -> Objeto Producto
-                prod = Producto(dato["nombre"], dato["precio"], dato["cantidad"])
-                inventario.append(prod)
+
+            # Reconstrucción: Diccionario -> Objeto Producto
+            inventario = InventarioStore([Producto(dato["nombre"], dato["precio"], dato["cantidad"])
+                                          for dato in lista_datos])
         print(f"{VERDE}Datos cargados exitosamente desde 'inventario.json'{RESET}")
-    
+
     except FileNotFoundError:
         # Esto es normal la primera vez que se ejecuta el programa
         print(f"{BLUE}Archivo 'inventario.json' no encontrado. Iniciando con inventario vacío.{RESET}")
@@ -119,119 +253,152 @@ def cargar_datos():
         print(f"{ROJO}Error: El archivo de datos está corrupto.{RESET}")
 
 # ==========================================
-# INICIO DEL SISTEMA
+# REPORTES
 # ==========================================
-inventario = [] # Base de datos en memoria (RAM)
+def mostrar_reporte(top: int = 10, umbral_stock: int = 5):
+    """Valor del inventario, productos más valiosos, stock bajo y rangos de precio."""
+    # NumPy se importa solo al pedir un reporte: el menú arranca igual de rápido
+    from reportes_inventario import ReporteInventario, formatear_pesos_lote
+
+    reporte = ReporteInventario.desde_inventario(inventario)
+    if len(reporte) == 0:
+        print("El inventario está vacío.")
+        return
+
+    print("\n" + "="*60)
+    print("                       REPORTE DE INVENTARIO")
+    print("="*60)
+    print(f"Productos: {len(reporte)} | Agotados: {reporte.agotados()}")
+    print(f"Valor total del inventario: {VERDE}{formato_pesos_colombianos(reporte.valor_total())}{RESET}")
 
-# Cargar datos al arrancar (Recuperar memoria)
-cargar_datos()
+    mas_valiosos = reporte.top_por_valor(top)
+    print(f"\n{BLUE}Top {len(mas_valiosos)} por valor (precio x cantidad){RESET}")
+    for (nombre, _), valor in zip(mas_valiosos, formatear_pesos_lote([v for _, v in mas_valiosos])):
+        print(f"{nombre:<30} | {valor:>20}")
 
-# Pasar la escoba (Limpiar duplicados y sumar cantidades)
-sanitizar_inventario()
+    bajos = reporte.stock_bajo(umbral_stock, limite=top)
+    print(f"\n{BLUE}Stock bajo (<= {umbral_stock} unidades){RESET}")
+    if not bajos:
+        print("Ninguno.")
+    for nombre, cantidad in bajos:
+        print(f"{nombre:<30} | {cantidad:>5}")
+
+    conteos, bordes = reporte.histograma_precios()
+    etiquetas = formatear_pesos_lote(bordes)
+    print(f"\n{BLUE}Productos por rango de precio{RESET}")
+    for i, conteo in enumerate(conteos):
+        print(f"{etiquetas[i]:>16} - {etiquetas[i + 1]:<16} | {conteo}")
+    print("="*60)
+
+# ==========================================
+# INICIO DEL SISTEMA
+# ==========================================
+inventario = InventarioStore() # Base de datos en memoria (RAM)
 
 # ==========================================
 # BUCLE PRINCIPAL (Interfaz de Usuario)
 # ==========================================
-while True:
-    print("\n" + "="*30)
-    print("      MENÚ INVENTARIO")
-    print("-"*30)
-    print("1. Registrar nuevo producto")
-    print("2. Ver Inventario")
-    print("3. Actualizar Stock de un Producto")
-    print("4. Eliminar un Producto")
-    print("5. Salir")
-    print("="*30)
-
-    menu_principal = input(">>> Selecciona una opción (1-5): ")
-    # --- OPCIÓN 1: CREAR (Create) ---
-    # --- OPCIÓN 1: CREAR O ACTUALIZAR (Create / Upsert) ---
-    if menu_principal == "1":
-        nombre = input("Ingrese el nombre del producto: ").strip() # .strip() quita espacios accidentales al inicio/final
-        
-        # 1. BÚSQUEDA PREVIA: ¿Ya existe?
-        producto_existente = None
-        for item in inventario:
-            if item.nombre.lower() == nombre.lower():
-                producto_existente = item
-                break # ¡Lo encontramos! Dejamos de buscar.
-
-        # 2. DECISIÓN: CAMINO A (Actualizar) o CAMINO B (Crear)
-        
-        if producto_existente:
-            # --- CAMINO A: EL PRODUCTO YA EXISTE ---
-            print(f"\n{BLUE}¡Aviso! El producto '{producto_existente.nombre}' ya está registrado.{RESET}")
-            print(f"Precio: {formato_pesos_colombianos(producto_existente.precio)} | Stock actual: {producto_existente.cantidad}")
-            
-            while True:
-                try:
-                    sumar_stock = int(input("Ingrese la cantidad ADICIONAL a sumar al inventario: "))
-                    if sumar_stock >= 0:
-                        producto_existente.actualizar_stock(sumar_stock)
-                        print(f"{VERDE}Stock actualizado. Nuevo total: {producto_existente.cantidad}{RESET}")
-                        break
-                    else:
-                        print("Por favor, ingrese un número positivo.")
-                except ValueError:
-                    print("Error: Ingrese un número entero.")
-                    continue
+def main():
+    # Cargar datos al arrancar (Recuperar memoria)
+    cargar_datos()
 
-        else:
-            # --- CAMINO B: EL PRODUCTO ES NUEVO (Tu lógica original) ---
-            print(f"{BLUE}Producto nuevo detectado. Procediendo al registro...{RESET}")
-            
-            # Validación de Precio
-            while True:
-                try:
-                    precio = float(input("Ingrese el precio del producto: "))
-                    if precio >= 0:
-                        break
-                    else:
-                        print("Por favor, ingrese un precio válido (mayor o igual a 0).")
-                except ValueError:
-                    print("Entrada inválida. Por favor, ingrese un número válido.")
-                    continue
-
-            # Validación de Cantidad
-            while True:
-                try:
-                    cantidad = int(input("Ingrese la cantidad INICIAL del producto: "))
-                    if cantidad >= 0:
-                        break
-                    else:
-                        print("Por favor, ingrese una cantidad válida (mayor o igual a 0).")
-                except ValueError:
-                    print("Entrada inválida. Por favor, ingrese un número entero.")
-                    continue
-
-            # Instancia y guardado en RAM
-            nuevo_producto = Producto(nombre, precio, cantidad)
-            inventario.append(nuevo_producto)
-            print(f"{VERDE}Producto '{nombre}' registrado exitosamente.{RESET}")
-    # --- OPCIÓN 2: LEER (Read) ---
-    elif menu_principal == "2":
-        if not inventario:
-            print("El inventario está vacío.")
-        else:
-            print("\n" + "="*60)
-            print("                            INVENTARIO")
-            print("="*60)
-            print(f"{'Producto':<20} | {'Precio':<12} | {'Cantidad':<10}")
-            print("-"*60)
-            for item in inventario:
-                nombre, precio, cantidad = item.mostrar_info()
-                print(f"{nombre:<20} | {precio:<12} | {cantidad:<10}")
-            print("="*60)
-
-    # --- OPCIÓN 3: ACTUALIZAR (Update) ---
-    elif menu_principal == "3":
-        nombre_buscar = input("Ingrese el nombre del producto a actualizar: ")
-        producto_encontrado = None
-        
-        # Búsqueda Lineal
-        for item in inventario:
-            if item.nombre.lower() == nombre_buscar.lower():
-                producto_encontrado = item
+    # Pasar la escoba (Limpiar duplicados y sumar cantidades)
+    sanitizar_inventario()
+
+    while True:
+        print("\n" + "="*30)
+        print("      MENÚ INVENTARIO")
+        print("-"*30)
+        print("1. Registrar nuevo producto")
+        print("2. Ver Inventario")
+        print("3. Actualizar Stock de un Producto")
+        print("4. Eliminar un Producto")
+        print("5. Reportes (valor del inventario)")
+        print("6. Salir")
+        print("="*30)
+
+        menu_principal = input(">>> Selecciona una opción (1-6): ")
+        # --- OPCIÓN 1: CREAR O ACTUALIZAR (Create / Upsert) ---
+        if menu_principal == "1":
+            nombre = input("Ingrese el nombre del producto: ").strip() # .strip() quita espacios accidentales al inicio/final
+
+            # 1. BÚSQUEDA PREVIA: ¿Ya existe? (diccionario: O(1), sin recorrer el inventario)
+            producto_existente = inventario.buscar(nombre)
+
+            # 2. DECISIÓN: CAMINO A (Actualizar) o CAMINO B (Crear)
+
+            if producto_existente:
+                # --- CAMINO A: EL PRODUCTO YA EXISTE ---
+                print(f"\n{BLUE}¡Aviso! El producto '{producto_existente.nombre}' ya está registrado.{RESET}")
+                print(f"Precio: {formato_pesos_colombianos(producto_existente.precio)} | Stock actual: {producto_existente.cantidad}")
+
+                while True:
+                    try:
+                        sumar_stock = int(input("Ingrese la cantidad ADICIONAL a sumar al inventario: "))
+                        if sumar_stock >= 0:
+                            inventario.cambiar_stock(nombre, sumar_stock)
+                            print(f"{VERDE}Stock actualizado. Nuevo total: {producto_existente.cantidad}{RESET}")
+                            break
+                        else:
+                            print("Por favor, ingrese un número positivo.")
+                    except ValueError:
+                        print("Error: Ingrese un número entero.")
+                        continue
+
+            else:
+                # --- CAMINO B: EL PRODUCTO ES NUEVO (Tu lógica original) ---
+                print(f"{BLUE}Producto nuevo detectado. Procediendo al registro...{RESET}")
+
+                # Validación de Precio
+                while True:
+                    try:
+                        precio = float(input("Ingrese el precio del producto: "))
+                        if precio >= 0:
+                            break
+                        else:
+                            print("Por favor, ingrese un precio válido (mayor o igual a 0).")
+                    except ValueError:
+                        print("Entrada inválida. Por favor, ingrese un número válido.")
+                        continue
+
+                # Validación de Cantidad
+                while True:
+                    try:
+                        cantidad = int(input("Ingrese la cantidad INICIAL del producto: "))
+                        if cantidad >= 0:
+                            break
+                        else:
+                            print("Por favor, ingrese una cantidad válida (mayor o igual a 0).")
+                    except ValueError:
+                        print("Entrada inválida. Por favor, ingrese un número entero.")
+                        continue
+
+                # Instancia y guardado en RAM
+                inventario.registrar(nombre, precio, cantidad)
+                print(f"{VERDE}Producto '{nombre}' registrado exitosamente.{RESET}")
+        # --- OPCIÓN 2: LEER (Read) ---
+        elif menu_principal == "2":
+            if not inventario:
+                print("El inventario está vacío.")
+            else:
+                print("\n" + "="*60)
+                print("                            INVENTARIO")
+                print("="*60)
+                print(f"{'Producto':<20} | {'Precio':<12} | {'Cantidad':<10}")
+                print("-"*60)
+                from reportes_inventario import formatear_pesos_lote
+                productos = list(inventario)
+                precios = formatear_pesos_lote([item.precio for item in productos]) # Todos los precios de una vez
+                for item, precio in zip(productos, precios):
+                    print(f"{item.nombre:<20} | {precio:<12} | {item.cantidad:<10}")
+                print("="*60)
+
+        # --- OPCIÓN 3: ACTUALIZAR (Update) ---
+        elif menu_principal == "3":
+            nombre_buscar = input("Ingrese el nombre del producto a actualizar: ")
+            producto_encontrado = inventario.buscar(nombre_buscar)
+
+            if producto_encontrado:
                 nombre, precio, cantidad = producto_encontrado.mostrar_info()
                 print(f"\nProducto encontrado:")
                 print(f"{'Nombre':<15}: {nombre}")
@@ -241,7 +408,7 @@ while True:
                 while True:
                     try:
                         cambio = int(input("Ingrese la cantidad a agregar (positivo) o vender (negativo): "))
-                        if producto_encontrado.actualizar_stock(cambio):
+                        if inventario.cambiar_stock(nombre_buscar, cambio):
                             print(f"{VERDE}Stock actualizado exitosamente.{RESET}")
                         else:
                             print(f"{ROJO}ERROR{RESET}: Stock insuficiente para realizar la venta.")
@@ -249,44 +416,45 @@ while True:
                     except ValueError:
                         print("Entrada inválida. Por favor, ingrese un número entero.")
                         continue
-                break # Rompe el for una vez encontrado
-                    
-        if not producto_encontrado:
-            print(f"{ROJO}ERROR{RESET}: Producto no encontrado en el inventario.")       
-    # --- OPCIÓN 4: ELIMINAR (Delete) ---
-    elif menu_principal == "4":
-        nombre_eliminar = input("Ingrese el nombre del producto a eliminar: ").strip()
-        producto_encontrado = None
-
-        # 1. Buscamos el objeto
-        for item in inventario:
-            if item.nombre.lower() == nombre_eliminar.lower():
-                producto_encontrado = item
-                break # Lo encontramos, dejamos de buscar
-
-        # 2. Confirmamos y Borramos
-        if producto_encontrado:
-            print(f"\n{ROJO}¡ADVERTENCIA! Va a eliminar el siguiente producto:{RESET}")
-            # Mostramos info para que esté seguro
-            nombre, precio, cantidad = producto_encontrado.mostrar_info()
-            print(f" - {nombre} (Stock: {cantidad})")
-            
-            confirmacion = input(f"¿Está seguro de borrarlo permanentemente? ({VERDE}si{RESET}/{ROJO}no{RESET}): ").lower()
-            
-            if confirmacion == "si":
-                inventario.remove(producto_encontrado) # <--- AQUÍ OCURRE LA MUERTE DEL DATO
-                print(f"\n{VERDE}Producto eliminado exitosamente.{RESET}")
-                guardar_datos() # Guardado automático por seguridad
             else:
-                print(f"\n{BLUE}Operación cancelada. El producto está a salvo.{RESET}")
+                print(f"{ROJO}ERROR{RESET}: Producto no encontrado en el inventario.")
+        # --- OPCIÓN 4: ELIMINAR (Delete) ---
+        elif menu_principal == "4":
+            nombre_eliminar = input("Ingrese el nombre del producto a eliminar: ").strip()
+
+            # 1. Buscamos el objeto
+            producto_encontrado = inventario.buscar(nombre_eliminar)
+
+            # 2. Confirmamos y Borramos
+            if producto_encontrado:
+                print(f"\n{ROJO}¡ADVERTENCIA! Va a eliminar el siguiente producto:{RESET}")
+                # Mostramos info para que esté seguro
+                nombre, precio, cantidad = producto_encontrado.mostrar_info()
+                print(f" - {nombre} (Stock: {cantidad})")
+
+                confirmacion = input(f"¿Está seguro de borrarlo permanentemente? ({VERDE}si{RESET}/{ROJO}no{RESET}): ").lower()
+
+                if confirmacion == "si":
+                    inventario.eliminar(nombre_eliminar) # <--- AQUÍ OCURRE LA MUERTE DEL DATO
+                    print(f"\n{VERDE}Producto eliminado exitosamente.{RESET}")
+                    guardar_datos() # Guardado automático por seguridad
+                else:
+                    print(f"\n{BLUE}Operación cancelada. El producto está a salvo.{RESET}")
+            else:
+                print(f"{ROJO}Error: El producto '{nombre_eliminar}' no existe en el inventario.{RESET}")
+
+        # --- OPCIÓN 5: REPORTES ---
+        elif menu_principal == "5":
+            mostrar_reporte()
+
+        # --- OPCIÓN 6: SALIR Y GUARDAR ---
+        elif menu_principal == "6":
+            guardar_datos() # Llamada a la función de persistencia
+            print("\nSaliendo del sistema de inventario. ¡Hasta luego!")
+            break
+
         else:
-            print(f"{ROJO}Error: El producto '{nombre_eliminar}' no existe en el inventario.{RESET}")
-
-    # --- OPCIÓN 4: SALIR Y GUARDAR ---
-    elif menu_principal == "5":
-        guardar_datos() # Llamada a la función de persistencia
-        print("\nSaliendo del sistema de inventario. ¡Hasta luego!")
-        break
-    
-    else:
-        print("Opción no válida. Intente de nuevo.")
\ No newline at end of file
+            print("Opción no válida. Intente de nuevo.")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
+import logging
+import os
 import uuid
 # Importamos las herramientas de construcción de SQLAlchemy
-from sqlalchemy import create_engine, Column, String, Integer
+from sqlalchemy import Column, String, Integer
 from sqlalchemy.orm import declarative_base, sessionmaker
+# La misma fábrica de motores que usa la app web (pool + PRAGMAS de SQLite)
+from biblioteca_libros.fabrica_motor import crear_motor
+from biblioteca_libros.metricas import instrumentar_motor
 
 # 1. Crear la Base (El Molde Maestro)
 # Todas nuestras clases heredarán de aquí para que SQLAlchemy sepa que son tablas.
@@ -35,9 +40,15 @@ class LibroSQL(Base):
         return f"<Libro(nombre='{self.nombre}', editorial='{self.editorial}')>"
 
 # 3. Conectar el Motor (Engine)
-# 'sqlite:///biblioteca.sqlite' significa: Crea un archivo local llamado biblioteca.sqlite
-motor = create_engine('sqlite:///biblioteca.sqlite', echo=True) 
-# echo=True hará que veas en consola el SQL real que Python escribe por ti (¡Magia!)
+# 'biblioteca.sqlite' significa: Crea un archivo local llamado biblioteca.sqlite
+# Siempre ese archivo (BIBLIOTECA_DB no lo cambia): LibroSQL no tiene las columnas
+# de clave de la app web, así que esta demo nunca debe escribir en la base de la app
+motor = crear_motor('biblioteca.sqlite', usar_entorno=False) 
+# En lugar de echo=True (todo o nada), cronometramos cada sentencia:
+# verás en consola el SQL real que Python escribe por ti y cuánto tardó (¡Magia!).
+# Con BIBLIOTECA_SQL_LENTO_MS=5 solo se muestran las que tarden 5 ms o más.
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+instrumentar_motor(motor, umbral_lento_ms=float(os.environ.get("BIBLIOTECA_SQL_LENTO_MS", "0")))
 
 # 4. Crear las Tablas
 # Esta línea le dice a la base de datos: "Si no existen las tablas, créalas ya".
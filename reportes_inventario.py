@@ -0,0 +1,94 @@
+import numpy as np
+
+# ==========================================
+# REPORTES DEL INVENTARIO (NumPy)
+# ==========================================
+# Los precios y cantidades se copian UNA vez a arreglos de NumPy y todos los
+# cálculos (valor total, valor por producto, top-N, stock bajo, histograma)
+# se hacen sobre los arreglos completos, sin bucles de Python por producto.
+# Con un millón de productos cada cálculo tarda milisegundos.
+
+
+class ReporteInventario:
+    """Foto de precios y cantidades en arreglos; se construye de nuevo si el inventario cambia."""
+
+    def __init__(self, nombres: list[str], precios, cantidades):
+        self.nombres = nombres
+        self.precios = np.asarray(precios, dtype=np.float64)
+        self.cantidades = np.asarray(cantidades, dtype=np.int64)
+        self._valores = None
+
+    @classmethod
+    def desde_inventario(cls, productos) -> "ReporteInventario":
+        """Arma el reporte desde un InventarioStore (o cualquier colección de Productos)."""
+        productos = list(productos)
+        total = len(productos)
+        return cls([p.nombre for p in productos],
+                   np.fromiter((p.precio for p in productos), dtype=np.float64, count=total),
+                   np.fromiter((p.cantidad for p in productos), dtype=np.int64, count=total))
+
+    def __len__(self):
+        return len(self.nombres)
+
+    # --- Valorización ---
+    def valor_por_producto(self) -> np.ndarray:
+        """precio * cantidad de cada producto (se calcula una sola vez)."""
+        if self._valores is None:
+            self._valores = self.precios * self.cantidades
+        return self._valores
+
+    def valor_total(self) -> float:
+        return float(self.valor_por_producto().sum())
+
+    def top_por_valor(self, n: int = 10) -> list[tuple[str, float]]:
+        """Los n productos que más dinero representan, de mayor a menor."""
+        valores = self.valor_por_producto()
+        n = min(n, len(valores))
+        if n <= 0:
+            return []
+        # argpartition deja los n mayores al final sin ordenar todo el arreglo
+        indices = np.argpartition(valores, len(valores) - n)[-n:]
+        indices = indices[np.argsort(valores[indices])[::-1]]
+        return [(self.nombres[i], float(valores[i])) for i in indices]
+
+    # --- Stock ---
+    def stock_bajo(self, umbral: int = 5, limite: int = None) -> list[tuple[str, int]]:
+        """
+        Productos con cantidad menor o igual al umbral (los agotados incluidos),
+        del menor stock al mayor. 'limite' corta la lista (útil para mostrarla).
+        """
+        indices = np.flatnonzero(self.cantidades <= umbral)
+        indices = indices[np.argsort(self.cantidades[indices], kind="stable")][:limite]
+        return [(self.nombres[i], int(self.cantidades[i])) for i in indices]
+
+    def agotados(self) -> int:
+        return int(np.count_nonzero(self.cantidades == 0))
+
+    # --- Distribución de precios ---
+    def histograma_precios(self, cortes: int = 10) -> tuple[np.ndarray, np.ndarray]:
+        """(conteos, bordes): cuántos productos caen en cada rango de precio."""
+        if len(self.precios) == 0:
+            return np.zeros(cortes, dtype=np.int64), np.zeros(cortes + 1)
+        return np.histogram(self.precios, bins=cortes)
+
+
+# ==========================================
+# FORMATO DE MONEDA EN LOTE
+# ==========================================
+_CAMBIO_SEPARADORES = str.maketrans(",.", ".,")
+
+
+def formatear_pesos_lote(valores) -> list[str]:
+    """
+    Igual que formato_pesos_colombianos ($1.234.567,89) para muchos valores:
+    se formatean todos en un solo texto y los separadores se intercambian con
+    UNA pasada de translate, en lugar de tres replace por número.
+    Crear un millón de textos igual cuesta ~1 s, así que los reportes solo
+    formatean las filas que muestran.
+    """
+    if isinstance(valores, np.ndarray):
+        valores = valores.tolist()
+    if len(valores) == 0:
+        return []
+    texto = "$" + "\n$".join(map("{:,.2f}".format, valores))
+    return texto.translate(_CAMBIO_SEPARADORES).split("\n")
@@ -0,0 +1,34 @@
+import biblioteca
+import foto_binaria
+from biblioteca import BibliotecaStore, Diario, Libro
+
+
+def _libro(nombre: str, cantidad: int = 1) -> Libro:
+    return Libro(nombre, "Novela", "Autor", "Editorial", 100, cantidad)
+
+
+def test_duplicado_en_el_umbral_de_compactacion_se_fusiona_al_reiniciar(tmp_path, monkeypatch):
+    # Foto binaria sin duplicados y diario que compacta cada 3 registros
+    ruta = str(tmp_path / "biblioteca.bin")
+    monkeypatch.setattr(biblioteca, "ARCHIVO_BINARIO", ruta)
+    monkeypatch.setattr(biblioteca, "ARCHIVO_DB", str(tmp_path / "biblioteca.json"))
+    monkeypatch.setattr(biblioteca, "COMPACTAR_CADA", 3)
+    Diario(ruta, binaria=True).compactar(BibliotecaStore([_libro("Rayuela", 2)]))
+
+    # El tercer registro (el duplicado) es el que dispara la compactación
+    store = biblioteca.cargar_biblioteca()
+    store.agregar(_libro("Ficciones"))
+    store.agregar(_libro("Aleph"))
+    store.agregar(_libro(" RAYUELA ", 5))
+    assert store.diario.pendientes == 0
+    with foto_binaria.FotoBinaria(ruta, foto_binaria.ESQUEMA_LIBRO) as foto:
+        assert not foto.banderas & foto_binaria.SIN_DUPLICADOS
+
+    # Al reiniciar, sanitizar no confía en una bandera falsa y fusiona
+    store.diario._archivo.close()
+    monkeypatch.setattr(biblioteca, "biblioteca", biblioteca.cargar_biblioteca())
+    biblioteca.sanitizar_biblioteca()
+    rayuelas = [l for l in biblioteca.biblioteca if l.nombre.strip().lower() == "rayuela"]
+    assert len(rayuelas) == 1
+    assert rayuelas[0].cantidad == 7
+    biblioteca.biblioteca.diario._archivo.close()